@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark Suite
+===============
+
+Throughput and memory benchmarks for the Verilog automation framework.
+
+Two kinds of workload are measured:
+
+- Config workloads: the full pipeline over ``config/Asg*.json`` (needs
+  iverilog/vvp; terminal images use the built-in single-run renderer, so
+  termshot is never required). Assignment folders are copied into the work
+  directory first, so the repository's images are left untouched.
+- Synthetic workloads: generated VCDs with many signals, wide buses and fast
+  clocks, from a few MB up to GB scale. Each is timed through index build,
+  streaming load, indexed load, windowed load and waveform rendering.
+
+- Startup: a fresh interpreter importing the CLI and running
+  ``verilog_automation.py --help``, held to an absolute time budget; loading
+  matplotlib or NumPy at import time also counts as a failure.
+
+Every stage runs in a fresh worker process so its peak RSS is its own.
+Results can be saved as a baseline and later runs compared against it;
+stages slower (or larger) than the baseline by more than the tolerance are
+flagged as regressions and make the script exit non-zero.
+
+Usage:
+    python benchmark.py                       # configs + small/medium synthetic
+    python benchmark.py --synthetic large     # 1 GB dump
+    python benchmark.py --save-baseline       # record the current numbers
+"""
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import multiprocessing
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from run_report import RunReport
+
+DEFAULT_WORK_DIR = '.bench'
+DEFAULT_TOLERANCE = 0.25  # allowed slowdown / growth before flagging a regression
+PLOT_SIGNALS = 8  # signals drawn by the render stage
+
+# Synthetic dump shapes: clocks toggle every half period, 'activity' is the
+# fraction of the other signals changing per half period
+SYNTHETIC_PRESETS = {
+    'small': {'clocks': 1, 'scalars': 16, 'buses': 4, 'width': 32, 'period': 10,
+              'activity': 0.25, 'size_mb': 5},
+    'medium': {'clocks': 2, 'scalars': 64, 'buses': 16, 'width': 64, 'period': 10,
+               'activity': 0.1, 'size_mb': 100},
+    'wide': {'clocks': 1, 'scalars': 8, 'buses': 8, 'width': 256, 'period': 10,
+             'activity': 0.5, 'size_mb': 50},
+    'fastclock': {'clocks': 4, 'scalars': 4, 'buses': 1, 'width': 8, 'period': 2,
+                  'activity': 0.05, 'size_mb': 50},
+    'large': {'clocks': 2, 'scalars': 128, 'buses': 32, 'width': 64, 'period': 10,
+              'activity': 0.1, 'size_mb': 1024},
+}
+DEFAULT_SYNTHETIC = ['small', 'medium']
+SYNTHETIC_STAGES = ['index_build', 'stream_load', 'index_load', 'window_load', 'render']
+
+# CLI startup budget (fresh interpreter, import + --help) and modules that must load lazily
+STARTUP_BUDGET_S = 0.5
+LAZY_MODULES = ('matplotlib', 'numpy')
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Metrics compared against the baseline (higher is worse)
+COMPARED_METRICS = ('wall_s', 'peak_rss_mb')
+
+
+def _vcd_id(number: int) -> str:
+    """Short printable VCD identifier for a signal number."""
+    identifier = ''
+    while True:
+        identifier += chr(33 + number % 94)
+        number //= 94
+        if number == 0:
+            return identifier
+
+
+def generate_vcd(path: Path, clocks: int, scalars: int, buses: int, width: int, period: int,
+                 activity: float, size_mb: float, seed: int = 1) -> Dict:
+    """
+    Write a synthetic VCD of roughly size_mb megabytes.
+
+    Args:
+        path: Output file
+        clocks: Number of free-running clocks
+        scalars: Number of 1-bit signals
+        buses: Number of vector signals
+        width: Bit width of each bus
+        period: Clock period in ticks
+        activity: Fraction of non-clock signals changing every half period
+        size_mb: Target file size in megabytes
+        seed: Random seed (the same parameters always produce the same file)
+
+    Returns:
+        Dictionary with 'bytes', 'transitions', 'signals' and 'endtime'
+    """
+    rng = random.Random(seed)
+    total = clocks + scalars + buses
+    ids = [_vcd_id(i) for i in range(total)]
+    clock_ids, scalar_ids, bus_ids = ids[:clocks], ids[clocks:clocks + scalars], ids[clocks + scalars:]
+
+    header = ['$date synthetic $end', '$version benchmark.py $end', '$timescale 1ps $end',
+              '$scope module TEST $end']
+    header += [f'$var wire 1 {identifier} clk{i} $end' for i, identifier in enumerate(clock_ids)]
+    header += [f'$var reg 1 {identifier} s{i} $end' for i, identifier in enumerate(scalar_ids)]
+    header += [f'$var reg {width} {identifier} bus{i} [{width - 1}:0] $end'
+               for i, identifier in enumerate(bus_ids)]
+    header += ['$upscope $end', '$enddefinitions $end', '#0', '$dumpvars']
+    header += [f'0{identifier}' for identifier in clock_ids + scalar_ids]
+    header += [f'b0 {identifier}' for identifier in bus_ids]
+    header += ['$end', '']
+
+    target = int(size_mb * 1024 * 1024)
+    scalar_changes = max(1, int(scalars * activity)) if scalars else 0
+    bus_changes = max(1, int(buses * activity)) if buses else 0
+    scalar_state = [0] * scalars
+    transitions = total
+    half_period = max(1, period // 2)
+    time_now = 0
+
+    with open(path, 'w', newline='\n') as f:
+        text = '\n'.join(header)
+        f.write(text)
+        written = len(text)
+        clock_value = 0
+        while written < target:
+            chunk = []
+            for _ in range(4096):
+                time_now += half_period
+                clock_value ^= 1
+                chunk.append(f'#{time_now}')
+                chunk.extend(f'{clock_value}{identifier}' for identifier in clock_ids)
+                for k in rng.sample(range(scalars), scalar_changes):
+                    scalar_state[k] ^= 1
+                    chunk.append(f'{scalar_state[k]}{scalar_ids[k]}')
+                for k in rng.sample(range(buses), bus_changes):
+                    chunk.append(f'b{rng.getrandbits(width):b} {bus_ids[k]}')
+                transitions += clocks + scalar_changes + bus_changes
+            text = '\n'.join(chunk) + '\n'
+            f.write(text)
+            written += len(text)
+
+    return {'bytes': written, 'transitions': transitions, 'signals': total, 'endtime': time_now}
+
+
+def synthetic_vcd(work_dir: Path, name: str, params: Dict) -> Dict:
+    """
+    Get (generating on first use) the synthetic dump for a preset.
+
+    Dumps are named after a hash of their parameters and reused across runs.
+
+    Args:
+        work_dir: Benchmark work directory
+        name: Preset name
+        params: Generator parameters
+
+    Returns:
+        Generator metadata plus 'path' and 'generate_s'
+    """
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+    vcd_path = work_dir / 'synthetic' / f'{name}-{digest}.vcd'
+    meta_path = vcd_path.with_suffix('.json')
+    if vcd_path.exists() and meta_path.exists():
+        return json.loads(meta_path.read_text())
+
+    vcd_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"Generating {name} dump ({params['size_mb']} MB): {vcd_path}")
+    started = time.perf_counter()
+    meta = generate_vcd(vcd_path, **params)
+    meta.update(path=str(vcd_path), generate_s=round(time.perf_counter() - started, 2))
+    meta_path.write_text(json.dumps(meta))
+    return meta
+
+
+def _run_synthetic_stage(stage: str, vcd_path: str, endtime: int, output_dir: str) -> Dict:
+    """
+    Worker: run one synthetic benchmark stage and measure it.
+
+    Args:
+        stage: One of SYNTHETIC_STAGES
+        vcd_path: Synthetic dump
+        endtime: Last timestamp of the dump
+        output_dir: Scratch directory for images
+
+    Returns:
+        Stage record from RunReport.stage plus 'transitions' processed
+    """
+    from vcd_index import IndexedVCD, build_index, index_path_for
+    from vcd_reader import StreamingVCD
+    from waveform_plot import draw_waveform, save_waveform
+    from verilog_automation import select_signals
+
+    report = RunReport()
+    report.start_file(vcd_path)
+    transitions = 0
+
+    if stage == 'render':
+        # Load outside the measured block; only drawing and saving count
+        vcd = IndexedVCD(vcd_path)
+        selected = dict(list(select_signals(vcd.signals).items())[:PLOT_SIGNALS])
+        loaded = vcd.load(selected.values())
+        signals = {name: loaded[reference] for name, reference in selected.items()}
+        with report.stage(stage):
+            fig = draw_waveform(signals, 'Benchmark')
+            save_waveform(fig, Path(output_dir) / 'benchmark.png')
+        transitions = sum(len(signal.arrays()) for signal in signals.values())
+    else:
+        with report.stage(stage):
+            if stage == 'index_build':
+                index_path_for(vcd_path).unlink(missing_ok=True)
+                build_index(vcd_path)
+                vcd = IndexedVCD(vcd_path)
+                loaded = {}
+                transitions = sum(vcd.transitions(identifier) for identifier in set(vcd.references_to_ids.values()))
+            elif stage == 'stream_load':
+                loaded = StreamingVCD(vcd_path).load()
+            elif stage == 'index_load':
+                loaded = IndexedVCD(vcd_path).load()
+            elif stage == 'window_load':
+                loaded = IndexedVCD(vcd_path).load(start=endtime * 45 // 100, end=endtime * 55 // 100)
+            else:
+                raise ValueError(f"Unknown benchmark stage '{stage}'")
+            unique = {id(signal): signal for signal in loaded.values()}
+            transitions += sum(len(signal.arrays()) for signal in unique.values())
+
+    record = report.files[0]['stages'][0]
+    record['transitions'] = transitions
+    return record
+
+
+def _run_config(config_file: str, workspace: str) -> Dict:
+    """
+    Worker: run the full pipeline over one config and measure it.
+
+    Args:
+        config_file: Config JSON
+        workspace: Workspace root holding a copy of the assignment folder
+
+    Returns:
+        Run report dictionary plus 'wall_s', 'peak_rss_mb' and 'success'
+    """
+    from verilog_automation import VerilogAutomation
+
+    log = io.StringIO()
+    report = RunReport()
+    report.start_file(config_file)
+    with contextlib.redirect_stdout(log), report.stage('pipeline'):
+        automation = VerilogAutomation(config_file, workspace, use_cache=False, single_run=True)
+        automation.buffer_output = True
+        success = automation.run()
+
+    result = automation.report.to_dict()
+    result.update(report.files[0]['stages'][0])
+    result['success'] = success
+    return result
+
+
+def _measure(function, *args) -> Dict:
+    """Run a worker function in a fresh process (so peak RSS is its own)."""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(function, *args).result()
+
+
+def _best_of(repeat: int, function, *args) -> Dict:
+    """Run a measurement repeat times and keep the fastest run."""
+    runs = [_measure(function, *args) for _ in range(repeat)]
+    return min(runs, key=lambda run: run.get('wall_s', 0.0))
+
+
+def _rate(amount: float, seconds: float) -> Optional[float]:
+    """Throughput per second, rounded (None for unmeasurable durations)."""
+    return round(amount / seconds, 2) if seconds > 0 else None
+
+
+def bench_configs(config_files: List[str], work_dir: Path, repeat: int) -> Dict[str, Dict]:
+    """
+    Benchmark the full pipeline over config workloads.
+
+    Args:
+        config_files: Config JSON files
+        work_dir: Benchmark work directory
+        repeat: Runs per workload (the fastest is kept)
+
+    Returns:
+        Mapping of workload name to metrics
+    """
+    results = {}
+    if not (shutil.which('iverilog') and shutil.which('vvp')):
+        print("Skipping config workloads: iverilog/vvp not found in PATH")
+        return results
+
+    for config_file in config_files:
+        config = json.loads(Path(config_file).read_text())
+        folder = config['folder'].lstrip('/')
+        workspace = work_dir / 'workspace'
+        target = workspace / folder
+        if target.exists():
+            shutil.rmtree(target)
+        shutil.copytree(Path(folder), target, ignore=shutil.ignore_patterns('imgs', '*.vcd', '*.vvp', '*.idx'))
+
+        name = f'config/{Path(config_file).stem}'
+        print(f"Running {name} ...")
+        run = _best_of(repeat, _run_config, str(Path(config_file).resolve()), str(workspace))
+        files = run['files']
+        transitions = sum(record['transitions'] or 0 for record in files)
+        vcd_mb = sum(record['vcd_bytes'] or 0 for record in files) / (1024 * 1024)
+        results[name] = {
+            'success': run['success'], 'files': len(files),
+            'wall_s': run['wall_s'], 'cpu_s': run['cpu_s'] + run['child_cpu_s'],
+            'peak_rss_mb': run.get('peak_rss_mb'),
+            'files_per_s': _rate(len(files), run['wall_s']),
+            'transitions_per_s': _rate(transitions, run['wall_s']),
+            'vcd_mb_per_s': _rate(vcd_mb, run['wall_s']),
+            'stages': {stage: {'wall_s': round(total['wall_s'], 4), 'cpu_s': round(total['cpu_s'], 4)}
+                       for stage, total in run['totals'].items()},
+        }
+    return results
+
+
+def bench_startup(repeat: int, budget: float) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Benchmark CLI startup in fresh interpreters.
+
+    Args:
+        repeat: Runs per measurement (the fastest is kept)
+        budget: Allowed seconds for 'verilog_automation.py --help'
+
+    Returns:
+        Tuple of (mapping of workload name to metrics, budget violations)
+    """
+    probe = ("import json, sys, time; started = time.perf_counter(); import verilog_automation; "
+             "print(json.dumps({'import_s': time.perf_counter() - started, "
+             f"'eager': [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))")
+    print("Running startup ...")
+    imports = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', probe], cwd=SCRIPT_DIR, capture_output=True, text=True)
+        imports.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    import_run = min(imports, key=lambda run: run['import_s'])
+
+    help_times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, str(SCRIPT_DIR / 'verilog_automation.py'), '--help'],
+                       capture_output=True)
+        help_times.append(time.perf_counter() - started)
+
+    results = {
+        'startup/import': {'wall_s': round(import_run['import_s'], 4)},
+        'startup/cli_help': {'wall_s': round(min(help_times), 4)},
+    }
+    violations = []
+    if results['startup/cli_help']['wall_s'] > budget:
+        violations.append(f"startup/cli_help: {results['startup/cli_help']['wall_s']}s exceeds the "
+                          f"{budget}s startup budget")
+    if import_run['eager']:
+        violations.append(f"startup/import: {', '.join(import_run['eager'])} imported at startup")
+    return results, violations
+
+
+def bench_synthetic(presets: List[str], work_dir: Path, repeat: int,
+                    size_mb: Optional[float] = None) -> Dict[str, Dict]:
+    """
+    Benchmark reader, index and renderer stages over synthetic dumps.
+
+    Args:
+        presets: Preset names from SYNTHETIC_PRESETS
+        work_dir: Benchmark work directory
+        repeat: Runs per stage (the fastest is kept)
+        size_mb: Override the presets' target dump size
+
+    Returns:
+        Mapping of 'synthetic/<preset>/<stage>' to metrics ('<preset>@<size>MB'
+        when size_mb overrides the preset, so resized dumps never meet the
+        preset's baseline)
+    """
+    results = {}
+    output_dir = Path(tempfile.mkdtemp(prefix='bench-', dir=work_dir))
+    try:
+        for name in presets:
+            params = dict(SYNTHETIC_PRESETS[name])
+            workload = f'synthetic/{name}'
+            if size_mb is not None and size_mb != params['size_mb']:
+                params['size_mb'] = size_mb
+                workload += f'@{size_mb:g}MB'
+            meta = synthetic_vcd(work_dir, name, params)
+            vcd_mb = meta['bytes'] / (1024 * 1024)
+
+            for stage in SYNTHETIC_STAGES:
+                print(f"Running {workload}/{stage} ...")
+                record = _best_of(repeat, _run_synthetic_stage, stage, meta['path'], meta['endtime'],
+                                  str(output_dir))
+                reads_dump = stage in ('index_build', 'stream_load')
+                results[f'{workload}/{stage}'] = {
+                    'vcd_mb': round(vcd_mb, 1), 'transitions': record['transitions'],
+                    'wall_s': record['wall_s'], 'cpu_s': record['cpu_s'],
+                    'peak_rss_mb': record.get('peak_rss_mb'),
+                    'transitions_per_s': _rate(record['transitions'], record['wall_s']),
+                    'vcd_mb_per_s': _rate(vcd_mb, record['wall_s']) if reads_dump else None,
+                }
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results: Current workload metrics
+        baseline: Baseline workload metrics
+        tolerance: Allowed relative increase (0.25 = 25% slower/larger)
+
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for workload, metrics in results.items():
+        reference = baseline.get(workload)
+        if not reference:
+            continue
+        for metric in COMPARED_METRICS:
+            current, previous = metrics.get(metric), reference.get(metric)
+            if not current or not previous:
+                continue
+            change = current / previous - 1
+            metrics[f'{metric}_change'] = round(change, 3)
+            if change > tolerance:
+                regressions.append(f"{workload}: {metric} {previous} -> {current} (+{change:.0%})")
+    return regressions
+
+
+def print_results(results: Dict[str, Dict]) -> None:
+    """Print a table of workload metrics."""
+    print(f"\n{'='*100}")
+    print(f"{'Workload':<36} {'wall s':>9} {'Δ':>7} {'peak MB':>9} {'Δ':>7} {'trans/s':>12} {'MB/s':>8} {'files/s':>8}")
+    print(f"{'='*100}")
+
+    def cell(value, fmt):
+        return format(value, fmt) if value is not None else '-'
+
+    for workload, m in results.items():
+        print(f"{workload:<36} {cell(m.get('wall_s'), '.3f'):>9} {cell(m.get('wall_s_change'), '+.0%'):>7} "
+              f"{cell(m.get('peak_rss_mb'), '.1f'):>9} {cell(m.get('peak_rss_mb_change'), '+.0%'):>7} "
+              f"{cell(m.get('transitions_per_s'), ',.0f'):>12} {cell(m.get('vcd_mb_per_s'), '.1f'):>8} "
+              f"{cell(m.get('files_per_s'), '.2f'):>8}")
+
+
+def main():
+    """Main entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(description='Verilog Automation Benchmark Suite')
+    parser.add_argument('--configs', nargs='*', default=None, metavar='CONFIG',
+                        help='Config workloads to run (default: config/Asg*.json; pass none to skip)')
+    parser.add_argument('--synthetic', nargs='*', default=DEFAULT_SYNTHETIC, metavar='PRESET',
+                        choices=list(SYNTHETIC_PRESETS),
+                        help=f"Synthetic dump presets (default: {' '.join(DEFAULT_SYNTHETIC)}; "
+                             f"available: {', '.join(SYNTHETIC_PRESETS)})")
+    parser.add_argument('--no-startup', action='store_true', help='Skip the CLI startup measurement')
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET_S,
+                        help=f'Allowed CLI startup time in seconds (default: {STARTUP_BUDGET_S})')
+    parser.add_argument('--size-mb', type=float, help="Override the synthetic dumps' size in MB")
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per workload, fastest kept (default: 3)')
+    parser.add_argument('--work-dir', default=DEFAULT_WORK_DIR,
+                        help=f'Scratch directory for dumps and copies (default: {DEFAULT_WORK_DIR})')
+    parser.add_argument('--output', help='Write results JSON here (default: <work-dir>/results.json)')
+    parser.add_argument('--baseline',
+                        help='Baseline results to compare against (default: <work-dir>/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed relative regression before flagging (default: {DEFAULT_TOLERANCE})')
+
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir).resolve()
+    work_dir.mkdir(parents=True, exist_ok=True)
+    config_files = sorted(glob.glob('config/Asg*.json')) if args.configs is None else args.configs
+
+    results = {}
+    violations = []
+    if not args.no_startup:
+        startup, violations = bench_startup(args.repeat, args.startup_budget)
+        results.update(startup)
+    results.update(bench_configs(config_files, work_dir, args.repeat))
+    results.update(bench_synthetic(args.synthetic, work_dir, args.repeat, args.size_mb))
+
+    baseline_path = Path(args.baseline) if args.baseline else work_dir / 'baseline.json'
+    regressions = []
+    if baseline_path.exists() and not args.save_baseline:
+        regressions = compare(results, json.loads(baseline_path.read_text())['results'], args.tolerance)
+    regressions += violations
+
+    print_results(results)
+
+    document = {'created': time.time(), 'python': sys.version.split()[0], 'results': results}
+    output_path = Path(args.output) if args.output else work_dir / 'results.json'
+    output_path.write_text(json.dumps(document, indent=2))
+    print(f"\nResults written: {output_path}")
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(document, indent=2))
+        print(f"✓ Baseline saved: {baseline_path}")
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) or budget violation(s):")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    elif baseline_path.exists() and not args.save_baseline:
+        print(f"✓ No regressions beyond {args.tolerance:.0%} against {baseline_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+"""
+Build Cache
+===========
+
+Content-addressed on-disk cache for the Verilog automation pipeline.
+
+Each pipeline stage (compile, simulate, terminal capture, waveform plot) is
+keyed by a hash of everything that can change its output: Verilog sources
+(including `include'd files), the relevant config entry fields and the tool
+versions. When a key is already present, the stored artifacts are copied back
+into place and the stage is skipped.
+
+Entries are kept under ``<cache_dir>/<key>/`` together with a small
+``meta.json``; the total size is capped with least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+DEFAULT_CACHE_DIR = '.verilog_cache'
+DEFAULT_CACHE_SIZE_MB = 512
+
+INCLUDE_PATTERN = re.compile(rb'^\s*`include\s+"([^"]+)"', re.MULTILINE)
+
+
+def find_includes(source: Path, search_dirs: Iterable[Path] = (), seen: Optional[Set[Path]] = None) -> List[Path]:
+    """
+    Recursively resolve the `include dependencies of a Verilog source.
+
+    Args:
+        source: Verilog source file
+        search_dirs: Extra directories searched after the source's own directory
+        seen: Files already visited (used for recursion)
+
+    Returns:
+        List of resolved include files, in discovery order
+    """
+    if seen is None:
+        seen = {source.resolve()}
+    search_dirs = list(search_dirs)
+
+    try:
+        content = source.read_bytes()
+    except OSError:
+        return []
+
+    found = []
+    for match in INCLUDE_PATTERN.finditer(content):
+        name = match.group(1).decode(errors='replace')
+        for directory in [source.parent] + search_dirs:
+            candidate = (directory / name).resolve()
+            if candidate.is_file():
+                if candidate not in seen:
+                    seen.add(candidate)
+                    found.append(candidate)
+                    found.extend(find_includes(candidate, search_dirs, seen))
+                break
+    return found
+
+
+class BuildCache:
+    """LRU-capped, content-addressed store of pipeline stage artifacts."""
+
+    def __init__(self, cache_dir: Union[str, Path], max_size_mb: float = DEFAULT_CACHE_SIZE_MB):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries (created on demand)
+            max_size_mb: Total size cap in megabytes enforced by evict()
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size = int(max_size_mb * 1024 * 1024)
+
+    @staticmethod
+    def key(*parts: Union[str, bytes, Path, Dict, List, None]) -> str:
+        """
+        Compute a cache key from an ordered list of parts.
+
+        Paths are hashed by content, everything else by its JSON form.
+
+        Args:
+            parts: Values that determine a stage's output
+
+        Returns:
+            Hex digest usable as a cache key
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, Path):
+                digest.update(b'file:' + str(part.name).encode())
+                with open(part, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(chunk)
+            elif isinstance(part, bytes):
+                digest.update(b'bytes:' + part)
+            else:
+                digest.update(b'json:' + json.dumps(part, sort_keys=True).encode())
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def restore(self, key: str, outputs: List[Path]) -> bool:
+        """
+        Copy the artifacts stored under key back to their output paths.
+
+        Args:
+            key: Cache key of the stage
+            outputs: Paths the stage would have produced
+
+        Returns:
+            True on a complete hit, False if the entry or any artifact is missing
+        """
+        entry = self._entry(key)
+        meta_path = entry / 'meta.json'
+        if not meta_path.exists():
+            return False
+        if not all((entry / output.name).exists() for output in outputs):
+            return False
+
+        for output in outputs:
+            cached = entry / output.name
+            if not (output.exists() and output.stat().st_size == cached.stat().st_size
+                    and output.stat().st_mtime == cached.stat().st_mtime):
+                output.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(cached, output)
+
+        try:
+            meta = json.loads(meta_path.read_text())
+            meta['last_used'] = time.time()
+            meta_path.write_text(json.dumps(meta))
+        except (OSError, ValueError):
+            pass
+        return True
+
+    def store(self, key: str, outputs: List[Path]) -> bool:
+        """
+        Store a stage's artifacts under key.
+
+        The entry is assembled in a temporary directory and renamed into place,
+        so concurrent workers never observe a partial entry.
+
+        Args:
+            key: Cache key of the stage
+            outputs: Artifacts produced by the stage
+
+        Returns:
+            True if stored, False if an artifact was missing
+        """
+        if not all(output.exists() for output in outputs):
+            return False
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir))
+        try:
+            size = 0
+            for output in outputs:
+                shutil.copy2(output, staging / output.name)
+                size += output.stat().st_size
+            now = time.time()
+            meta = {'files': [output.name for output in outputs], 'size': size,
+                    'created': now, 'last_used': now}
+            (staging / 'meta.json').write_text(json.dumps(meta))
+
+            entry = self._entry(key)
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(staging, entry)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        return True
+
+    def evict(self) -> int:
+        """
+        Remove least-recently-used entries until the cache fits its size cap.
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            meta_path = entry / 'meta.json'
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, ValueError):
+                if entry.name.startswith('.tmp-') or not meta_path.exists():
+                    continue
+                shutil.rmtree(entry, ignore_errors=True)
+                continue
+            entries.append((meta.get('last_used', 0), meta.get('size', 0), entry))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        return removed
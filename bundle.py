@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+"""
+Bundle
+======
+
+Submission archives for the Verilog automation framework, written by a
+small built-in zip writer (no 7-Zip or other external archiver).
+
+- Members are compressed in parallel on a thread pool (zlib releases the
+  GIL) and streamed in 1 MB chunks, so a large PDF is never held in memory.
+- Every member records the SHA-256 of its content in a private extra field.
+  When an archive is rebuilt, members whose content is unchanged are copied
+  from the previous archive as they are instead of being compressed again.
+- The archive is written next to the target and moved into place, so an
+  interrupted run leaves the previous archive intact.
+
+Standalone use bundles a folder's Verilog sources and PDFs (what
+BundleHomework.ps1 did); ``verilog_automation.py CONFIG --bundle`` adds the
+config's include files, rendered images and report files.
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+CHUNK = 1 << 20
+SPOOL_LIMIT = 8 << 20  # compressed members up to this size are kept in memory
+DEFAULT_LEVEL = 6
+BUNDLED_SUFFIXES = ('.v', '.pdf')
+SKIPPED_DIRS = {'imgs', 'sweeps', '.verilog_cache', '.bench', '__pycache__'}
+STORED_SUFFIXES = {'.png', '.webp', '.jpg', '.jpeg', '.gz', '.zst', '.zip', '.fst'}  # already compressed
+
+HASH_EXTRA_ID = 0x6873  # private extra field holding the SHA-256 of a member's content
+_ZIP64_EXTRA_ID = 0x0001
+_LIMIT = 0xFFFFFFFF
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_UTF8_FLAG = 0x0800
+
+
+def collect_folder(folder: Union[str, Path], suffixes: Sequence[str] = BUNDLED_SUFFIXES) -> List[Path]:
+    """
+    Find the files to bundle in a folder (recursively).
+
+    Args:
+        folder: Assignment folder
+        suffixes: File extensions to include
+
+    Returns:
+        Sorted paths, skipping hidden and generated directories (imgs, sweeps, caches)
+    """
+    found = []
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = [d for d in dirs if d not in SKIPPED_DIRS and not d.startswith('.')]
+        found += [Path(root) / name for name in files if name.lower().endswith(tuple(suffixes))]
+    return sorted(found)
+
+
+def file_digest(path: Union[str, Path]) -> bytes:
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK)
+            if not chunk:
+                return digest.digest()
+            digest.update(chunk)
+
+
+def _hash_extra(extra: bytes) -> Optional[bytes]:
+    """Content hash stored in a member's extra field, if any."""
+    offset = 0
+    while offset + 4 <= len(extra):
+        field, size = struct.unpack_from('<HH', extra, offset)
+        if field == HASH_EXTRA_ID and size == 32:
+            return extra[offset + 4:offset + 36]
+        offset += 4 + size
+    return None
+
+
+def _previous_members(archive: Path) -> Dict[str, zipfile.ZipInfo]:
+    """Members of an earlier archive that carry a content hash (empty if there is none)."""
+    try:
+        with zipfile.ZipFile(archive) as previous:
+            return {info.filename: info for info in previous.infolist() if _hash_extra(info.extra)}
+    except (OSError, zipfile.BadZipFile):
+        return {}
+
+
+def _dos_time(mtime: float) -> Tuple[int, int]:
+    """MS-DOS (time, date) fields of a modification time."""
+    t = time.localtime(max(mtime, 315532800))  # zip timestamps start in 1980
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), \
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+def _compress(path: Path, spool: BinaryIO, method: int, level: int) -> Tuple[int, int]:
+    """Stream a file into spool; returns (crc32, uncompressed size)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15) if method == zipfile.ZIP_DEFLATED else None
+    crc = size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK)
+            if not chunk:
+                break
+            crc, size = zlib.crc32(chunk, crc), size + len(chunk)
+            spool.write(compressor.compress(chunk) if compressor else chunk)
+    if compressor:
+        spool.write(compressor.flush())
+    return crc, size
+
+
+def _prepare(path: Path, name: str, level: int, previous: Dict[str, zipfile.ZipInfo]) -> Dict:
+    """Hash a member and, unless the previous archive has the same content, compress it."""
+    stat = path.stat()
+    digest = file_digest(path)
+    member = {'name': name, 'digest': digest, 'mtime': stat.st_mtime, 'mode': stat.st_mode}
+    old = previous.get(name)
+    if old is not None and _hash_extra(old.extra) == digest:
+        member.update(reused=True, method=old.compress_type, crc=old.CRC, size=old.file_size,
+                      csize=old.compress_size, offset=old.header_offset)
+        return member
+
+    method = zipfile.ZIP_STORED if level == 0 or path.suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+    spool = tempfile.SpooledTemporaryFile(SPOOL_LIMIT)
+    crc, size = _compress(path, spool, method, level)
+    if method == zipfile.ZIP_DEFLATED and spool.tell() >= size:
+        # Incompressible content: store it instead
+        method = zipfile.ZIP_STORED
+        spool.seek(0)
+        spool.truncate()
+        crc, size = _compress(path, spool, method, level)
+    member.update(reused=False, method=method, crc=crc, size=size, csize=spool.tell(), spool=spool)
+    return member
+
+
+def _local_header(member: Dict) -> bytes:
+    name = member['name'].encode('utf-8')
+    zip64 = member['size'] >= _LIMIT or member['csize'] >= _LIMIT
+    extra = struct.pack('<HHQQ', _ZIP64_EXTRA_ID, 16, member['size'], member['csize']) if zip64 else b''
+    flags = 0 if member['name'].isascii() else _UTF8_FLAG
+    clock, date = _dos_time(member['mtime'])
+    return _LOCAL_HEADER.pack(0x04034b50, 45 if zip64 else 20, flags, member['method'], clock, date,
+                              member['crc'], _LIMIT if zip64 else member['csize'],
+                              _LIMIT if zip64 else member['size'], len(name), len(extra)) + name + extra
+
+
+def _central_header(member: Dict, offset: int) -> bytes:
+    name = member['name'].encode('utf-8')
+    fields = [value for value in (member['size'], member['csize'], offset) if value >= _LIMIT]
+    extra = struct.pack('<HH', HASH_EXTRA_ID, 32) + member['digest']
+    if fields:
+        extra = struct.pack(f'<HH{len(fields)}Q', _ZIP64_EXTRA_ID, 8 * len(fields), *fields) + extra
+    version = 45 if fields else 20
+    flags = 0 if member['name'].isascii() else _UTF8_FLAG
+    clock, date = _dos_time(member['mtime'])
+    return _CENTRAL_HEADER.pack(0x02014b50, (3 << 8) | version, version, flags, member['method'], clock, date,
+                                member['crc'], min(member['csize'], _LIMIT), min(member['size'], _LIMIT),
+                                len(name), len(extra), 0, 0, 0, (member['mode'] & 0xFFFF) << 16,
+                                min(offset, _LIMIT)) + name + extra
+
+
+def _end_records(count: int, directory_offset: int, directory_size: int) -> bytes:
+    records = b''
+    if count >= 0xFFFF or directory_offset >= _LIMIT or directory_size >= _LIMIT:
+        zip64_end = directory_offset + directory_size
+        records += struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, (3 << 8) | 45, 45, 0, 0,
+                               count, count, directory_size, directory_offset)
+        records += struct.pack('<IIQI', 0x07064b50, 0, zip64_end, 1)
+    return records + struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                                 min(directory_size, _LIMIT), min(directory_offset, _LIMIT), 0)
+
+
+def _copy_raw(archive: BinaryIO, header_offset: int, size: int, out: BinaryIO) -> None:
+    """Copy a member's compressed data from an existing archive."""
+    archive.seek(header_offset)
+    header = _LOCAL_HEADER.unpack(archive.read(_LOCAL_HEADER.size))
+    archive.seek(header[-2] + header[-1], os.SEEK_CUR)  # name and extra field
+    while size:
+        chunk = archive.read(min(CHUNK, size))
+        if not chunk:
+            raise OSError("previous archive is truncated")
+        out.write(chunk)
+        size -= len(chunk)
+
+
+def build_archive(members: Iterable[Tuple[Union[str, Path], str]], target: Union[str, Path],
+                  jobs: int = 0, level: int = DEFAULT_LEVEL, reuse: bool = True) -> Dict:
+    """
+    Write a zip archive.
+
+    Args:
+        members: (file, name in the archive) pairs, in archive order
+        target: Archive to write (an existing one is the source of reused members)
+        jobs: Compression threads (0 = one per CPU)
+        level: Deflate level (0 stores every member)
+        reuse: Copy members with unchanged content from the existing archive
+
+    Returns:
+        Dictionary with 'members' (per member: 'name', 'size', 'csize',
+        'method' and 'reused') and 'bytes' (archive size)
+
+    Raises:
+        ValueError: If two members have the same name
+        OSError: If a member cannot be read or the archive cannot be written
+    """
+    members = [(Path(path), name) for path, name in members]
+    names = [name for _, name in members]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate archive member(s): {', '.join(duplicates)}")
+
+    target = Path(target)
+    previous = _previous_members(target) if reuse and target.exists() else {}
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    staging = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    written = []
+    old_archive = open(target, 'rb') if previous else None
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool, open(staging, 'wb') as out:
+            futures = [pool.submit(_prepare, path, name, level, previous) for path, name in members]
+            for future in futures:
+                member = future.result()
+                offset = out.tell()
+                out.write(_local_header(member))
+                if member['reused']:
+                    _copy_raw(old_archive, member.pop('offset'), member['csize'], out)
+                else:
+                    spool = member.pop('spool')
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, out, CHUNK)
+                    spool.close()
+                written.append((member, offset))
+
+            directory_offset = out.tell()
+            for member, offset in written:
+                out.write(_central_header(member, offset))
+            out.write(_end_records(len(written), directory_offset, out.tell() - directory_offset))
+        if old_archive:
+            old_archive.close()
+        os.replace(staging, target)
+    finally:
+        if old_archive and not old_archive.closed:
+            old_archive.close()
+        if staging.exists():
+            staging.unlink()
+
+    return {'members': [{key: member[key] for key in ('name', 'size', 'csize', 'method', 'reused')}
+                        for member, _ in written],
+            'bytes': target.stat().st_size}
+
+
+def print_summary(result: Dict, target: Union[str, Path], elapsed: float) -> None:
+    """Print an archive's contents and how each member was produced."""
+    print(f"Contents of '{target}':")
+    for member in result['members']:
+        how = 'unchanged, reused' if member['reused'] else \
+            'stored' if member['method'] == zipfile.ZIP_STORED else 'compressed'
+        print(f"  {member['name']:<40} {member['size'] / 1024:10.1f} KB -> {member['csize'] / 1024:10.1f} KB  ({how})")
+    reused = sum(member['reused'] for member in result['members'])
+    total = sum(member['size'] for member in result['members'])
+    print(f"✓ Created '{target}': {len(result['members'])} files, {total / 1024:.1f} KB -> "
+          f"{result['bytes'] / 1024:.1f} KB ({reused} reused) in {elapsed:.2f}s")
+
+
+def main():
+    """Bundle a folder's Verilog sources and PDFs (the BundleHomework.ps1 workflow)."""
+    parser = argparse.ArgumentParser(description='Verilog Automation Framework - Submission Bundler')
+    parser.add_argument('folder', help='Assignment folder to bundle (e.g. Asg1)')
+    parser.add_argument('--output', '-o', help='Archive to write (default: <folder>_submission.zip)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Compression threads (0 = one per CPU, default: 0)')
+    parser.add_argument('--level', type=int, default=DEFAULT_LEVEL, choices=range(10), metavar='0-9',
+                        help=f'Deflate level (0 = store, default: {DEFAULT_LEVEL})')
+    parser.add_argument('--full', action='store_true',
+                        help='Compress every member again instead of reusing unchanged ones')
+    args = parser.parse_args()
+
+    folder = Path(args.folder)
+    if not folder.is_dir():
+        print(f"Error: Assignment folder '{folder}' not found.")
+        sys.exit(1)
+    files = collect_folder(folder)
+    if not any(path.suffix == '.v' for path in files):
+        print(f"Error: No .v files found in '{folder}'.")
+        sys.exit(1)
+    if not any(path.suffix.lower() == '.pdf' for path in files):
+        print(f"Warning: No PDF files found in '{folder}'. Continuing without them...")
+
+    target = Path(args.output or f"{folder.name}_submission.zip")
+    started = time.perf_counter()
+    try:
+        result = build_archive([(path, path.relative_to(folder).as_posix()) for path in files], target,
+                               args.jobs, args.level, reuse=not args.full)
+    except (OSError, ValueError) as e:
+        print(f"✗ Failed to create '{target}': {e}")
+        sys.exit(1)
+    print_summary(result, target, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,71 +1,114 @@
 #!/usr/bin/env python3
 """
-Example and testing script for Verilog Automation Framework
+Configuration generator for the Verilog Automation Framework.
+
+Discovers Verilog files (recursively) in an assignment folder and writes
+``config/<folder>.json``. Each file is scanned with the framework's source
+scanner (verilog_scan), picking up the ``$dumpfile`` name and the module that
+dumps (the testbench); files without a ``$dumpfile`` are skipped without
+being parsed. Large trees are scanned in parallel.
+
+Regenerating merges with the existing config: entries of unchanged files are
+kept as they are, hand-tuned settings (``variables``, a custom ``module`` ...)
+survive rescans, and only files whose modification time or size changed are
+scanned again. Scan results are remembered in ``config/.<folder>.scan.json``.
 """
 
+import argparse
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional
+
+from verilog_scan import scan_text
+
+# Files per worker task when scanning in parallel, and the count below which a pool is not worth starting
+SCAN_CHUNK = 32
+PARALLEL_THRESHOLD = 64
 
-def create_sample_config(assignment_name: str, verilog_files: list) -> str:
+# Directories never searched for sources
+SKIPPED_DIRS = {'imgs', '.verilog_cache', '.bench', '__pycache__'}
+
+# Settings derived from a scan (all other entry fields are never touched)
+DERIVED_FIELDS = ('vcd_file', 'module', 'plot')
+
+
+def scan_testbench(path: str) -> Dict:
     """
-    Create a sample configuration file for an assignment.
+    Find the $dumpfile call of a Verilog source (see verilog_scan.scan_text).
 
     Args:
-        assignment_name: Name of the assignment folder
-        verilog_files: List of Verilog files to process
+        path: Verilog source file
 
     Returns:
-        Path to the created configuration file
+        Dictionary with 'dumpfile' (literal dump file name or None), 'module'
+        (module containing the first $dumpfile call, or None), 'plot' and 'error'
     """
-    config = {
-        "folder": assignment_name,
-        "files": []
-    }
+    try:
+        with open(path, 'r', errors='replace') as f:
+            text = f.read()
+    except OSError as e:
+        return {'dumpfile': None, 'module': None, 'plot': False, 'error': str(e)}
+    # Most sources are design modules without any dump: skip parsing them
+    info = scan_text(text) if '$dumpfile' in text else {'has_dumpfile': False}
+    if not info['has_dumpfile']:
+        return {'dumpfile': None, 'module': None, 'plot': False, 'error': None}
+    return {'dumpfile': info['dumpfile'], 'module': info['dump_module'], 'plot': True, 'error': None}
 
-    for vfile in verilog_files:
-        base_name = Path(vfile).stem
-        vfile_path = Path(assignment_name) / vfile
-        plot_enabled = True
-        try:
-            with open(vfile_path, 'r') as vf:
-                content = vf.read()
-                if "$dumpfile" not in content:
-                    plot_enabled = False
-        except Exception as e:
-            print(f"Warning: Could not read {vfile_path}: {e}")
-            plot_enabled = False
-
-        file_config = {
-            "name": vfile,
-            "vcd_file": f"{base_name}.vcd",
-            "variables": None,  # Plot all variables by default
-            "module": "TEST",
-            "plot": plot_enabled
-        }
-        config["files"].append(file_config)
 
-    # Ensure config directory exists
-    config_dir = Path('config')
-    config_dir.mkdir(exist_ok=True)
+def _scan_chunk(paths: List[str]) -> List[Dict]:
+    return [scan_testbench(path) for path in paths]
 
-    config_filename = config_dir / f"{assignment_name}.json"
-    with open(config_filename, 'w') as f:
-        json.dump(config, f, indent=2)
 
-    print(f"Created configuration file: {config_filename}")
-    return str(config_filename)
+def scan_files(paths: List[Path], jobs: int = 0) -> List[Dict]:
+    """
+    Scan many sources, in parallel for large sets.
+
+    Args:
+        paths: Verilog sources
+        jobs: Worker processes (0 = one per CPU, 1 = scan serially)
+
+    Returns:
+        Scan results in the order of paths
+    """
+    paths = [str(path) for path in paths]
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    if jobs == 1 or len(paths) < PARALLEL_THRESHOLD:
+        return _scan_chunk(paths)
+
+    chunks = [paths[i:i + SCAN_CHUNK] for i in range(0, len(paths), SCAN_CHUNK)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [scan for chunk in pool.map(_scan_chunk, chunks) for scan in chunk]
+
+
+def derived_settings(name: str, scan: Dict) -> Dict:
+    """
+    Config settings implied by a scan.
 
-def discover_verilog_files(directory: str) -> list:
+    Args:
+        name: Source path relative to the assignment folder
+        scan: Result of scan_testbench
+
+    Returns:
+        Values for DERIVED_FIELDS
+    """
+    return {'vcd_file': scan.get('dumpfile') or f"{Path(name).stem}.vcd",
+            'module': scan.get('module') or 'TEST',
+            'plot': scan.get('plot', False)}
+
+
+def discover_verilog_files(directory: str, recursive: bool = True) -> list:
     """
     Discover all Verilog files in a directory.
 
     Args:
         directory: Directory to search
+        recursive: Also search subdirectories (skipping generated and hidden ones)
 
     Returns:
-        List of Verilog file names
+        Sorted list of Verilog file paths relative to directory (POSIX style)
     """
     directory_path = Path(directory)
     if not directory_path.exists():
@@ -73,50 +116,155 @@ def discover_verilog_files(directory: str) -> list:
         return []
 
     verilog_files = []
-    for file_path in directory_path.glob("*.v"):
-        verilog_files.append(file_path.name)
+    for root, dirs, files in os.walk(directory_path):
+        dirs[:] = [d for d in dirs if d not in SKIPPED_DIRS and not d.startswith('.')] if recursive else []
+        for file_name in files:
+            if file_name.endswith('.v'):
+                verilog_files.append((Path(root) / file_name).relative_to(directory_path).as_posix())
 
     return sorted(verilog_files)
 
+
+def _scan_cache_path(config_filename: Path) -> Path:
+    return config_filename.with_name(f".{config_filename.stem}.scan.json")
+
+
+def _load_json(path: Path) -> Optional[Dict]:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable {path}: {e}")
+        return None
+
+
+def create_sample_config(assignment_name: str, verilog_files: list, jobs: int = 0,
+                         config_filename: Optional[str] = None) -> str:
+    """
+    Create or update the configuration file for an assignment.
+
+    Existing entries are kept in place; for files that changed since the last
+    scan only settings that still hold their previously derived value are
+    updated. Entries of deleted files are dropped and new files are appended.
+
+    Args:
+        assignment_name: Name of the assignment folder
+        verilog_files: List of Verilog files to process (relative to the folder)
+        jobs: Scan worker processes (0 = one per CPU)
+        config_filename: Output file (default: config/<folder>.json)
+
+    Returns:
+        Path to the created configuration file
+    """
+    assignment_path = Path(assignment_name)
+    config_filename = Path(config_filename) if config_filename \
+        else Path('config') / f"{assignment_path.name}.json"
+    scan_cache_file = _scan_cache_path(config_filename)
+
+    config = _load_json(config_filename) or {"folder": assignment_name, "files": []}
+    previous_scans = (_load_json(scan_cache_file) or {}).get('files', {})
+
+    # Rescan only new files and files whose mtime or size changed
+    stats = {}
+    for vfile in verilog_files:
+        stat = (assignment_path / vfile).stat()
+        stats[vfile] = [stat.st_mtime_ns, stat.st_size]
+    stale = [vfile for vfile in verilog_files
+             if previous_scans.get(vfile, {}).get('stat') != stats[vfile]]
+    scans = {vfile: {'stat': stats[vfile], 'scan': previous_scans[vfile]['scan']}
+             for vfile in verilog_files if vfile not in stale}
+    for vfile, scan in zip(stale, scan_files([assignment_path / vfile for vfile in stale], jobs)):
+        if scan['error']:
+            print(f"Warning: Could not read {assignment_path / vfile}: {scan['error']}")
+        scans[vfile] = {'stat': stats[vfile], 'scan': scan}
+    print(f"Scanned {len(stale)} new or changed file(s), {len(verilog_files) - len(stale)} unchanged")
+
+    present = set(verilog_files)
+    files = []
+    updated = set()
+    for entry in config['files']:
+        name = entry.get('name')
+        if name is not None and name not in present and not (assignment_path / name).exists():
+            print(f"   - removed {name} (file no longer exists)")
+            continue
+        if name in stale:
+            # Update derived settings unless they were edited by hand
+            previous = previous_scans.get(name)
+            old = derived_settings(name, previous['scan']) if previous \
+                else {'vcd_file': f"{Path(name).stem}.vcd", 'module': 'TEST', 'plot': entry.get('plot')}
+            new = derived_settings(name, scans[name]['scan'])
+            for field in DERIVED_FIELDS:
+                if field not in entry or entry[field] == old[field]:
+                    entry[field] = new[field]
+            updated.add(name)
+        files.append(entry)
+
+    known = {entry.get('name') for entry in files}
+    for vfile in verilog_files:
+        if vfile not in known:
+            settings = derived_settings(vfile, scans[vfile]['scan'])
+            files.append({
+                "name": vfile,
+                "vcd_file": settings['vcd_file'],
+                "variables": None,  # Plot all variables by default
+                "module": settings['module'],
+                "plot": settings['plot']
+            })
+            print(f"   + added {vfile}")
+    for name in sorted(updated):
+        print(f"   * rescanned {name}")
+    config['files'] = files
+
+    # Ensure config directory exists
+    config_filename.parent.mkdir(parents=True, exist_ok=True)
+    with open(config_filename, 'w') as f:
+        json.dump(config, f, indent=2)
+    with open(scan_cache_file, 'w') as f:
+        json.dump({'files': scans}, f, indent=1)
+
+    print(f"Wrote configuration file: {config_filename}")
+    return str(config_filename)
+
+
 def main():
     """Main function for creating sample configurations."""
+    parser = argparse.ArgumentParser(description='Verilog Automation Framework - Configuration Generator')
+    parser.add_argument('assignment_folder', help='Assignment folder to scan (e.g. Asg1)')
+    parser.add_argument('--output', '-o', help='Config file to write or update (default: config/<folder>.json)')
+    parser.add_argument('--jobs', '-j', type=int, default=0,
+                        help='Scan worker processes (0 = one per CPU, default: 0)')
+    parser.add_argument('--no-recursive', action='store_true', help='Only scan the folder itself')
+    args = parser.parse_args()
+
     print("Verilog Automation Framework - Configuration Generator")
     print("=" * 60)
 
-    # Check command line arguments
-    if len(sys.argv) != 2:
-        print("Usage: python create_config.py <assignment_folder>")
-        print("Example: python create_config.py Asg1")
-        return
-
-    assignment_folder = sys.argv[1]
+    assignment_folder = args.assignment_folder
     assignment_path = Path(assignment_folder)
 
     # Check if the specified folder exists
     if not assignment_path.exists():
         print(f"Error: Directory '{assignment_folder}' not found.")
-        return
+        sys.exit(1)
 
     if not assignment_path.is_dir():
         print(f"Error: '{assignment_folder}' is not a directory.")
-        return
+        sys.exit(1)
 
     # Discover Verilog files in the specified directory
-    verilog_files = discover_verilog_files(assignment_folder)
+    verilog_files = discover_verilog_files(assignment_folder, recursive=not args.no_recursive)
 
     if not verilog_files:
         print(f"No Verilog files found in directory '{assignment_folder}'.")
         return
 
-    print(f"Found {len(verilog_files)} Verilog files in '{assignment_folder}':")
-    for file in verilog_files:
-        print(f"   - {file}")
+    print(f"Found {len(verilog_files)} Verilog files in '{assignment_folder}'")
 
-    # Create configuration for the specified assignment
-    print(f"\nCreating configuration file for '{assignment_folder}'...")
-    config_file = create_sample_config(assignment_folder, verilog_files)
+    # Create or update the configuration for the specified assignment
+    config_file = create_sample_config(assignment_folder, verilog_files, args.jobs, args.output)
 
-    print(f"\n✓ Configuration file created: {config_file}")
+    print(f"\n✓ Configuration file ready: {config_file}")
     print(f"\nTo run automation for this assignment, use:")
     print(f"  python verilog_automation.py {config_file}")
 
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+"""
+Dump Formats
+============
+
+Compact waveform dump storage for the Verilog automation framework.
+
+Dumps can be kept as plain VCD, gzip- or zstd-compressed VCD, or FST. The
+format of a file is detected from its magic bytes (not its name), and every
+format is read as a stream of VCD text, so the readers never expand a dump
+to a temporary file:
+
+- ``vcd.gz``: Python's gzip module
+- ``vcd.zst``: the ``zstandard`` package when installed, else the ``zstd``
+  command-line tool through a pipe
+- ``fst``: GTKWave's ``fst2vcd`` through a pipe (``vcd2fst`` writes FST)
+
+convert_dump() rewrites a dump in another format (streaming, staged next to
+the target and moved into place) and deletes the original.
+"""
+
+import contextlib
+import gzip
+import os
+import shutil
+import struct
+import subprocess
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # optional: the zstd CLI is used instead
+    zstandard = None
+
+DUMP_FORMATS = ('vcd', 'vcd.gz', 'vcd.zst', 'fst')
+SUFFIXES = {'vcd': '.vcd', 'vcd.gz': '.vcd.gz', 'vcd.zst': '.vcd.zst', 'fst': '.fst'}
+GZIP_LEVEL = 6
+COPY_CHUNK = 1 << 20
+
+_GZIP_MAGIC = b'\x1f\x8b'
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+_FST_HEADER_BLOCK = 0  # FST files start with a header block (type byte 0)
+
+
+def detect_format(path: Union[str, Path]) -> str:
+    """
+    Identify a dump's format from its first bytes.
+
+    Args:
+        path: Dump file
+
+    Returns:
+        One of DUMP_FORMATS (plain VCD when nothing else matches)
+    """
+    with open(path, 'rb') as f:
+        head = f.read(4)
+    if head.startswith(_GZIP_MAGIC):
+        return 'vcd.gz'
+    if head == _ZSTD_MAGIC:
+        return 'vcd.zst'
+    if head[:1] == bytes([_FST_HEADER_BLOCK]):
+        return 'fst'
+    return 'vcd'
+
+
+def dump_name(vcd_file: str, dump_format: str) -> str:
+    """
+    Name a dump is stored under in a given format.
+
+    Args:
+        vcd_file: Name written by the simulation (the $dumpfile name)
+        dump_format: Target format
+
+    Returns:
+        e.g. 'q1.vcd' -> 'q1.vcd.gz', 'q1.vcd.zst' or 'q1.fst'
+    """
+    if dump_format == 'vcd':
+        return vcd_file
+    stem = vcd_file[:-4] if vcd_file.lower().endswith('.vcd') else vcd_file
+    return stem + SUFFIXES[dump_format]
+
+
+def _tool(name: str, purpose: str) -> str:
+    path = shutil.which(name)
+    if path is None:
+        raise FileNotFoundError(f"{name} not found in PATH (needed to {purpose})")
+    return path
+
+
+@contextlib.contextmanager
+def _pipe(command, stdin=None, stdout=None) -> Iterator[subprocess.Popen]:
+    """Run a filter process, making sure it is reaped (and killed if abandoned)."""
+    process = subprocess.Popen(command, stdin=stdin, stdout=stdout, stderr=subprocess.PIPE)
+    try:
+        yield process
+    finally:
+        for stream in (process.stdin, process.stdout):
+            if stream is not None:
+                stream.close()
+        if process.poll() is None and stdout is not None:
+            process.kill()  # reader stopped early (e.g. after the header)
+        process.wait()
+
+
+@contextlib.contextmanager
+def open_dump(path: Union[str, Path], dump_format: Optional[str] = None) -> Iterator[BinaryIO]:
+    """
+    Open a dump of any format as a binary stream of VCD text.
+
+    Only plain VCD streams are seekable.
+
+    Args:
+        path: Dump file
+        dump_format: Format if already known (detected otherwise)
+
+    Yields:
+        Readable binary file object
+
+    Raises:
+        FileNotFoundError: If a needed decompressor (zstd, fst2vcd) is missing
+    """
+    path = Path(path)
+    dump_format = dump_format or detect_format(path)
+    if dump_format == 'vcd':
+        with open(path, 'rb', buffering=COPY_CHUNK) as f:
+            yield f
+    elif dump_format == 'vcd.gz':
+        with gzip.open(path, 'rb') as f:
+            yield f
+    elif dump_format == 'vcd.zst' and zstandard is not None:
+        with open(path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+            yield reader
+    else:
+        command = [_tool('zstd', 'read .vcd.zst dumps'), '-d', '-c', '-q', str(path)] if dump_format == 'vcd.zst' \
+            else [_tool('fst2vcd', 'read FST dumps'), str(path)]
+        with _pipe(command, stdout=subprocess.PIPE) as process:
+            yield process.stdout
+
+
+def uncompressed_size(path: Union[str, Path], dump_format: Optional[str] = None) -> Optional[int]:
+    """
+    Size of a dump as plain VCD text, where the container records it.
+
+    Args:
+        path: Dump file
+        dump_format: Format if already known (detected otherwise)
+
+    Returns:
+        Byte count (for gzip exact below 4 GiB), or None when unknown (FST,
+        zstd frames without a content size)
+    """
+    path = Path(path)
+    dump_format = dump_format or detect_format(path)
+    if dump_format == 'vcd':
+        return path.stat().st_size
+    with open(path, 'rb') as f:
+        if dump_format == 'vcd.gz':
+            f.seek(-4, os.SEEK_END)
+            return struct.unpack('<I', f.read(4))[0]
+        if dump_format == 'vcd.zst':
+            try:
+                return _zstd_content_size(f)
+            except (IndexError, struct.error):
+                return None  # truncated frame
+    return None
+
+
+def _zstd_content_size(f: BinaryIO) -> Optional[int]:
+    """Sum of the frame content sizes of a zstd file (None if a frame omits it)."""
+    total = 0
+    while True:
+        magic = f.read(4)
+        if not magic:
+            return total
+        if len(magic) < 4:
+            return None
+        if 0x184D2A50 <= struct.unpack('<I', magic)[0] <= 0x184D2A5F:  # skippable frame
+            f.seek(struct.unpack('<I', f.read(4))[0], os.SEEK_CUR)
+            continue
+        if magic != _ZSTD_MAGIC:
+            return None
+        descriptor = f.read(1)[0]
+        fcs_flag, single_segment = descriptor >> 6, (descriptor >> 5) & 1
+        dict_bytes = (0, 1, 2, 4)[descriptor & 3]
+        fcs_bytes = (1 if single_segment else 0, 2, 4, 8)[fcs_flag]
+        f.seek((0 if single_segment else 1) + dict_bytes, os.SEEK_CUR)
+        if fcs_bytes == 0:
+            return None
+        size = int.from_bytes(f.read(fcs_bytes), 'little') + (256 if fcs_bytes == 2 else 0)
+        total += size
+        # Walk the blocks to the next frame
+        while True:
+            raw = f.read(3)
+            if len(raw) < 3:
+                return None
+            header = int.from_bytes(raw, 'little')
+            block_type, block_size = (header >> 1) & 3, header >> 3
+            f.seek(1 if block_type == 1 else block_size, os.SEEK_CUR)  # RLE blocks store one byte
+            if header & 1:
+                break
+        if (descriptor >> 2) & 1:
+            f.seek(4, os.SEEK_CUR)  # content checksum
+
+
+def _write_stream(source: BinaryIO, target: Path, dump_format: str, size: Optional[int] = None) -> None:
+    """Compress a VCD text stream into target (size, when known, is recorded in zstd frames)."""
+    if dump_format == 'vcd':
+        with open(target, 'wb') as out:
+            shutil.copyfileobj(source, out, COPY_CHUNK)
+    elif dump_format == 'vcd.gz':
+        with gzip.open(target, 'wb', compresslevel=GZIP_LEVEL) as out:
+            shutil.copyfileobj(source, out, COPY_CHUNK)
+    elif zstandard is not None:
+        with open(target, 'wb') as raw, zstandard.ZstdCompressor(threads=-1).stream_writer(raw, size=size or -1) as out:
+            shutil.copyfileobj(source, out, COPY_CHUNK)
+    else:
+        command = [_tool('zstd', 'write .vcd.zst dumps'), '-q', '-f', '-T0', '-o', str(target)]
+        if size:
+            command.append(f'--stream-size={size}')
+        with _pipe(command, stdin=subprocess.PIPE) as process:
+            shutil.copyfileobj(source, process.stdin, COPY_CHUNK)
+            process.stdin.close()
+            if process.wait() != 0:
+                raise OSError(f"zstd failed: {process.stderr.read().decode(errors='replace').strip()}")
+
+
+def convert_dump(source: Union[str, Path], target: Union[str, Path], dump_format: str,
+                 delete: bool = True) -> Dict:
+    """
+    Rewrite a dump in another format.
+
+    The target is written to a staging file and moved into place, so an
+    interrupted conversion never leaves a truncated dump. A plain VCD's
+    sidecar index is removed together with the VCD.
+
+    Args:
+        source: Existing dump (any format)
+        target: Output file
+        dump_format: Target format (one of DUMP_FORMATS)
+        delete: Remove the source afterwards (when it is a different file)
+
+    Returns:
+        Dictionary with 'from' (source format), 'bytes' (source size on disk),
+        'vcd_bytes' (plain VCD size, None if unknown) and 'dump_bytes'
+        (target size on disk)
+
+    Raises:
+        ValueError: If the format is unknown or FST is requested from a compressed VCD
+        FileNotFoundError: If a needed tool (zstd, fst2vcd, vcd2fst) is missing
+    """
+    if dump_format not in DUMP_FORMATS:
+        raise ValueError(f"Unknown dump format {dump_format!r} (choose from {', '.join(DUMP_FORMATS)})")
+    source, target = Path(source), Path(target)
+    source_format = detect_format(source)
+    result = {'from': source_format, 'bytes': source.stat().st_size,
+              'vcd_bytes': uncompressed_size(source, source_format)}
+
+    if source_format == dump_format:
+        # Already in the target format (e.g. FST that vvp wrote under a .vcd name)
+        if source.resolve() != target.resolve():
+            if delete:
+                os.replace(source, target)
+            else:
+                shutil.copyfile(source, target)
+        result['dump_bytes'] = target.stat().st_size
+        return result
+
+    staging = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        if dump_format == 'fst':
+            if source_format != 'vcd':
+                raise ValueError(f"{source.name}: FST can only be written from a plain VCD")
+            command = [_tool('vcd2fst', 'write FST dumps'), str(source), str(staging)]
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                raise OSError(f"vcd2fst failed: {completed.stderr.strip()}")
+        else:
+            with open_dump(source, source_format) as stream:
+                if result['vcd_bytes'] is None:
+                    stream = _Counting(stream)
+                # Only a plain source's size is exact (gzip records it modulo 4 GiB)
+                _write_stream(stream, staging, dump_format,
+                              result['vcd_bytes'] if source_format == 'vcd' else None)
+            if isinstance(stream, _Counting):
+                result['vcd_bytes'] = stream.count
+        os.replace(staging, target)
+    finally:
+        if staging.exists():
+            staging.unlink()
+
+    if delete:
+        source.unlink()
+        sidecar = source.with_name(source.name + '.idx')
+        if sidecar.exists():
+            sidecar.unlink()
+    result['dump_bytes'] = target.stat().st_size
+    return result
+
+
+class _Counting:
+    """Read-only stream wrapper counting the bytes read."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.count += len(data)
+        return data
+
+
+def format_size(count: int) -> str:
+    """Byte count as KB or MB."""
+    return f"{count / 1e6:.1f} MB" if count >= 1e6 else f"{count / 1e3:.1f} KB"
+
+
+def savings(vcd_bytes: Optional[int], dump_bytes: int) -> str:
+    """
+    Describe the space saved by a compact dump.
+
+    Args:
+        vcd_bytes: Size as plain VCD (None if unknown)
+        dump_bytes: Size on disk
+
+    Returns:
+        e.g. '12.4 MB -> 1.1 MB (91% less disk and read I/O)'
+    """
+    if not vcd_bytes:
+        return format_size(dump_bytes)
+    saved = 100.0 * (1 - dump_bytes / vcd_bytes)
+    return f"{format_size(vcd_bytes)} -> {format_size(dump_bytes)} ({saved:.0f}% less disk and read I/O)"
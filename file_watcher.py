@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+"""
+File Watcher
+============
+
+Change notification for watch mode of the Verilog automation framework.
+
+On Linux the watched directory trees are monitored with inotify (through
+ctypes, no extra packages needed); elsewhere, or when inotify is unavailable
+or out of watches, the trees are polled for changed modification times and
+sizes. Bursts of events (an editor writing a temporary file and renaming it
+over the source) are coalesced into one set of changed paths.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# Directories never watched (generated output, caches, VCS metadata)
+IGNORED_DIRS = {'imgs', '.verilog_cache', '.bench', '__pycache__', '.git'}
+DEBOUNCE = 0.2  # seconds without events before a batch of changes is reported
+POLL_INTERVAL = 1.0
+
+# inotify(7) constants
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+               | _IN_DELETE | _IN_DELETE_SELF | _IN_ATTRIB)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _ignored(name: str) -> bool:
+    return name in IGNORED_DIRS or name.startswith('.')
+
+
+def _walk_dirs(root: Path) -> Iterable[Path]:
+    """Yield a directory and all its non-ignored subdirectories."""
+    yield root
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False) and not _ignored(entry.name):
+            yield from _walk_dirs(Path(entry.path))
+
+
+class _Inotify:
+    """Recursive inotify watch over a set of directory trees."""
+
+    def __init__(self, roots: Iterable[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs: Dict[int, Path] = {}
+        try:
+            for root in roots:
+                for directory in _walk_dirs(root):
+                    self._watch(directory)
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def _watch(self, directory: Path) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return  # removed before we got to it
+            raise OSError(error, f'inotify_add_watch failed for {directory}')
+        self.dirs[wd] = directory
+
+    def read(self, timeout: Optional[float]) -> Set[Path]:
+        """Wait up to timeout seconds for events and return the paths they touch."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 << 10)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & _IN_DELETE_SELF:
+                self.dirs.pop(wd, None)
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO) and not _ignored(path.name):
+                    # Files may already exist in a directory moved into place
+                    for subdir in _walk_dirs(path):
+                        self._watch(subdir)
+                        changed.update(p for p in subdir.iterdir() if p.is_file())
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    """Fallback watch comparing (mtime, size) snapshots of directory trees."""
+
+    def __init__(self, roots: Iterable[Path], interval: float):
+        self.roots = list(roots)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for directory in _walk_dirs(root):
+                try:
+                    entries = list(os.scandir(directory))
+                except OSError:
+                    continue
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            snapshot[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        pass
+        return snapshot
+
+    def read(self, timeout: Optional[float]) -> Set[Path]:
+        """Rescan after one poll interval (capped by timeout) and return changed paths."""
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        snapshot = self._scan()
+        changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                   if snapshot.get(path) != self.snapshot.get(path)}
+        self.snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class FileWatcher:
+    """Reports files created, modified or deleted under a set of directory trees."""
+
+    def __init__(self, roots: Iterable[Path], poll_interval: float = POLL_INTERVAL, polling: bool = False):
+        """
+        Start watching.
+
+        Args:
+            roots: Directories to watch recursively (ignored directories such
+                as 'imgs' and the build cache are skipped)
+            poll_interval: Seconds between scans when polling
+            polling: Force the polling backend even where inotify is available
+        """
+        roots = sorted({Path(root).resolve() for root in roots if Path(root).is_dir()})
+        self._backend = None
+        if not polling and sys.platform.startswith('linux'):
+            try:
+                self._backend = _Inotify(roots)
+            except (OSError, AttributeError, TypeError):
+                self._backend = None  # e.g. no libc symbol or max_user_watches reached
+        if self._backend is None:
+            self._backend = _Poller(roots, poll_interval)
+        self.backend = 'inotify' if isinstance(self._backend, _Inotify) else 'polling'
+        self.roots = roots
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Block until something changes, then collect the rest of the burst.
+
+        Args:
+            timeout: Give up after this many seconds (None waits forever)
+
+        Returns:
+            Resolved paths that changed (empty if the timeout expired)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: Set[Path] = set()
+        while not changed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            changed = self._backend.read(remaining)
+
+        # Coalesce the rest of the burst (editors often write, rename and chmod)
+        while True:
+            more = self._backend.read(DEBOUNCE)
+            if not more:
+                break
+            changed |= more
+        return {path.resolve() for path in changed}
+
+    def close(self) -> None:
+        """Release the watch."""
+        self._backend.close()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+"""
+Plot Settings
+=============
+
+Image formats, render profiles and level-of-detail modes shared by the
+waveform renderer and the command line. Kept free of matplotlib and NumPy so
+the CLI can validate options without importing the plotting stack.
+"""
+
+# Waveform plot resolution and level-of-detail modes
+PLOT_DPI = 300
+LOD_MODES = ('auto', 'on', 'off')
+
+# Output formats (chosen by file extension) and named render profiles
+IMAGE_FORMATS = ('png', 'svg', 'pdf', 'webp')
+OUTPUT_PROFILES = {
+    'default': {'format': 'png', 'dpi': PLOT_DPI, 'terminal_dpi': 150,
+                'annotate': True, 'antialias': True},
+    # Fast iteration: small raster, no value labels, no antialiasing
+    'preview': {'format': 'png', 'dpi': 72, 'terminal_dpi': 72,
+                'annotate': False, 'antialias': False},
+    # Final bundles: vector waveforms, high-resolution terminal captures
+    'publication': {'format': 'svg', 'dpi': PLOT_DPI, 'terminal_dpi': 300,
+                    'annotate': True, 'antialias': True},
+}
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""
+Process Runner
+==============
+
+Asyncio-based execution of the external tools (iverilog, vvp, termshot).
+
+Each command runs in its own process group (session) with stdout and stderr
+read concurrently, so a chatty tool can never deadlock on a full pipe. Output
+can be echoed live while it is captured. A timeout or a cancellation
+(including Ctrl-C) kills the whole process tree, e.g. termshot together with
+the vvp it started, so a testbench that never reaches ``$finish`` fails
+instead of hanging the run.
+
+A process-wide semaphore (set_process_limit) bounds how many tools run at
+once across parallel workers.
+"""
+
+import asyncio
+import codecs
+import os
+import signal
+import subprocess
+import time
+from typing import Callable, List, Optional
+
+# Default per-stage timeouts in seconds (None disables a timeout)
+DEFAULT_TIMEOUTS = {'compile': 300, 'simulate': 900, 'terminal': 900}
+KILL_GRACE = 2.0  # seconds between SIGTERM and SIGKILL
+READ_CHUNK = 64 << 10
+
+Echo = Optional[Callable[[str], None]]
+
+_process_slots = None
+
+
+def set_process_limit(semaphore) -> None:
+    """
+    Bound concurrently running tools (call in each worker, e.g. as a pool initializer).
+
+    Args:
+        semaphore: Shared multiprocessing semaphore, or None for no limit
+    """
+    global _process_slots
+    _process_slots = semaphore
+
+
+class CommandResult:
+    """Outcome of a command; compatible with subprocess.CompletedProcess."""
+
+    def __init__(self, args: List[str], returncode: int, stdout: str, stderr: str,
+                 timed_out: bool = False, duration: float = 0.0):
+        """
+        Initialize a result.
+
+        Args:
+            args: Command that was run
+            returncode: Exit status (negative signal number if killed)
+            stdout: Captured standard output
+            stderr: Captured standard error
+            timed_out: Whether the command was killed for exceeding its timeout
+            duration: Wall time in seconds
+        """
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out
+        self.duration = duration
+
+
+async def _pump(stream: asyncio.StreamReader, chunks: List[str], echo: Echo) -> None:
+    """Read a pipe to EOF, keeping (and optionally echoing) decoded text."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        data = await stream.read(READ_CHUNK)
+        text = decoder.decode(data, final=not data)
+        if text:
+            chunks.append(text)
+            if echo:
+                echo(text)
+        if not data:
+            return
+
+
+def _signal_tree(process: asyncio.subprocess.Process, force: bool) -> None:
+    """Signal a process and everything it started."""
+    try:
+        if os.name == 'nt':
+            subprocess.run(['taskkill', '/T', '/F', '/PID', str(process.pid)], capture_output=True)
+        else:
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+async def _kill_tree(process: asyncio.subprocess.Process) -> None:
+    """Terminate a process tree, escalating to a hard kill after KILL_GRACE."""
+    _signal_tree(process, force=False)
+    try:
+        await asyncio.wait_for(process.wait(), KILL_GRACE)
+    except asyncio.TimeoutError:
+        _signal_tree(process, force=True)
+        await process.wait()
+
+
+async def run_process(command: List[str], cwd: Optional[str] = None, timeout: Optional[float] = None,
+                      echo_stdout: Echo = None, echo_stderr: Echo = None) -> CommandResult:
+    """
+    Run a command to completion, its timeout, or cancellation.
+
+    Args:
+        command: Command as list of strings
+        cwd: Working directory
+        timeout: Seconds before the process tree is killed (None for no limit)
+        echo_stdout: Called with stdout text as it arrives
+        echo_stderr: Called with stderr text as it arrives
+
+    Returns:
+        CommandResult with everything captured up to exit or kill
+
+    Raises:
+        FileNotFoundError: If the executable does not exist
+    """
+    if os.name == 'nt':
+        group = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group = {'start_new_session': True}
+
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *command, cwd=cwd, stdin=subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, **group)
+
+    stdout: List[str] = []
+    stderr: List[str] = []
+
+    async def communicate():
+        await asyncio.gather(_pump(process.stdout, stdout, echo_stdout),
+                             _pump(process.stderr, stderr, echo_stderr))
+        await process.wait()
+
+    timed_out = False
+    try:
+        await asyncio.wait_for(communicate(), timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+    finally:
+        # Timeout or cancellation: take down the whole tree (e.g. termshot -> vvp)
+        if process.returncode is None:
+            await _kill_tree(process)
+
+    return CommandResult(command, process.returncode, ''.join(stdout), ''.join(stderr),
+                         timed_out, time.perf_counter() - started)
+
+
+def run_command(command: List[str], cwd: Optional[str] = None, timeout: Optional[float] = None,
+                echo_stdout: Echo = None, echo_stderr: Echo = None) -> CommandResult:
+    """
+    Synchronous wrapper around run_process() honouring the process limit.
+
+    Args:
+        command: Command as list of strings
+        cwd: Working directory
+        timeout: Seconds before the process tree is killed (None for no limit)
+        echo_stdout: Called with stdout text as it arrives
+        echo_stderr: Called with stderr text as it arrives
+
+    Returns:
+        CommandResult
+    """
+    if _process_slots is not None:
+        _process_slots.acquire()
+    try:
+        return asyncio.run(run_process(command, cwd, timeout, echo_stdout, echo_stderr))
+    finally:
+        if _process_slots is not None:
+            _process_slots.release()
@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+
+"""
+Report Build
+============
+
+Dependency-tracked Typst builds of the assignment reports.
+
+A document's inputs are found by scanning its source, without running Typst:
+
+- ``#import`` / ``#include`` files (scanned in turn, so their helpers are known)
+- paths given to ``read``, ``image`` and the data loaders (``json``, ``csv`` ...)
+- paths built by helper functions such as ``termimg("q1")`` / ``plotimg("q1")``:
+  string literals, ``#let`` string bindings, parameters and ``+``
+  concatenation are evaluated, so both ``termimg_generic(asgno, quesno)``
+  from template/funcs.typ and inline ``image("Asg2/imgs/" + quesno + ...)``
+  helpers resolve
+
+Paths are matched case-insensitively when the exact name does not exist
+(the reports say ``asg1/q1.v`` for ``Asg1/q1.v``). A document is compiled
+only when its PDF is missing, the typst version changed or the content of
+an input changed since its last successful build; input hashes are kept in a
+JSON state file, with size and mtime as a fast path.
+
+replace_if_changed() lets the renderers keep an existing image when a
+re-render produced the same pixels, so unchanged figures keep their
+timestamps.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+STATE_VERSION = 1
+DEFAULT_OUTPUT = '{dir}/{stem}.pdf'
+RASTER_SUFFIXES = {'.png', '.webp', '.jpg', '.jpeg'}
+MAX_DEPTH = 8  # helper call nesting evaluated
+
+# Built-in functions whose first argument is a file path
+PATH_FUNCTIONS = {'read', 'image', 'json', 'csv', 'yaml', 'toml', 'xml', 'cbor'}
+
+_COMMENT_OR_STRING = re.compile(r'"(?:\\.|[^"\\\n])*"|/\*.*?\*/|//[^\n]*', re.DOTALL)
+_IMPORT = re.compile(r'\b(?:import|include)\s+"([^"]+)"')
+_LET_FUNCTION = re.compile(r'\blet\s+([A-Za-z_][\w-]*)\(([^)]*)\)\s*=\s*')
+_LET_VALUE = re.compile(r'\blet\s+([A-Za-z_][\w-]*)\s*=\s*([^;\n]+)')
+_CALL = re.compile(r'(?<![\w.-])([A-Za-z_][\w-]*)\(')
+_RETURN = re.compile(r'\breturn\s+')
+_IDENTIFIER = re.compile(r'[A-Za-z_][\w-]*')
+_STRING = re.compile(r'"((?:\\.|[^"\\])*)"')
+
+
+def _strip_comments(text: str) -> str:
+    return _COMMENT_OR_STRING.sub(lambda m: m.group(0) if m.group(0).startswith('"') else ' ', text)
+
+
+def _closing(text: str, start: int) -> int:
+    """Index just past the bracket matching text[start] (skipping strings)."""
+    depth, i = 0, start
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            match = _STRING.match(text, i)
+            i = match.end() if match else i + 1
+            continue
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(text)
+
+
+def _split_top(text: str, separator: str) -> List[str]:
+    """Split on a separator outside brackets and strings."""
+    parts, depth, start, i = [], 0, 0, 0
+    while i < len(text):
+        char = text[i]
+        if char == '"':
+            match = _STRING.match(text, i)
+            i = match.end() if match else i + 1
+            continue
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+        i += 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts]
+
+
+def _arguments(text: str) -> Tuple[List[str], Dict[str, str]]:
+    """Positional and named argument expressions of a call's argument list."""
+    positional, named = [], {}
+    for part in _split_top(text, ','):
+        if not part:
+            continue
+        match = re.match(r'([A-Za-z_][\w-]*)\s*:\s*(.+)$', part, re.DOTALL)
+        if match and not part.startswith('"'):
+            named[match.group(1)] = match.group(2)
+        else:
+            positional.append(part)
+    return positional, named
+
+
+class _Module:
+    """String bindings and helper functions of a Typst file (and its imports)."""
+
+    def __init__(self):
+        self.values: Dict[str, str] = {}
+        self.functions: Dict[str, Tuple[List[Tuple[str, Optional[str]]], str]] = {}
+
+    def value(self, expr: str, env: Dict[str, str], depth: int = 0) -> Optional[str]:
+        """Evaluate a string expression (literals, names, '+', str() and helper calls); None if unknown."""
+        expr = expr.strip()
+        if depth > MAX_DEPTH or not expr:
+            return None
+        parts = _split_top(expr, '+')
+        if len(parts) > 1:
+            values = [self.value(part, env, depth) for part in parts]
+            return None if None in values else ''.join(values)
+        match = _STRING.fullmatch(expr)
+        if match:
+            return match.group(1).replace('\\"', '"').replace('\\\\', '\\')
+        if _IDENTIFIER.fullmatch(expr):
+            return env[expr] if expr in env else self.values.get(expr)
+        match = _CALL.match(expr)
+        if match and _closing(expr, match.end() - 1) == len(expr):
+            name, inner = match.group(1), expr[match.end():-1]
+            positional, named = _arguments(inner)
+            if name == 'str' and positional:
+                return self.value(positional[0], env, depth + 1)
+            if name in self.functions:
+                body, local = self._bind(name, positional, named, env, depth)
+                returned = _RETURN.search(body)
+                if returned:
+                    body = body[returned.end():].split('\n', 1)[0]
+                elif body.startswith('{'):
+                    body = body[1:-1]
+                return self.value(body, local, depth + 1)
+        return None
+
+    def _bind(self, name: str, positional: List[str], named: Dict[str, str], env: Dict[str, str],
+              depth: int) -> Tuple[str, Dict[str, str]]:
+        """A helper's body and its parameters bound to the evaluated arguments."""
+        params, body = self.functions[name]
+        local = {}
+        for index, (param, default) in enumerate(params):
+            expr = named.get(param, positional[index] if index < len(positional) else default)
+            value = self.value(expr, env, depth + 1) if expr is not None else None
+            if value is not None:
+                local[param] = value
+        return body, local
+
+    def paths(self, text: str, env: Dict[str, str], depth: int = 0) -> List[str]:
+        """Every file path a piece of code reads, as far as it can be evaluated."""
+        found = []
+        if depth > MAX_DEPTH:
+            return found
+        for match in _CALL.finditer(text):
+            if re.search(r'\blet\s+$', text[max(0, match.start() - 8):match.start()]):
+                continue  # a definition, not a call
+            name = match.group(1)
+            inner = text[match.end():_closing(text, match.end() - 1) - 1]
+            positional, named = _arguments(inner)
+            if name in PATH_FUNCTIONS and positional:
+                path = self.value(positional[0], env, depth)
+                if path is not None:
+                    found.append(path)
+            elif name in self.functions:
+                body, local = self._bind(name, positional, named, env, depth)
+                found += self.paths(body, local, depth + 1)
+        return found
+
+
+def resolve_path(name: str, base_dir: Path, root: Path) -> Path:
+    """
+    Resolve a path used in a Typst file.
+
+    Args:
+        name: Path as written ('/x' is relative to the project root)
+        base_dir: Directory of the file using it
+        root: Project root
+
+    Returns:
+        Existing path (matching case-insensitively if needed), else the literal one
+    """
+    path = Path(os.path.normpath(root / name.lstrip('/') if name.startswith('/') else base_dir / name))
+    if path.exists():
+        return path
+    current = root if name.startswith('/') else base_dir
+    for part in Path(os.path.normpath(name.lstrip('/'))).parts:
+        candidate = current / part
+        if not candidate.exists() and current.is_dir() and part not in ('.', '..'):
+            matches = [child for child in current.iterdir() if child.name.lower() == part.lower()]
+            candidate = matches[0] if matches else candidate
+        current = candidate
+    return current if current.exists() else path
+
+
+def scan_document(document: Union[str, Path], root: Union[str, Path]) -> List[Path]:
+    """
+    Find the files a Typst document depends on.
+
+    Args:
+        document: .typ file
+        root: Project root (typst --root)
+
+    Returns:
+        Input files (imported .typ files, read data, images), in first-use order
+    """
+    root = Path(root).resolve()
+    inputs: List[Path] = []
+    module = _Module()
+
+    def visit(path: Path, depth: int) -> None:
+        try:
+            code = _strip_comments(path.read_text(errors='replace'))
+        except OSError:
+            return
+        for match in _IMPORT.finditer(code):
+            imported = resolve_path(match.group(1), path.parent, root)
+            if imported not in inputs:
+                inputs.append(imported)
+                if depth < MAX_DEPTH:
+                    visit(imported, depth + 1)
+        for match in _LET_FUNCTION.finditer(code):
+            params = []
+            for param in _split_top(match.group(2), ','):
+                if param:
+                    name, _, default = param.partition(':')
+                    params.append((name.strip(), default.strip() or None))
+            start = match.end()
+            if code[start:start + 1] in ('{', '['):
+                end = _closing(code, start)
+            else:
+                end = code.find('\n', start) if '\n' in code[start:] else len(code)
+            module.functions[match.group(1)] = (params, code[start:end].strip().rstrip(';'))
+        for match in _LET_VALUE.finditer(code):
+            value = module.value(match.group(2).rstrip(';'), {})
+            if value is not None:
+                module.values[match.group(1)] = value
+        for name in module.paths(code, {}):
+            resolved = resolve_path(name, path.parent, root)
+            if resolved not in inputs:
+                inputs.append(resolved)
+
+    visit(Path(document).resolve(), 0)
+    return inputs
+
+
+def images_equal(first: Union[str, Path], second: Union[str, Path]) -> bool:
+    """
+    Whether two image files show the same picture.
+
+    Raster images are compared pixel by pixel (with Pillow, which matplotlib
+    already requires), other formats byte by byte.
+    """
+    first, second = Path(first), Path(second)
+    if first.read_bytes() == second.read_bytes():
+        return True
+    if first.suffix.lower() not in RASTER_SUFFIXES:
+        return False
+    try:
+        from PIL import Image
+        with Image.open(first) as a, Image.open(second) as b:
+            return a.mode == b.mode and a.size == b.size and a.tobytes() == b.tobytes()
+    except (ImportError, OSError, ValueError):
+        return False
+
+
+def replace_if_changed(staged: Union[str, Path], target: Union[str, Path]) -> bool:
+    """
+    Move a freshly written image into place unless it looks the same as the existing one.
+
+    Args:
+        staged: New image
+        target: Image to replace
+
+    Returns:
+        True if the target was replaced, False if it was kept (staged is deleted)
+    """
+    staged, target = Path(staged), Path(target)
+    if target.exists() and images_equal(staged, target):
+        staged.unlink()
+        return False
+    os.replace(staged, target)
+    return True
+
+
+class ReportBuilder:
+    """Incremental Typst compiler keyed on the content of each document's inputs."""
+
+    def __init__(self, root: Union[str, Path], typst: str = 'typst', typst_version: str = 'unknown',
+                 state_file: Optional[Union[str, Path]] = None, output: str = DEFAULT_OUTPUT):
+        """
+        Initialize the builder.
+
+        Args:
+            root: Project root, passed to typst --root
+            typst: Typst executable
+            typst_version: Version banner (a change rebuilds every document)
+            state_file: JSON file recording each document's last built inputs
+                (None to rebuild every time)
+            output: PDF path template relative to root ({dir}: the document's
+                directory, {stem}: its name without extension)
+        """
+        self.root = Path(root).resolve()
+        self.typst = typst
+        self.typst_version = typst_version
+        self.state_file = Path(state_file) if state_file else None
+        self.output = output
+        self._state: Dict[str, Dict] = {}
+        if self.state_file and self.state_file.exists():
+            try:
+                stored = json.loads(self.state_file.read_text())
+                if stored.get('version') == STATE_VERSION:
+                    self._state = stored['documents']
+            except (OSError, ValueError, KeyError):
+                self._state = {}
+
+    def _relative(self, path: Path) -> str:
+        try:
+            return path.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path.resolve())
+
+    def output_path(self, document: Union[str, Path], **fields) -> Path:
+        """PDF written for a document (extra template fields, e.g. folder, may be given)."""
+        document = Path(document).resolve()
+        relative_dir = Path(self._relative(document.parent)) if document.parent != self.root else Path('.')
+        return self.root / self.output.format(dir=relative_dir.as_posix(), stem=document.stem, **fields)
+
+    @staticmethod
+    def _fingerprint(path: Path, previous: Optional[List] = None) -> Optional[List]:
+        """[mtime_ns, size, sha256] of a file, reusing the previous hash when the stat matches."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+            return previous
+        return [stat.st_mtime_ns, stat.st_size, hashlib.sha256(path.read_bytes()).hexdigest()]
+
+    def plan(self, document: Union[str, Path], output: Path) -> Dict:
+        """
+        Decide whether a document needs compiling.
+
+        Args:
+            document: .typ file
+            output: PDF it is compiled to
+
+        Returns:
+            Dictionary with 'inputs' (relative path -> fingerprint, None if
+            missing), 'missing' and 'reason' (why it is stale, None if up to date)
+        """
+        document = Path(document).resolve()
+        previous = self._state.get(self._relative(document), {})
+        old_inputs = previous.get('inputs', {})
+        inputs = {}
+        for path in [document] + scan_document(document, self.root):
+            name = self._relative(path)
+            inputs[name] = self._fingerprint(path, old_inputs.get(name))
+        missing = [name for name, fingerprint in inputs.items() if fingerprint is None]
+
+        reason = None
+        if not output.exists():
+            reason = 'no PDF yet'
+        elif not previous:
+            reason = 'no recorded build'
+        elif previous.get('output') != self._relative(output):
+            reason = 'output changed'
+        elif previous.get('typst') != self.typst_version:
+            reason = 'typst version changed'
+        elif set(inputs) != set(old_inputs):
+            reason = 'dependencies changed'
+        else:
+            changed = [name for name, fingerprint in inputs.items()
+                       if fingerprint is None or fingerprint[2] != old_inputs[name][2]]
+            if changed:
+                reason = f"{changed[0]} changed" + (f" (+{len(changed) - 1} more)" if len(changed) > 1 else '')
+        return {'inputs': inputs, 'missing': missing, 'reason': reason}
+
+    def _compile(self, document: Path, output: Path, timeout: Optional[float]) -> Tuple[bool, str]:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        command = [self.typst, 'compile', '--root', str(self.root), str(document), str(output)]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+        except FileNotFoundError:
+            return False, f"{self.typst} not found (install Typst from https://github.com/typst/typst)"
+        except subprocess.TimeoutExpired:
+            return False, f"timed out after {timeout:.0f}s"
+        return result.returncode == 0, (result.stderr or result.stdout).strip()
+
+    def build(self, documents: List[Union[str, Path]], force: bool = False, jobs: int = 1,
+              timeout: Optional[float] = None, **fields) -> List[Dict]:
+        """
+        Compile the documents whose inputs changed.
+
+        Args:
+            documents: .typ files
+            force: Compile every document
+            jobs: Documents compiled at once
+            timeout: Seconds allowed per typst run
+            **fields: Extra output template fields
+
+        Returns:
+            One dictionary per document with 'document', 'output', 'status'
+            ('built', 'current' or 'failed'), 'reason', 'missing', 'error'
+            and 'seconds'
+        """
+        results, pending = [], []
+        for document in documents:
+            document = Path(document).resolve()
+            output = self.output_path(document, **fields)
+            plan = self.plan(document, output)
+            result = {'document': self._relative(document), 'output': self._relative(output),
+                      'status': 'current', 'reason': 'forced' if force else plan['reason'],
+                      'missing': plan['missing'], 'error': '', 'seconds': 0.0}
+            results.append(result)
+            if result['reason']:
+                pending.append((document, output, plan, result))
+
+        def run(item) -> None:
+            document, output, plan, result = item
+            started = time.perf_counter()
+            success, message = self._compile(document, output, timeout)
+            result['seconds'] = time.perf_counter() - started
+            result['status'] = 'built' if success else 'failed'
+            result['error'] = '' if success else message
+            if success:
+                self._state[result['document']] = {'output': result['output'], 'typst': self.typst_version,
+                                                   'inputs': plan['inputs']}
+            else:
+                self._state.pop(result['document'], None)
+
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            list(pool.map(run, pending))
+        self.save()
+        return results
+
+    def save(self) -> None:
+        """Persist the build state (atomic; errors are ignored)."""
+        if not self.state_file:
+            return
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            staging = self.state_file.with_name(f".{self.state_file.name}.{os.getpid()}.tmp")
+            staging.write_text(json.dumps({'version': STATE_VERSION, 'documents': self._state}, indent=1))
+            os.replace(staging, self.state_file)
+        except OSError:
+            pass
+
+
+def print_results(results: List[Dict]) -> bool:
+    """Print one line per document; returns True if none failed."""
+    for result in results:
+        if result['status'] == 'current':
+            print(f"  {result['document']}: up to date ({result['output']})")
+        elif result['status'] == 'built':
+            print(f"✓ {result['document']} -> {result['output']} ({result['reason']}, {result['seconds']:.2f}s)")
+        else:
+            print(f"✗ {result['document']}: {result['error'] or 'typst failed'}")
+            for name in result['missing']:
+                print(f"    missing input: {name}")
+    built = sum(result['status'] == 'built' for result in results)
+    failed = sum(result['status'] == 'failed' for result in results)
+    print(f"{'✓' if not failed else '✗'} {built} compiled, {len(results) - built - failed} up to date"
+          + (f", {failed} failed" if failed else ''))
+    return not failed
+
+
+def main():
+    """Compile the reports whose inputs changed."""
+    from toolchain import Toolchain
+
+    parser = argparse.ArgumentParser(description='Verilog Automation Framework - Incremental Typst Reports')
+    parser.add_argument('documents', nargs='*', help='Typst documents (default: Asg*.typ in the root)')
+    parser.add_argument('--root', default='.', help='Project root passed to typst --root (default: .)')
+    parser.add_argument('--output', '-o', default=DEFAULT_OUTPUT,
+                        help=f'PDF path template, with {{dir}} and {{stem}} (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--state', default='.verilog_cache/typst.json',
+                        help='Build state file, relative to the root (default: .verilog_cache/typst.json)')
+    parser.add_argument('--force', '-f', action='store_true', help='Compile every document')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Documents compiled at once (default: 1)')
+    parser.add_argument('--deps', action='store_true', help='Only list each document\'s inputs')
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    documents = [Path(document) for document in args.documents] or sorted(root.glob('Asg*.typ'))
+    if not documents:
+        print(f"No Typst documents found in {root}")
+        sys.exit(1)
+    if args.deps:
+        for document in documents:
+            print(f"{document}:")
+            for path in scan_document(document, root):
+                print(f"  {'' if path.exists() else '(missing) '}{path}")
+        return
+
+    typst = Toolchain().resolve('typst')
+    builder = ReportBuilder(root, typst.command, typst.version, root / args.state, args.output)
+    sys.exit(0 if print_results(builder.build(documents, args.force, args.jobs)) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+"""
+Run Report
+==========
+
+Per-stage instrumentation for the Verilog automation pipeline.
+
+Every stage (compile, simulate, terminal capture, VCD load, render, save) is
+measured for wall time, CPU time (including the external tools it spawned)
+and peak resident memory. Per-file facts such as the VCD size (as plain text
+and as stored) and transition counts are recorded alongside, and the whole
+run can be written as JSON or CSV. Python stages can optionally be run under
+cProfile, with one ``.prof`` file per stage and file.
+"""
+
+import contextlib
+import cProfile
+import csv
+import json
+import os
+import platform
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+_RSS_SCALE = 1 if sys.platform == 'darwin' else 1024
+
+CSV_FIELDS = ['file', 'success', 'vcd_bytes', 'dump_format', 'dump_bytes', 'signals', 'transitions',
+              'stage', 'cached', 'ok', 'wall_s', 'cpu_s', 'child_cpu_s', 'peak_rss_mb', 'child_peak_rss_mb', 'profile']
+
+
+def _peak_rss_mb(who) -> Optional[float]:
+    """High-water resident set size in MB (None where unsupported)."""
+    if resource is None:
+        return None
+    return round(resource.getrusage(who).ru_maxrss * _RSS_SCALE / (1024 * 1024), 1)
+
+
+class RunReport:
+    """Collects per-file, per-stage measurements for one automation run."""
+
+    def __init__(self, profile_dir: Optional[Union[str, Path]] = None):
+        """
+        Initialize an empty report.
+
+        Args:
+            profile_dir: Directory for cProfile output of Python stages (None to disable)
+        """
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.started = time.time()
+        self.files: List[Dict] = []
+        self.tools: Dict[str, str] = {}
+        self._current: Optional[Dict] = None
+        self._profile_name = ''
+
+    @staticmethod
+    def file_record(name: str) -> Dict:
+        """Empty record for one file (stage list and per-file facts)."""
+        return {'file': name, 'success': False, 'vcd_bytes': None, 'dump_format': None, 'dump_bytes': None,
+                'signals': None, 'transitions': None, 'stages': []}
+
+    def start_file(self, name: str, profile_name: Optional[str] = None) -> Dict:
+        """
+        Begin recording a file; later stages are attributed to it.
+
+        Args:
+            name: File name from the config entry
+            profile_name: Unique prefix for the file's .prof files (default: the
+                name without suffix); entries sharing a source, such as sweep
+                variants, need one
+
+        Returns:
+            The file's record
+        """
+        self._profile_name = re.sub(r'[^\w.-]+', '_', profile_name or str(Path(name).with_suffix(''))).strip('_.') or 'run'
+        self._current = self.file_record(name)
+        self.files.append(self._current)
+        return self._current
+
+    def add_file(self, record: Dict) -> None:
+        """Add a file record produced elsewhere (e.g. by a worker process)."""
+        self.files.append(record)
+
+    def note(self, **facts) -> None:
+        """Record per-file facts such as vcd_bytes or transitions."""
+        if self._current is not None:
+            self._current.update(facts)
+
+    def cached(self, stage: str) -> None:
+        """Record a stage that was restored from the build cache."""
+        if self._current is not None:
+            self._current['stages'].append({'stage': stage, 'cached': True, 'ok': True})
+
+    @contextlib.contextmanager
+    def stage(self, stage: str, profile: bool = False) -> Iterator[Dict]:
+        """
+        Measure a stage of the current file.
+
+        Args:
+            stage: Stage name (e.g. 'compile', 'vcd_load')
+            profile: Run the block under cProfile when a profile directory is set
+
+        Yields:
+            The stage record; set record['ok'] = False to mark a failed stage
+        """
+        record = {'stage': stage, 'cached': False, 'ok': True}
+        profiler = cProfile.Profile() if profile and self.profile_dir else None
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        children = os.times()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        except BaseException:
+            record['ok'] = False
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+            after = os.times()
+            record['wall_s'] = round(time.perf_counter() - wall, 4)
+            record['cpu_s'] = round(time.process_time() - cpu, 4)
+            record['child_cpu_s'] = round((after.children_user - children.children_user)
+                                          + (after.children_system - children.children_system), 4)
+            if resource is not None:
+                record['peak_rss_mb'] = _peak_rss_mb(resource.RUSAGE_SELF)
+                record['child_peak_rss_mb'] = _peak_rss_mb(resource.RUSAGE_CHILDREN)
+            if profiler:
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                name = self._profile_name if self._current else 'run'
+                profile_path = self.profile_dir / f"{name}.{stage}.prof"
+                profiler.dump_stats(profile_path)
+                record['profile'] = str(profile_path)
+            if self._current is not None:
+                self._current['stages'].append(record)
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Sum wall and CPU time per stage across all files.
+
+        Returns:
+            Mapping of stage name to {'runs', 'cached', 'wall_s', 'cpu_s'}
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for record in self.files:
+            for stage in record['stages']:
+                total = totals.setdefault(stage['stage'], {'runs': 0, 'cached': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+                if stage['cached']:
+                    total['cached'] += 1
+                    continue
+                total['runs'] += 1
+                total['wall_s'] += stage.get('wall_s', 0.0)
+                total['cpu_s'] += stage.get('cpu_s', 0.0) + stage.get('child_cpu_s', 0.0)
+        return totals
+
+    def to_dict(self) -> Dict:
+        """Full report as a JSON-serializable dictionary."""
+        return {'started': self.started, 'duration_s': round(time.time() - self.started, 3),
+                'python': platform.python_version(), 'platform': platform.platform(),
+                'tools': self.tools, 'files': self.files, 'totals': self.stage_totals()}
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """
+        Write the report; '.csv' paths get one row per stage, anything else JSON.
+
+        Args:
+            path: Output file
+
+        Returns:
+            Path written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == '.csv':
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                for record in self.files:
+                    facts = {key: value for key, value in record.items() if key != 'stages'}
+                    for stage in record['stages'] or [{}]:
+                        writer.writerow({**facts, **stage})
+        else:
+            path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+"""
+Sweeps
+======
+
+Parameter and seed sweeps for the Verilog automation framework.
+
+A config entry with a ``sweep`` expands into one entry per variant, the
+cartesian product of its axes:
+
+- ``defines``: define sets, compiled in (iverilog ``-D``); each unique set is
+  compiled once and its VVP file is shared by the set's variants
+- ``plusargs``: run-time arguments passed to vvp (``+mode=1``)
+- ``seeds``: random seeds, passed to vvp as ``+seed=N`` (``seed_plusarg``
+  renames it; an integer N sweeps seeds 1..N)
+
+Every variant runs in its own directory below ``sweeps/<name>/``, so
+concurrent simulations of the same testbench never write the same
+``$dumpfile``, and gets its own output names (``<name>__<variant>``).
+"""
+
+import itertools
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SWEEP_DIR = 'sweeps'
+SEED_PLUSARG = 'seed'
+SWEEP_AXES = ('defines', 'plusargs', 'seeds', 'seed_plusarg')
+
+_UNSAFE = re.compile(r'[^A-Za-z0-9_-]+')
+
+
+def normalize_defines(value) -> Dict[str, Optional[str]]:
+    """
+    Normalize a define set.
+
+    Args:
+        value: Dictionary of name -> value (None or true for a bare define),
+            a 'NAME[=VALUE]' string or a list of them (None for no defines)
+
+    Returns:
+        Dictionary of macro name -> value (None for a bare define)
+
+    Raises:
+        ValueError: If the value has another type
+    """
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return {str(name): None if item is None or item is True else str(item) for name, item in value.items()}
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        raise ValueError(f"Invalid defines {value!r} (expected an object, a 'NAME=VALUE' string or a list)")
+    defines = {}
+    for item in value:
+        name, _, macro_value = str(item).partition('=')
+        defines[name.strip()] = macro_value.strip() if '=' in str(item) else None
+    return defines
+
+
+def define_flags(defines: Dict[str, Optional[str]]) -> List[str]:
+    """iverilog arguments for a define set (['-DWIDTH=8', '-DFAST'])."""
+    return [f"-D{name}" if value is None else f"-D{name}={value}" for name, value in defines.items()]
+
+
+def normalize_plusargs(value) -> List[str]:
+    """
+    Normalize plusargs to a list of '+name[=value]' strings.
+
+    Args:
+        value: A string or a list of strings (the leading '+' is optional;
+            None for no plusargs)
+
+    Returns:
+        List of plusargs
+    """
+    if not value:
+        return []
+    items = [value] if isinstance(value, str) else list(value)
+    return [item if item.startswith('+') else f"+{item}" for item in (str(item).strip() for item in items) if item]
+
+
+def _define_label(defines: Dict[str, Optional[str]]) -> str:
+    return ' '.join(name if value is None else f"{name}={value}" for name, value in defines.items())
+
+
+def _tag(label: str) -> str:
+    """File-name-safe form of a variant label (no dots, so Path.stem keeps it whole)."""
+    return _UNSAFE.sub('-', label.replace('+', '').replace('=', '-').replace(' ', '_')).strip('-_')
+
+
+def _axis(spec: Dict, key: str, name: str) -> List:
+    values = spec.get(key)
+    if values is None:
+        return [None]
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"{name}: sweep '{key}' must be a non-empty list")
+    return values
+
+
+def expand_sweep(entry: Dict) -> List[Dict]:
+    """
+    Expand one sweep entry into its variant entries.
+
+    Variant entries are ordinary entries (without 'sweep') carrying
+    'defines', 'plusargs', 'output_name', 'compile_name' (the VVP file shared
+    by the define set), 'run_dir' and 'variant' (sweep name and the labels
+    of its define set and run arguments, used for the pass/fail matrix).
+
+    Args:
+        entry: Config entry with a 'sweep' object
+
+    Returns:
+        Variant entries, define sets varying slowest
+
+    Raises:
+        ValueError: If the sweep is malformed
+    """
+    name = entry.get('name', '<unnamed>')
+    spec = entry['sweep']
+    if not isinstance(spec, dict):
+        raise ValueError(f"{name}: 'sweep' must be an object with 'defines', 'plusargs' and/or 'seeds'")
+    unknown = set(spec) - set(SWEEP_AXES)
+    if unknown:
+        raise ValueError(f"{name}: unknown sweep key(s) {', '.join(sorted(unknown))} "
+                         f"(expected any of {', '.join(SWEEP_AXES)})")
+
+    seeds = spec.get('seeds')
+    if isinstance(seeds, int) and not isinstance(seeds, bool):
+        if seeds < 1:
+            raise ValueError(f"{name}: sweep 'seeds' must be positive")
+        seeds = list(range(1, seeds + 1))
+    seed_plusarg = str(spec.get('seed_plusarg', SEED_PLUSARG)).lstrip('+')
+    define_sets = [normalize_defines(item) for item in _axis(spec, 'defines', name)]
+    plusarg_sets = [normalize_plusargs(item) for item in _axis(spec, 'plusargs', name)]
+    seed_values = _axis({'seeds': seeds}, 'seeds', name)
+
+    base = Path(entry.get('output_name') or name).stem
+    entry_defines = normalize_defines(entry.get('defines'))
+    entry_plusargs = normalize_plusargs(entry.get('plusargs'))
+
+    variants, used = [], set()
+    for defines, plusargs, seed in itertools.product(define_sets, plusarg_sets, seed_values):
+        run_args = plusargs + ([f"+{seed_plusarg}={seed}"] if seed is not None else [])
+        define_label, run_label = _define_label(defines), ' '.join(run_args)
+        tag = '_'.join(part for part in (_tag(define_label), _tag(run_label)) if part) or 'default'
+        unique, suffix = tag, 1
+        while unique in used:
+            suffix += 1
+            unique = f"{tag}-{suffix}"
+        used.add(unique)
+
+        variant = {key: value for key, value in entry.items() if key != 'sweep'}
+        variant.update({
+            'output_name': f"{base}__{unique}",
+            'compile_name': f"{base}__{_tag(define_label)}" if defines else base,
+            'defines': {**entry_defines, **defines},
+            'plusargs': entry_plusargs + run_args,
+            'run_dir': f"{SWEEP_DIR}/{base}/{unique}",
+            'variant': {'sweep': base, 'defines': define_label or '-', 'run': run_label or '-'},
+        })
+        variants.append(variant)
+    return variants
+
+
+def expand_sweeps(files: List[Dict]) -> List[Dict]:
+    """
+    Replace every sweep entry of a config's 'files' by its variants.
+
+    Args:
+        files: Config entries
+
+    Returns:
+        Entries with sweeps expanded in place (other entries unchanged)
+    """
+    expanded = []
+    for entry in files:
+        expanded += expand_sweep(entry) if isinstance(entry, dict) and 'sweep' in entry else [entry]
+    return expanded
+
+
+def variant_label(entry: Dict) -> str:
+    """Display name of an entry: its source, plus the variant for sweep variants."""
+    name = entry.get('name', '<unnamed>')
+    variant = entry.get('variant')
+    if not variant:
+        return name
+    settings = ' '.join(label for label in (variant['defines'], variant['run']) if label != '-')
+    return f"{name} [{settings or 'default'}]"
+
+
+def sweep_matrices(entries: Sequence[Dict], results: Sequence[bool]) -> List[Tuple[str, int, int, List[str]]]:
+    """
+    Pass/fail matrices of the sweeps in a run.
+
+    Rows are define sets, columns run arguments (plusargs and seed); cells
+    are ✓ (passed), ✗ (failed) or blank.
+
+    Args:
+        entries: Processed entries
+        results: Success flag per entry
+
+    Returns:
+        One (sweep name, variants, passed, table lines) tuple per sweep
+    """
+    sweeps: Dict[str, Dict] = {}
+    for entry, success in zip(entries, results):
+        variant = entry.get('variant')
+        if not variant:
+            continue
+        sweep = sweeps.setdefault(variant['sweep'], {'rows': [], 'columns': [], 'cells': {}})
+        for axis, label in (('rows', variant['defines']), ('columns', variant['run'])):
+            if label not in sweep[axis]:
+                sweep[axis].append(label)
+        sweep['cells'][variant['defines'], variant['run']] = success
+
+    matrices = []
+    for name, sweep in sweeps.items():
+        corner = 'defines \\ run'
+        row_width = max(len(corner), *(len(row) for row in sweep['rows']))
+        widths = [max(len(column), 1) for column in sweep['columns']]
+        lines = [f"{corner:<{row_width}}  " + '  '.join(f"{column:^{width}}"
+                                                         for column, width in zip(sweep['columns'], widths))]
+        for row in sweep['rows']:
+            cells = [{True: '✓', False: '✗'}.get(sweep['cells'].get((row, column)), ' ')
+                     for column in sweep['columns']]
+            lines.append((f"{row:<{row_width}}  " + "  ".join(f"{cell:^{width}}" for cell, width in zip(cells, widths))).rstrip())
+        matrices.append((name, len(sweep['cells']), sum(sweep['cells'].values()), lines))
+    return matrices
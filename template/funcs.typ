@@ -38,10 +38,10 @@
   }
 }
 
-#let termimg_generic(asgno, quesno) = {
-  return str(asgno + "/imgs/" + quesno + "_terminal.png")
+#let termimg_generic(asgno, quesno, ext: "png") = {
+  return str(asgno + "/imgs/" + quesno + "_terminal." + ext)
 }
 
-#let plotimg_generic(asgno, quesno) = {
-  return str(asgno + "/imgs/" + quesno + "_waveform.png")
+#let plotimg_generic(asgno, quesno, ext: "png") = {
+  return str(asgno + "/imgs/" + quesno + "_waveform." + ext)
 }
\ No newline at end of file
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+"""
+Terminal Transcript Renderer
+============================
+
+Renders a captured terminal transcript (including ANSI SGR colour codes) to an
+image styled after termshot's window screenshots. Used by the automation
+framework's single-run mode so the simulation does not have to be executed a
+second time just to take a screenshot.
+"""
+
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+from matplotlib import image as mpimg
+from matplotlib.figure import Figure
+from matplotlib.patches import Ellipse, FancyBboxPatch
+
+# Window styling (approximates termshot's default look)
+WINDOW_COLOR = '#151515'
+FOREGROUND = '#DDDDDD'
+PROMPT_COLOR = '#4DB6AC'
+BUTTON_COLORS = ('#FF5F58', '#FFBD2E', '#18C132')
+FONT_FAMILY = ['DejaVu Sans Mono', 'monospace']
+FONT_SIZE = 12  # points
+CHAR_WIDTH = 0.602 * FONT_SIZE / 72  # inches, advance width of DejaVu Sans Mono
+LINE_HEIGHT = 1.35 * FONT_SIZE / 72  # inches
+PADDING = 0.35  # inches around the text block
+TITLE_BAR = 0.3  # inches reserved for the window buttons
+
+# Standard and bright ANSI palette (xterm defaults)
+ANSI_COLORS = [
+    '#000000', '#CD3131', '#0DBC79', '#E5E510', '#2472C8', '#BC3FBC', '#11A8CD', '#E5E5E5',
+    '#666666', '#F14C4C', '#23D18B', '#F5F543', '#3B8EEA', '#D670D6', '#29B8DB', '#FFFFFF',
+]
+
+SGR_PATTERN = re.compile(r'\x1b\[([0-9;]*)m')
+OTHER_ESCAPE_PATTERN = re.compile(r'\x1b\[[0-9;?]*[A-Za-ln-z]|\x1b\][^\x07]*\x07')
+
+Style = Tuple[str, bool]  # (colour, bold)
+Span = Tuple[str, Style]
+
+
+def _xterm_256(index: int) -> str:
+    """Convert an xterm 256-colour index to a hex colour."""
+    if index < 16:
+        return ANSI_COLORS[index]
+    if index < 232:
+        index -= 16
+        levels = [0, 95, 135, 175, 215, 255]
+        r, g, b = levels[index // 36], levels[(index // 6) % 6], levels[index % 6]
+        return f'#{r:02X}{g:02X}{b:02X}'
+    grey = 8 + (index - 232) * 10
+    return f'#{grey:02X}{grey:02X}{grey:02X}'
+
+
+def _apply_sgr(params: str, color: str, bold: bool) -> Style:
+    """Apply one SGR parameter list to the current style."""
+    codes = [int(code) if code else 0 for code in params.split(';')]
+    i = 0
+    while i < len(codes):
+        code = codes[i]
+        if code == 0:
+            color, bold = FOREGROUND, False
+        elif code == 1:
+            bold = True
+        elif code == 22:
+            bold = False
+        elif 30 <= code <= 37:
+            color = ANSI_COLORS[code - 30]
+        elif 90 <= code <= 97:
+            color = ANSI_COLORS[code - 90 + 8]
+        elif code == 39:
+            color = FOREGROUND
+        elif code == 38 and i + 2 < len(codes) and codes[i + 1] == 5:
+            color = _xterm_256(codes[i + 2])
+            i += 2
+        elif code == 38 and i + 4 < len(codes) and codes[i + 1] == 2:
+            color = '#{:02X}{:02X}{:02X}'.format(*(min(c, 255) for c in codes[i + 2:i + 5]))
+            i += 4
+        i += 1
+    return color, bold
+
+
+def parse_ansi(text: str) -> List[List[Span]]:
+    """
+    Split a transcript into lines of styled spans.
+
+    Args:
+        text: Raw terminal output, possibly containing ANSI escape sequences
+
+    Returns:
+        One list of (text, (colour, bold)) spans per line
+    """
+    color, bold = FOREGROUND, False
+    lines = []
+    for raw_line in text.rstrip('\n').split('\n'):
+        # Carriage returns overwrite the line; keep what would remain visible
+        raw_line = raw_line.rstrip('\r').split('\r')[-1]
+        raw_line = OTHER_ESCAPE_PATTERN.sub('', raw_line)
+
+        spans = []
+        position = 0
+        for match in SGR_PATTERN.finditer(raw_line):
+            if match.start() > position:
+                spans.append((raw_line[position:match.start()].expandtabs(8), (color, bold)))
+            color, bold = _apply_sgr(match.group(1), color, bold)
+            position = match.end()
+        if position < len(raw_line):
+            spans.append((raw_line[position:].expandtabs(8), (color, bold)))
+        lines.append(spans)
+    return lines
+
+
+def render_transcript(text: str, output_path: Union[str, Path], command: Optional[str] = None,
+                      dpi: int = 150, antialias: bool = True) -> None:
+    """
+    Render a terminal transcript to an image file.
+
+    Args:
+        text: Captured terminal output
+        output_path: Image file to write (format taken from the extension)
+        command: Command line shown as the first prompt line (None to omit)
+        dpi: Output resolution
+        antialias: Antialias text and window shapes
+    """
+    lines = parse_ansi(text)
+    if command is not None:
+        lines.insert(0, [('➜ ', (PROMPT_COLOR, True)), (command, (FOREGROUND, True))])
+
+    columns = max([sum(len(span) for span, _ in line) for line in lines] + [40])
+    width = columns * CHAR_WIDTH + 2 * PADDING
+    height = len(lines) * LINE_HEIGHT + 2 * PADDING + TITLE_BAR
+
+    fig = Figure(figsize=(width, height), dpi=dpi)
+    fig.patch.set_alpha(0)
+
+    # Rounded window with traffic-light buttons
+    window = FancyBboxPatch((0, 0), 1, 1, boxstyle='round,pad=0,rounding_size=0.015',
+                            transform=fig.transFigure, facecolor=WINDOW_COLOR, edgecolor='none')
+    fig.patches.append(window)
+    for i, button_color in enumerate(BUTTON_COLORS):
+        x = (PADDING + 0.1 + i * 0.25) / width
+        y = 1 - (PADDING / 2 + TITLE_BAR / 2) / height
+        fig.patches.append(Ellipse((x, y), 0.14 / width, 0.14 / height, transform=fig.transFigure,
+                                   facecolor=button_color, edgecolor='none'))
+
+    for row, spans in enumerate(lines):
+        y = 1 - (TITLE_BAR + PADDING + (row + 0.5) * LINE_HEIGHT) / height
+        column = 0
+        for span, (color, bold) in spans:
+            if span.strip():
+                fig.text((PADDING + column * CHAR_WIDTH) / width, y, span,
+                         color=color, fontsize=FONT_SIZE, fontfamily=FONT_FAMILY,
+                         fontweight='bold' if bold else 'normal', ha='left', va='center',
+                         antialiased=antialias)
+            column += len(span)
+
+    for patch in fig.patches:
+        patch.set_antialiased(antialias)
+
+    fig.savefig(output_path, dpi=dpi, transparent=True)
+
+
+def convert_image(source: Union[str, Path], output_path: Union[str, Path], dpi: int = 150) -> None:
+    """
+    Re-encode a raster screenshot (e.g. termshot's PNG) in another format.
+
+    Vector formats (SVG/PDF) embed the image at its native pixel size, scaled
+    to dpi.
+
+    Args:
+        source: Raster image to read
+        output_path: Image file to write (format taken from the extension)
+        dpi: Resolution used to size the page of vector formats
+    """
+    pixels = mpimg.imread(source)
+    height, width = pixels.shape[:2]
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    fig.patch.set_alpha(0)
+    fig.figimage(pixels, resize=False)
+    fig.savefig(output_path, dpi=dpi, transparent=True)
@@ -0,0 +1,18 @@
+"""Shared pytest setup: the framework's modules live in the repository root."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def write_vcd(tmp_path):
+    """Factory writing VCD text (indentation stripped) to a file in tmp_path and returning its path."""
+    def write(text: str, name: str = 'dump.vcd') -> Path:
+        path = tmp_path / name
+        path.write_text('\n'.join(line.strip() for line in text.strip().splitlines()) + '\n')
+        return path
+    return write
@@ -0,0 +1,74 @@
+"""Tests for batch compilation of shared compilation units (VerilogAutomation._compile_batches)."""
+
+import json
+import shutil
+
+import pytest
+
+from verilog_automation import VerilogAutomation
+
+pytestmark = pytest.mark.skipif(shutil.which('iverilog') is None, reason='needs iverilog')
+
+COUNTER = """module counter(input clk, output reg [1:0] q);
+  initial q = 0;
+  always @(posedge clk) q <= q + 1;
+endmodule
+"""
+
+TESTBENCH = """module TEST;
+  reg clk = 0;
+  wire [1:0] q;
+  counter c(clk, q);
+  always #5 clk = ~clk;
+  initial begin $dumpfile("tb.vcd"); $dumpvars(0, TEST); #40 $finish; end
+endmodule
+"""
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    (tmp_path / 'Asg1').mkdir()
+    (tmp_path / 'Asg1' / 'counter.v').write_text(COUNTER)
+    (tmp_path / 'Asg1' / 'tb.v').write_text(TESTBENCH)
+    # Two runs of one testbench: same compilation unit, different plusargs
+    entries = [{'name': 'tb.v', 'sources': ['counter.v'], 'output_name': f'tb_{mode}', 'plusargs': [f'+mode={mode}']}
+               for mode in ('a', 'b')]
+    (tmp_path / 'Asg1.json').write_text(json.dumps({'folder': 'Asg1', 'files': entries}))
+    return tmp_path
+
+
+def _compile_batches(workspace, monkeypatch):
+    """Run the batch compile step of a fresh automation; returns (batch units, compiler calls)."""
+    automation = VerilogAutomation(str(workspace / 'Asg1.json'), str(workspace),
+                                   cache_dir=str(workspace / 'cache'), batch=True)
+    calls = []
+    compile_verilog = automation.compile_verilog
+
+    def counting(*args):
+        calls.append(args)
+        return compile_verilog(*args)
+
+    monkeypatch.setattr(automation, 'compile_verilog', counting)
+    automation._compile_batches()
+    return dict(automation._batch_units), calls
+
+
+def test_shared_unit_compiles_once_and_a_changed_module_invalidates_both(workspace, monkeypatch):
+    units, calls = _compile_batches(workspace, monkeypatch)
+    assert len(calls) == 1
+    assert set(units) == {'tb_a', 'tb_b'}
+    assert units['tb_a'] == units['tb_b']
+    vvp_file, key, success = units['tb_a']
+    assert success and key is not None
+    assert (workspace / 'Asg1' / vvp_file).exists()
+
+    # Unchanged sources: the shared unit comes from the cache
+    units, calls = _compile_batches(workspace, monkeypatch)
+    assert (calls, units['tb_a']) == ([], (vvp_file, key, True))
+
+    # A change to the shared module recompiles the unit once, for both entries
+    (workspace / 'Asg1' / 'counter.v').write_text(COUNTER.replace('q + 1', 'q + 2'))
+    units, calls = _compile_batches(workspace, monkeypatch)
+    assert len(calls) == 1
+    assert units['tb_a'] == units['tb_b']
+    assert units['tb_a'][1] not in (None, key)
@@ -0,0 +1,85 @@
+"""Tests for the content-addressed build cache (build_cache.py)."""
+
+import json
+
+from build_cache import BuildCache, find_includes
+
+
+def _meta(cache, key):
+    return json.loads((cache.cache_dir / key / 'meta.json').read_text())
+
+
+def test_key_hashes_file_content_not_location(tmp_path):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    first, second = tmp_path / 'a' / 'q1.v', tmp_path / 'b' / 'q1.v'
+    first.write_text('module q1; endmodule\n')
+    second.write_text('module q1; endmodule\n')
+    assert BuildCache.key(first, {'flags': ['-g2012']}) == BuildCache.key(second, {'flags': ['-g2012']})
+
+    second.write_text('module q1; wire w; endmodule\n')
+    assert BuildCache.key(first) != BuildCache.key(second)
+    assert BuildCache.key({'a': 1, 'b': 2}) == BuildCache.key({'b': 2, 'a': 1})
+    assert BuildCache.key('x', 'y') != BuildCache.key('y', 'x')
+    assert BuildCache.key(b'1') != BuildCache.key('1')
+
+
+def test_store_and_restore(tmp_path):
+    cache = BuildCache(tmp_path / 'cache')
+    output = tmp_path / 'work' / 'q1.vvp'
+    output.parent.mkdir()
+    output.write_text('compiled')
+    assert cache.store('k1', [output])
+    assert not cache.store('k2', [tmp_path / 'work' / 'missing.vvp'])
+
+    # Restores into directories that do not exist yet (e.g. a sweep variant's run directory)
+    elsewhere = tmp_path / 'sweeps' / 'q1' / 'seed-1' / 'q1.vvp'
+    assert cache.restore('k1', [elsewhere])
+    assert elsewhere.read_text() == 'compiled'
+
+    output.write_text('stale')
+    assert cache.restore('k1', [output])
+    assert output.read_text() == 'compiled'
+
+    assert not cache.restore('unknown', [output])
+    assert not cache.restore('k1', [output, tmp_path / 'work' / 'q1.vcd'])
+
+
+def test_restore_marks_entry_used(tmp_path):
+    cache = BuildCache(tmp_path / 'cache')
+    output = tmp_path / 'q1.log'
+    output.write_text('log')
+    cache.store('k', [output])
+    meta = _meta(cache, 'k')
+    meta['last_used'] = 0
+    (cache.cache_dir / 'k' / 'meta.json').write_text(json.dumps(meta))
+    cache.restore('k', [output])
+    assert _meta(cache, 'k')['last_used'] > 0
+
+
+def test_evict_removes_least_recently_used_entries(tmp_path):
+    cache = BuildCache(tmp_path / 'cache', max_size_mb=1500 / (1024 * 1024))
+    output = tmp_path / 'artifact'
+    for age, key in enumerate(['newest', 'middle', 'oldest']):
+        output.write_bytes(b'x' * 600)
+        cache.store(key, [output])
+        meta = _meta(cache, key)
+        meta['last_used'] = 1000 - age
+        (cache.cache_dir / key / 'meta.json').write_text(json.dumps(meta))
+    (cache.cache_dir / 'broken').mkdir()
+    (cache.cache_dir / 'broken' / 'meta.json').write_text('{not json')
+    (cache.cache_dir / '.tmp-inflight').mkdir()
+
+    assert cache.evict() == 1
+    assert sorted(path.name for path in cache.cache_dir.iterdir()) == ['.tmp-inflight', 'middle', 'newest']
+    assert cache.evict() == 0
+    assert BuildCache(tmp_path / 'nothing').evict() == 0
+
+
+def test_find_includes_is_recursive_and_follows_search_dirs(tmp_path):
+    (tmp_path / 'inc').mkdir()
+    (tmp_path / 'top.v').write_text('`include "defs.vh"\n`include "missing.vh"\n')
+    (tmp_path / 'inc' / 'defs.vh').write_text('`include "more.vh"\n`include "defs.vh"\n')
+    (tmp_path / 'inc' / 'more.vh').write_text('`define MORE 1\n')
+    found = find_includes(tmp_path / 'top.v', [tmp_path / 'inc'])
+    assert [path.name for path in found] == ['defs.vh', 'more.vh']
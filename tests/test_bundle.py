@@ -0,0 +1,65 @@
+"""Tests for the submission bundler (bundle.py)."""
+
+import os
+import zipfile
+
+import pytest
+
+from bundle import build_archive, collect_folder
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / 'Asg1'
+    for name, data in {'q1.v': b'module q1; endmodule\n' * 50, 'sub/q2.v': b'module q2; endmodule\n',
+                       'Asg1.PDF': os.urandom(3000), 'imgs/q1_waveform.png': b'png',
+                       'sweeps/q1/seed-1/q1.v': b'copy', 'notes.txt': b'skip'}.items():
+        (folder / name).parent.mkdir(parents=True, exist_ok=True)
+        (folder / name).write_bytes(data)
+    return folder
+
+
+def _members(folder):
+    return [(path, path.relative_to(folder).as_posix()) for path in collect_folder(folder)]
+
+
+def _contents(archive):
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.testzip() is None
+        return {info.filename: zf.read(info) for info in zf.infolist()}
+
+
+def test_collect_folder_skips_generated_directories(folder):
+    assert [name for _, name in _members(folder)] == ['Asg1.PDF', 'q1.v', 'sub/q2.v']
+
+
+def test_archive_is_a_valid_zip(folder, tmp_path):
+    target = tmp_path / 'Asg1_submission.zip'
+    result = build_archive(_members(folder), target, jobs=2)
+    assert _contents(target) == {name: path.read_bytes() for path, name in _members(folder)}
+    assert result['bytes'] == target.stat().st_size
+    assert not any(member['reused'] for member in result['members'])
+    assert [path.name for path in tmp_path.iterdir() if path.name.startswith('.')] == []
+
+
+def test_rebuild_reuses_unchanged_members(folder, tmp_path):
+    target = tmp_path / 'Asg1_submission.zip'
+    build_archive(_members(folder), target)
+    (folder / 'sub' / 'q2.v').write_bytes(b'module q2; wire w; endmodule\n')
+    (folder / 'q1.v').touch()  # new timestamp, same content
+
+    result = build_archive(_members(folder), target)
+    assert {member['name']: member['reused'] for member in result['members']} == {
+        'Asg1.PDF': True, 'q1.v': True, 'sub/q2.v': False}
+    assert _contents(target)['sub/q2.v'] == b'module q2; wire w; endmodule\n'
+    assert _contents(target)['q1.v'] == (folder / 'q1.v').read_bytes()
+
+    result = build_archive(_members(folder), target, reuse=False)
+    assert not any(member['reused'] for member in result['members'])
+
+
+def test_stored_level_and_duplicate_names(folder, tmp_path):
+    result = build_archive(_members(folder), tmp_path / 'stored.zip', level=0)
+    assert {member['method'] for member in result['members']} == {zipfile.ZIP_STORED}
+    with pytest.raises(ValueError):
+        build_archive([(folder / 'q1.v', 'q1.v'), (folder / 'sub' / 'q2.v', 'q1.v')], tmp_path / 'dup.zip')
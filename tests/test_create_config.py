@@ -0,0 +1,93 @@
+"""Tests for the config generator (create_config.py)."""
+
+import json
+import os
+
+import pytest
+
+from create_config import create_sample_config, discover_verilog_files, scan_testbench
+
+TESTBENCH = """module counter(input clk); endmodule
+// $dumpfile("commented.vcd");
+/* module fake; */
+module TB;
+  initial begin $dumpfile("{dump}"); $dumpvars(0, TB); end
+endmodule
+"""
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'Asg1' / 'sub').mkdir(parents=True)
+    (tmp_path / 'Asg1' / 'imgs').mkdir()
+    (tmp_path / 'Asg1' / 'q1.v').write_text(TESTBENCH.format(dump='q1.vcd'))
+    (tmp_path / 'Asg1' / 'sub' / 'q2.v').write_text('module alu; endmodule\n')
+    (tmp_path / 'Asg1' / 'imgs' / 'ignored.v').write_text('')
+    return tmp_path
+
+
+def _generate(workspace):
+    path = create_sample_config('Asg1', discover_verilog_files('Asg1'), jobs=1)
+    return json.loads((workspace / path).read_text())
+
+
+def _entries(config):
+    return {entry['name']: entry for entry in config['files']}
+
+
+def test_scan_finds_the_dumpfile_and_skips_comments(workspace):
+    scan = scan_testbench(str(workspace / 'Asg1' / 'q1.v'))
+    assert (scan['dumpfile'], scan['module'], scan['plot'], scan['error']) == ('q1.vcd', 'TB', True, None)
+    scan = scan_testbench(str(workspace / 'Asg1' / 'sub' / 'q2.v'))
+    assert (scan['dumpfile'], scan['module'], scan['plot']) == (None, None, False)
+    assert scan_testbench(str(workspace / 'Asg1' / 'missing.v'))['error']
+
+
+def test_scan_reports_the_module_calling_dumpfile(workspace):
+    path = workspace / 'Asg1' / 'tb.v'
+    path.write_text('module TB; initial $dumpfile("tb.vcd"); endmodule\nmodule helper; endmodule\n')
+    assert scan_testbench(str(path))['module'] == 'TB'
+
+
+def test_discovery_is_recursive_and_skips_generated_folders(workspace):
+    assert discover_verilog_files('Asg1') == ['q1.v', 'sub/q2.v']
+    assert discover_verilog_files('Asg1', recursive=False) == ['q1.v']
+
+
+def test_new_config(workspace):
+    entries = _entries(_generate(workspace))
+    assert entries['q1.v'] == {'name': 'q1.v', 'vcd_file': 'q1.vcd', 'variables': None, 'module': 'TB',
+                               'plot': True}
+    assert entries['sub/q2.v']['vcd_file'] == 'q2.vcd'
+    assert entries['sub/q2.v']['plot'] is False
+
+
+def test_rescan_merges_with_hand_edits(workspace):
+    config = _generate(workspace)
+    entries = _entries(config)
+    entries['q1.v']['variables'] = ['CLK']
+    entries['q1.v']['module'] = 'TB.dut'
+    config['single_run'] = True
+    (workspace / 'config' / 'Asg1.json').write_text(json.dumps(config))
+
+    q1 = workspace / 'Asg1' / 'q1.v'
+    q1.write_text(TESTBENCH.format(dump='renamed_dump.vcd'))
+    os.utime(q1, ns=(q1.stat().st_mtime_ns + 10**9,) * 2)
+    (workspace / 'Asg1' / 'sub' / 'q2.v').unlink()
+    (workspace / 'Asg1' / 'q3.v').write_text(TESTBENCH.format(dump='q3.vcd'))
+
+    config = _generate(workspace)
+    entries = _entries(config)
+    assert config['single_run'] is True
+    assert list(entries) == ['q1.v', 'q3.v']
+    assert entries['q1.v']['vcd_file'] == 'renamed_dump.vcd'  # derived value follows the source
+    assert entries['q1.v']['module'] == 'TB.dut'  # hand edit survives
+    assert entries['q1.v']['variables'] == ['CLK']
+
+
+def test_unchanged_files_are_not_rescanned(workspace, capsys):
+    _generate(workspace)
+    capsys.readouterr()
+    _generate(workspace)
+    assert 'Scanned 0 new or changed file(s), 2 unchanged' in capsys.readouterr().out
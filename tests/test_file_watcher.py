@@ -0,0 +1,55 @@
+"""Tests for watch-mode change notification (file_watcher.py)."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from file_watcher import FileWatcher
+
+
+def _touch(path, step: int) -> None:
+    """Rewrite a file and move its mtime forward (coarse filesystem clocks notice too)."""
+    path.write_text(f"// edit {step}\n")
+    mtime_ns = time.time_ns() + step * 10 ** 9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture(params=['polling', 'inotify'])
+def watched(request, tmp_path):
+    (tmp_path / 'Asg1').mkdir()
+    (tmp_path / 'Asg1' / 'imgs').mkdir()
+    source = tmp_path / 'Asg1' / 'q1.v'
+    source.write_text("// initial\n")
+    image = tmp_path / 'Asg1' / 'imgs' / 'q1.png'
+    image.write_bytes(b'png')
+    watcher = FileWatcher([tmp_path], poll_interval=0.05, polling=request.param == 'polling')
+    if watcher.backend != request.param:
+        watcher.close()
+        pytest.skip(f'{request.param} backend not available')
+    yield watcher, source, image
+    watcher.close()
+
+
+def test_burst_of_writes_is_one_event(watched):
+    watcher, source, _ = watched
+
+    def edit():
+        for step in range(1, 4):
+            _touch(source, step)
+            time.sleep(0.03)
+
+    editor = threading.Thread(target=edit)
+    editor.start()
+    changed = watcher.wait(timeout=5)
+    editor.join()
+    assert changed == {source.resolve()}
+    assert watcher.wait(timeout=0.3) == set()
+
+
+def test_ignored_directories_give_no_event(watched):
+    watcher, _, image = watched
+    _touch(image, 1)
+    (image.parent / 'q2.png').write_bytes(b'png')
+    assert watcher.wait(timeout=0.5) == set()
@@ -0,0 +1,49 @@
+"""Tests for tool execution with timeouts (process_runner.py)."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from process_runner import run_command
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='uses a POSIX shell')
+
+
+def _alive(pid: int) -> bool:
+    """Whether a process exists and is not a zombie waiting to be reaped."""
+    status = Path(f'/proc/{pid}/status')
+    if status.exists():
+        return 'zombie' not in status.read_text()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_success_without_timeout(tmp_path):
+    echoed = []
+    result = run_command(['sh', '-c', 'echo out; echo err >&2; pwd; exit 3'], cwd=str(tmp_path),
+                         echo_stdout=echoed.append)
+    assert (result.returncode, result.timed_out) == (3, False)
+    assert result.stdout.splitlines() == ['out', str(tmp_path.resolve())]
+    assert result.stderr == 'err\n'
+    assert ''.join(echoed) == result.stdout
+    assert result.duration > 0
+
+
+def test_timeout_kills_the_whole_process_tree():
+    # The shell starts a background sleep that holds the pipes open; both must go
+    result = run_command(['sh', '-c', 'sleep 30 & echo $!; wait'], timeout=0.5)
+    assert result.timed_out
+    assert result.returncode != 0
+    assert result.duration < 10
+    child = int(result.stdout.split()[0])
+    assert not _alive(child)
+
+
+def test_missing_executable_raises():
+    with pytest.raises(FileNotFoundError):
+        run_command([sys.executable + '-does-not-exist'])
@@ -0,0 +1,136 @@
+"""Tests for incremental Typst report builds (report_build.py)."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from report_build import ReportBuilder, images_equal, replace_if_changed, scan_document
+
+REPO = Path(__file__).resolve().parent.parent
+
+FUNCS = """// Helpers shared by the reports
+#let prefix = "imgs/"
+#let plotimg(q, asg: "1") = image("Asg" + asg + "/" + prefix + q + "_waveform.png")
+#let termimg(q, asg: "1") = {
+  return image("Asg" + str(asg) + "/imgs/" + q + "_terminal.png", width: 80%)
+}
+"""
+
+DOCUMENT = """#import "template/funcs.typ": *
+// #image("Asg1/imgs/commented_out.png")
+#let code = read("asg1/q1.v")
+#plotimg("q1")
+#termimg("q1", asg: "1")
+/* #include "never.typ" */
+#include "chapters/intro.typ"
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {'template/funcs.typ': FUNCS, 'Report.typ': DOCUMENT, 'chapters/intro.typ': '#read("../data.csv")\n',
+             'data.csv': 'a,b\n', 'Asg1/q1.v': 'module q1; endmodule\n',
+             'Asg1/imgs/q1_waveform.png': 'w', 'Asg1/imgs/q1_terminal.png': 't'}
+    for name, text in files.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(text)
+    return tmp_path
+
+
+@pytest.fixture
+def typst(tmp_path):
+    """Stand-in typst: 'compile --root ROOT DOC OUT' writes OUT, failing for documents containing FAIL."""
+    script = tmp_path / 'fake_typst.py'
+    script.write_text("import sys\n"
+                      "document, output = sys.argv[-2:]\n"
+                      "if 'FAIL' in open(document).read():\n"
+                      "    sys.exit('error: unknown variable')\n"
+                      "open(output, 'w').write('%PDF')\n")
+    if os.name == 'nt':
+        pytest.skip('stand-in typst is a shebang script')
+    launcher = tmp_path / 'typst'
+    launcher.write_text(f"#!/bin/sh\nexec {sys.executable} {script} \"$@\"\n")
+    launcher.chmod(0o755)
+    return str(launcher)
+
+
+def _names(paths, root):
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+def test_scan_document_finds_imports_reads_and_helper_images(project):
+    assert _names(scan_document(project / 'Report.typ', project), project) == [
+        'template/funcs.typ', 'chapters/intro.typ', 'data.csv', 'Asg1/q1.v', 'Asg1/imgs/q1_waveform.png',
+        'Asg1/imgs/q1_terminal.png']
+
+
+def test_scan_document_on_the_repository_reports():
+    for document in sorted(REPO.glob('Asg*.typ')):
+        inputs = scan_document(document, REPO)
+        assert REPO / 'template' / 'pset.typ' in inputs or REPO / 'template' / 'funcs.typ' in inputs
+        assert any(path.suffix == '.v' and path.exists() for path in inputs), document.name
+
+
+def test_plan_and_build(project, typst):
+    state = project / '.verilog_cache' / 'typst.json'
+    builder = ReportBuilder(project, typst, 'typst 0.12.0', state)
+    output = builder.output_path(project / 'Report.typ')
+    assert output == project / 'Report.pdf'
+    assert builder.plan(project / 'Report.typ', output)['reason'] == 'no PDF yet'
+
+    [result] = builder.build([project / 'Report.typ'])
+    assert (result['status'], result['output']) == ('built', 'Report.pdf')
+
+    # State survives a new builder; touching an input without changing it keeps the PDF current
+    builder = ReportBuilder(project, typst, 'typst 0.12.0', state)
+    (project / 'Asg1' / 'imgs' / 'q1_waveform.png').touch()
+    assert builder.plan(project / 'Report.typ', output)['reason'] is None
+    assert builder.build([project / 'Report.typ'])[0]['status'] == 'current'
+
+    (project / 'Asg1' / 'q1.v').write_text('module q1; wire w; endmodule\n')
+    assert builder.plan(project / 'Report.typ', output)['reason'] == 'Asg1/q1.v changed'
+    assert builder.build([project / 'Report.typ'])[0]['status'] == 'built'
+
+    assert ReportBuilder(project, typst, 'typst 0.13.0', state).plan(
+        project / 'Report.typ', output)['reason'] == 'typst version changed'
+    assert builder.build([project / 'Report.typ'], force=True)[0]['reason'] == 'forced'
+
+
+def test_missing_input_and_failed_build(project, typst):
+    builder = ReportBuilder(project, typst, 'typst 0.12.0', project / 'state.json', output='out/{folder}-{stem}.pdf')
+    (project / 'data.csv').unlink()
+    (project / 'Report.typ').write_text(DOCUMENT + '#FAIL\n')
+    [result] = builder.build([project / 'Report.typ'], folder='Asg1')
+    assert result['status'] == 'failed'
+    assert result['output'] == 'out/Asg1-Report.pdf'
+    assert result['missing'] == ['data.csv']
+    assert 'unknown variable' in result['error']
+
+
+def test_pixel_identical_images_keep_the_existing_file(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    picture = Image.new('RGB', (32, 16), (10, 200, 30))
+    target, staged = tmp_path / 'q1_waveform.png', tmp_path / '.q1_waveform.tmp.png'
+    picture.save(target, compress_level=1)
+    picture.save(staged, compress_level=9)
+    assert target.read_bytes() != staged.read_bytes()
+    assert images_equal(staged, target)
+    before = target.stat().st_mtime_ns
+    assert not replace_if_changed(staged, target)
+    assert not staged.exists() and target.stat().st_mtime_ns == before
+
+    picture.putpixel((0, 0), (0, 0, 0))
+    picture.save(staged)
+    assert replace_if_changed(staged, target)
+    assert Image.open(target).getpixel((0, 0)) == (0, 0, 0)
+
+
+def test_vector_images_compare_bytes(tmp_path):
+    first, second = tmp_path / 'a.svg', tmp_path / 'b.svg'
+    first.write_text('<svg/>')
+    second.write_text('<svg />')
+    assert not images_equal(first, second)
+    second.write_text('<svg/>')
+    assert images_equal(first, second)
@@ -0,0 +1,27 @@
+"""Tests for per-stage run reports (run_report.py)."""
+
+from run_report import RunReport
+
+
+def test_profiles_are_named_per_entry(tmp_path):
+    report = RunReport(tmp_path)
+    for label, profile_name in (("q1.v [W=4 +seed=1]", 'q1__W-4_seed-1'), ("q1.v [W=4 +seed=2]", 'q1__W-4_seed-2'),
+                                ("sub/q1.v", 'sub/q1'), ("q1.v", None)):
+        report.start_file(label, profile_name)
+        with report.stage('render', profile=True):
+            pass
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert names == ['q1.render.prof', 'q1__W-4_seed-1.render.prof', 'q1__W-4_seed-2.render.prof',
+                     'sub_q1.render.prof']
+    assert [record['file'] for record in report.files][-1] == 'q1.v'
+
+
+def test_stage_totals_count_cached_stages(tmp_path):
+    report = RunReport()
+    report.start_file('q1.v')
+    with report.stage('compile'):
+        pass
+    report.cached('simulate')
+    totals = report.stage_totals()
+    assert totals['compile']['runs'] == 1
+    assert totals['simulate'] == {'runs': 0, 'cached': 1, 'wall_s': 0.0, 'cpu_s': 0.0}
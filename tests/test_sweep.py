@@ -0,0 +1,79 @@
+"""Tests for define/plusarg/seed sweeps (sweep.py)."""
+
+import pytest
+
+from sweep import (define_flags, expand_sweep, expand_sweeps, normalize_defines, normalize_plusargs,
+                   sweep_matrices, variant_label)
+
+
+def test_normalize_defines_and_flags():
+    assert normalize_defines({'WIDTH': 8, 'FAST': None, 'DEBUG': True}) == {'WIDTH': '8', 'FAST': None,
+                                                                           'DEBUG': None}
+    assert normalize_defines(['WIDTH=8', 'FAST']) == {'WIDTH': '8', 'FAST': None}
+    assert normalize_defines(None) == {}
+    assert define_flags({'WIDTH': '8', 'FAST': None}) == ['-DWIDTH=8', '-DFAST']
+    with pytest.raises(ValueError):
+        normalize_defines(3)
+
+
+def test_normalize_plusargs():
+    assert normalize_plusargs('mode=1') == ['+mode=1']
+    assert normalize_plusargs(['+fast', ' verbose ', '']) == ['+fast', '+verbose']
+    assert normalize_plusargs(None) == []
+
+
+def test_expand_sweep_is_the_cartesian_product():
+    entry = {'name': 'q2.v', 'plot': True, 'defines': {'BASE': 1}, 'plusargs': ['+quiet'],
+             'sweep': {'defines': [{'WIDTH': 4}, {'WIDTH': 8, 'FAST': None}], 'plusargs': [[], ['+fail']],
+                       'seeds': 2}}
+    variants = expand_sweep(entry)
+    assert len(variants) == 8
+    assert all('sweep' not in variant and variant['plot'] for variant in variants)
+
+    first = variants[0]
+    assert first['output_name'] == 'q2__WIDTH-4_seed-1'
+    assert first['compile_name'] == 'q2__WIDTH-4'
+    assert first['defines'] == {'BASE': '1', 'WIDTH': '4'}
+    assert first['plusargs'] == ['+quiet', '+seed=1']
+    assert first['run_dir'] == 'sweeps/q2/WIDTH-4_seed-1'
+    assert first['variant'] == {'sweep': 'q2', 'defines': 'WIDTH=4', 'run': '+seed=1'}
+
+    # Define sets vary slowest and share one compiled VVP per set
+    assert [variant['compile_name'] for variant in variants] == ['q2__WIDTH-4'] * 4 + ['q2__WIDTH-8_FAST'] * 4
+    assert len({variant['output_name'] for variant in variants}) == 8
+    assert len({variant['run_dir'] for variant in variants}) == 8
+    assert variant_label(variants[-1]) == 'q2.v [WIDTH=8 FAST +fail +seed=2]'
+
+
+def test_expand_sweep_seed_plusarg_and_defaults():
+    variants = expand_sweep({'name': 'tb.v', 'sweep': {'seeds': [7], 'seed_plusarg': '+rng'}})
+    assert [variant['plusargs'] for variant in variants] == [['+rng=7']]
+    assert variants[0]['compile_name'] == 'tb'
+
+    variants = expand_sweep({'name': 'tb.v', 'sweep': {'plusargs': [[]]}})
+    assert variants[0]['output_name'] == 'tb__default'
+    assert variant_label(variants[0]) == 'tb.v [default]'
+
+
+@pytest.mark.parametrize('sweep', [{'seeds': 0}, {'defines': []}, {'plusargs': 'x'}, {'colors': [1]}, ['seeds']])
+def test_expand_sweep_rejects_malformed_sweeps(sweep):
+    with pytest.raises(ValueError):
+        expand_sweep({'name': 'tb.v', 'sweep': sweep})
+
+
+def test_expand_sweeps_keeps_plain_entries():
+    files = [{'name': 'q1.v'}, {'name': 'q2.v', 'sweep': {'seeds': 2}}]
+    assert [entry.get('output_name', entry['name']) for entry in expand_sweeps(files)] == [
+        'q1.v', 'q2__seed-1', 'q2__seed-2']
+
+
+def test_sweep_matrices():
+    entries = expand_sweeps([{'name': 'q1.v'},
+                             {'name': 'q2.v', 'sweep': {'defines': [['W=4'], ['W=8']], 'seeds': 2}}])
+    results = [True, True, False, True, True]
+    [(name, count, passed, lines)] = sweep_matrices(entries, results)
+    assert (name, count, passed) == ('q2', 4, 3)
+    assert lines[0].split() == ['defines', '\\', 'run', '+seed=1', '+seed=2']
+    assert lines[1].split() == ['W=4', '✓', '✗']
+    assert lines[2].split() == ['W=8', '✓', '✓']
+    assert sweep_matrices([{'name': 'q1.v'}], [True]) == []
@@ -0,0 +1,34 @@
+"""Tests for the built-in terminal renderer (term_render.py)."""
+
+import pytest
+
+from term_render import (ANSI_COLORS, CHAR_WIDTH, FOREGROUND, LINE_HEIGHT, PADDING, TITLE_BAR, parse_ansi,
+                         render_transcript)
+
+Image = pytest.importorskip('PIL.Image')
+
+TRANSCRIPT = ("\x1b]0;vvp q1\x07\x1b[2KVCD info: dumpfile q1.vcd opened\n"
+              "\x1b[1;31mFAIL\x1b[0m count=\x1b[38;5;46m3\x1b[39m\ttail\n"
+              "progress 10%\rprogress 100%\n")
+
+
+def test_parse_ansi_applies_sgr_and_drops_other_escapes():
+    lines = parse_ansi(TRANSCRIPT)
+    assert lines[0] == [('VCD info: dumpfile q1.vcd opened', (FOREGROUND, False))]
+    assert lines[1] == [('FAIL', (ANSI_COLORS[1], True)), (' count=', (FOREGROUND, False)),
+                        ('3', ('#00FF00', False)), ('        tail', (FOREGROUND, False))]
+    assert lines[2] == [('progress 100%', (FOREGROUND, False))]
+
+
+def test_render_transcript_writes_image_of_expected_size(tmp_path):
+    output = tmp_path / 'q1.png'
+    dpi = 50
+    render_transcript(TRANSCRIPT, output, command='vvp q1.vvp', dpi=dpi)
+    # 3 transcript lines plus the prompt; at least 40 columns wide
+    width = 40 * CHAR_WIDTH + 2 * PADDING
+    height = 4 * LINE_HEIGHT + 2 * PADDING + TITLE_BAR
+    with Image.open(output) as image:
+        assert image.format == 'PNG'
+        # matplotlib truncates the canvas size to whole pixels
+        assert image.size[0] == pytest.approx(width * dpi, abs=1)
+        assert image.size[1] == pytest.approx(height * dpi, abs=1)
@@ -0,0 +1,70 @@
+"""Tests for the tool registry (toolchain.py)."""
+
+import os
+
+import pytest
+
+import toolchain
+from toolchain import UNAVAILABLE, UNKNOWN, Toolchain
+
+pytestmark = pytest.mark.skipif(os.name == 'nt', reason='uses shell-script tools')
+
+
+@pytest.fixture
+def fake_tool(tmp_path, monkeypatch):
+    """Install a shell-script 'iverilog' on PATH that logs each version probe."""
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    monkeypatch.setenv('PATH', str(bin_dir) + os.pathsep + os.environ.get('PATH', ''))
+    tool = bin_dir / 'iverilog'
+    log = tmp_path / 'probes.log'
+
+    def write(banner: str, extra: str = '') -> None:
+        tool.write_text(f"#!/bin/sh\necho probe >> '{log}'\n{extra}echo '{banner}'\n")
+        tool.chmod(0o755)
+    write.probes = lambda: len(log.read_text().splitlines()) if log.exists() else 0
+    write.path = tool
+    return write
+
+
+def test_missing_tool_is_unavailable(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', str(tmp_path))
+    tool = Toolchain().resolve('iverilog')
+    assert not tool.available
+    assert (tool.version, tool.command) == (UNAVAILABLE, 'iverilog')
+
+
+def test_persisted_registry_skips_probe_until_binary_changes(tmp_path, fake_tool):
+    state = tmp_path / 'tools.json'
+    fake_tool('Icarus Verilog version 12.0')
+    registry = Toolchain(state)
+    assert registry.version('iverilog') == 'Icarus Verilog version 12.0'
+    registry.resolve('iverilog')
+    registry.save()
+    assert fake_tool.probes() == 1
+
+    assert Toolchain(state).version('iverilog') == 'Icarus Verilog version 12.0'
+    assert fake_tool.probes() == 1
+
+    # Same size, new modification time
+    stat = fake_tool.path.stat()
+    os.utime(fake_tool.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    registry = Toolchain(state)
+    assert registry.version('iverilog') == 'Icarus Verilog version 12.0'
+    registry.save()
+    assert fake_tool.probes() == 2
+
+    # New size, modification time restored
+    mtime_ns = fake_tool.path.stat().st_mtime_ns
+    fake_tool('Icarus Verilog version 13.0 (devel)')
+    os.utime(fake_tool.path, ns=(mtime_ns, mtime_ns))
+    assert Toolchain(state).version('iverilog') == 'Icarus Verilog version 13.0 (devel)'
+    assert fake_tool.probes() == 3
+
+
+def test_hung_version_probe_is_unknown(tmp_path, fake_tool, monkeypatch):
+    monkeypatch.setattr(toolchain, 'PROBE_TIMEOUT', 0.2)
+    fake_tool('never printed', extra='exec sleep 30\n')
+    tool = Toolchain().resolve('iverilog')
+    assert tool.available
+    assert tool.version == UNKNOWN
@@ -0,0 +1,71 @@
+"""Tests for the sidecar VCD index (vcd_index.py): indexed loads must match streaming loads."""
+
+import random
+
+import numpy as np
+import pytest
+
+from vcd_index import IndexedVCD, build_index
+from vcd_reader import StreamingVCD
+
+WIDTHS = {'!': 1, '"': 4, '#': 8, '$': 3}
+
+
+def _random_vcd(path, rng: random.Random) -> None:
+    lines = ["$timescale 1ns $end", "$scope module TEST $end"]
+    lines += [f"$var wire {width} {identifier} s{k} $end" for k, (identifier, width) in enumerate(WIDTHS.items())]
+    lines += ["$upscope $end", "$enddefinitions $end", "#0", "$dumpvars"]
+    time = 0
+    for step in range(rng.randint(5, 60)):
+        if step:
+            time += rng.randint(1, 10)
+            lines.append(f"#{time}")
+        for identifier, width in rng.sample(list(WIDTHS.items()), rng.randint(1, len(WIDTHS))):
+            bits = ''.join(rng.choice('0011xz') for _ in range(width))
+            if width > 1 and rng.random() < 0.5:
+                bits = bits.lstrip('0')[:rng.randint(1, width)] or '0'  # shortened value
+            if width == 1 and rng.random() < 0.5:
+                lines.append(f"{bits}{identifier}")
+            else:
+                lines.append(f"b{bits} {identifier}")
+        if step == 0:
+            lines.append("$end")
+    lines.append(f"#{time + 5}")
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def _columns(signal):
+    arrays = signal.arrays()
+    return (arrays.times.tolist(), [arrays.binary(i) for i in range(len(arrays))])
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_indexed_matches_streaming(tmp_path, seed):
+    path = tmp_path / 'dump.vcd'
+    _random_vcd(path, random.Random(seed))
+    build_index(path)
+    streaming = StreamingVCD(path).load()
+    indexed = IndexedVCD(path).load()
+    assert set(indexed) == set(streaming)
+    for reference in streaming:
+        assert _columns(indexed[reference]) == _columns(streaming[reference]), reference
+
+
+def test_shortened_value_before_full_width_values(tmp_path):
+    path = tmp_path / 'dump.vcd'
+    path.write_text('$timescale 1ns $end\n$scope module TEST $end\n$var wire 4 " BUS [3:0] $end\n'
+                    '$upscope $end\n$enddefinitions $end\n#0\nb11 "\n#5\nb1010 "\n#10\n')
+    build_index(path)
+    arrays = IndexedVCD(path).load()['TEST.BUS[3:0]'].arrays()
+    assert [arrays.binary(i) for i in range(len(arrays))] == ['0011', '1010']
+    assert np.array_equal(arrays.times, [0, 5])
+
+
+def test_window_matches_streaming(tmp_path):
+    path = tmp_path / 'dump.vcd'
+    _random_vcd(path, random.Random(1234))
+    build_index(path)
+    streaming = StreamingVCD(path).load(start=20, end=120)
+    indexed = IndexedVCD(path).load(start=20, end=120)
+    for reference in streaming:
+        assert _columns(indexed[reference]) == _columns(streaming[reference]), reference
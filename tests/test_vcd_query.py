@@ -0,0 +1,131 @@
+"""Tests for waveform queries (vcd_query.py)."""
+
+import pytest
+
+from vcd_query import Waveform
+
+DUMP = """
+$timescale 1ns $end
+$scope module TEST $end
+$var wire 1 ! CLK $end
+$var wire 4 " Q [3:0] $end
+$var wire 1 # EN $end
+$upscope $end
+$enddefinitions $end
+#0
+$dumpvars
+0!
+b0000 "
+$end
+#5
+1!
+#8
+b0001 "
+#10
+0!
+$dumpall
+0!
+b0001 "
+$end
+#15
+1!
+#18
+b001x "
+#20
+0!
+#25
+x!
+#30
+1!
+#35
+x!
+#40
+0!
+#41
+1#
+"""
+
+
+@pytest.fixture
+def wave(write_vcd):
+    return Waveform(write_vcd(DUMP), use_index=False)
+
+
+def test_values_at_before_first_change_is_x(wave):
+    assert wave.values_at('EN', [0, 40, 41, '41ns']) == ['x', 'x', '1', '1']
+    assert wave.value_at('Q', 7) == '0000'
+
+
+def test_transitions_drop_repeated_dumpvars_values(wave):
+    assert wave.transitions('Q') == [(0, '0000'), (8, '0001'), (18, '001x')]
+    assert wave.transitions('CLK', start=10, end=20) == [(10, '0'), (15, '1'), (20, '0')]
+
+
+def test_edges_follow_posedge_negedge_semantics_through_x(wave):
+    # 0->x (25) is rising, x->1 (30) rising, 1->x (35) falling, x->0 (40) falling
+    assert wave.edges('CLK', 'rising').tolist() == [5, 15, 25, 30]
+    assert wave.edges('CLK', 'falling').tolist() == [10, 20, 35, 40]
+    assert wave.count_edges('CLK', 'both', start=20, end=35) == 4
+    with pytest.raises(ValueError):
+        wave.edges('Q')
+
+
+def test_sample_with_negative_offset_sees_values_before_the_edge(wave):
+    rows = wave.sample('CLK', ['Q'], offset=-1, end=20)
+    assert rows == [(5, {'Q': '0000'}), (15, {'Q': '0001'})]
+    assert wave.sample('CLK', ['Q'], edge='falling', offset='-2ns', end=20) == \
+        [(10, {'Q': '0001'}), (20, {'Q': '001x'})]
+
+
+def test_compare_scales_golden_timescale_and_applies_tolerance(wave, write_vcd):
+    # Same changes as DUMP's Q, in 100ps ticks, with the second change 1ns late
+    golden = Waveform(write_vcd("""
+        $timescale 100ps $end
+        $scope module TEST $end
+        $var wire 4 " Q [3:0] $end
+        $upscope $end
+        $enddefinitions $end
+        #0
+        b0000 "
+        #90
+        b0001 "
+        #180
+        b001x "
+        """, 'golden.vcd'), use_index=False)
+    [mismatch] = wave.compare(golden, ['Q'])
+    assert (mismatch.time, mismatch.reason) == (9, 'off by -1 ticks')
+    assert wave.compare(golden, ['Q'], tolerance='1ns') == []
+    assert wave.compare(golden, ['Q'], start=10) == []
+
+
+def _csv(tmp_path, text):
+    path = tmp_path / 'expected.csv'
+    path.write_text(text)
+    return path
+
+
+def test_check_csv_compares_x_z_bit_masks_and_skips_empty_cells(wave, tmp_path):
+    path = _csv(tmp_path, "time,Q,EN\n"
+                          "# comment rows are skipped\n"
+                          "7,0b0000,\n"
+                          "19,b001x,\n"
+                          "19,b0z1x,\n"
+                          "19,x,\n"
+                          "42,1,1\n")
+    mismatches = wave.check_csv(path)
+    assert [(m.signal, m.time, m.expected, m.actual) for m in mismatches] == [
+        ('TEST.Q[3:0]', 19, 'b0z1x', '001x'),
+        ('TEST.Q[3:0]', 19, 'x', '001x'),
+        ('TEST.Q[3:0]', 42, '1', '001x'),
+    ]
+
+
+def test_check_csv_tolerance_signals_and_window(wave, tmp_path):
+    path = _csv(tmp_path, "time,Q,EN\n7ns,1,\n30,0,0\n")
+    assert len(wave.check_csv(path)) == 3
+    assert [m.time for m in wave.check_csv(path, tolerance=1)] == [30, 30]
+    assert [m.signal for m in wave.check_csv(path, names=['EN'])] == ['TEST.EN']
+    assert [m.time for m in wave.check_csv(path, start=10)] == [30, 30]
+    assert [m.time for m in wave.check_csv(path, end='10ns')] == [7]
+    with pytest.raises(ValueError):
+        wave.check_csv(path, names=['CLK'])
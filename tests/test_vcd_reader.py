@@ -0,0 +1,38 @@
+"""Tests for the streaming VCD reader (vcd_reader.py)."""
+
+from vcd_reader import StreamingVCD
+
+HEADER = """$timescale 1ps $end
+$scope module TEST $end
+$var wire 1 ! CLK $end
+$var wire 4 " BUS [3:0] $end
+$upscope $end
+$enddefinitions $end
+"""
+
+
+def _load(tmp_path, body, **window):
+    path = tmp_path / 'dump.vcd'
+    path.write_text(HEADER + body)
+    return StreamingVCD(path).load(**window)
+
+
+def test_scalar_in_vector_form(tmp_path):
+    signals = _load(tmp_path, "#0\nb0 !\n#5\nB1 !\n#10\nbX !\n#15\n1!\n")
+    clock = signals['TEST.CLK']
+    assert clock.tv == [(0, '0'), (5, '1'), (10, 'x'), (15, '1')]
+    arrays = clock.arrays()
+    assert arrays.times.tolist() == [0, 5, 10, 15]
+    assert arrays.binary(1) == '1'
+
+
+def test_scalar_in_vector_form_at_window_start(tmp_path):
+    signals = _load(tmp_path, "#0\nb0 !\n#5\nb1 !\n#20\n0!\n", start=10)
+    assert signals['TEST.CLK'].tv == [(10, '1'), (20, '0')]
+
+
+def test_shortened_vector_values_are_extended(tmp_path):
+    signals = _load(tmp_path, '#0\nb11 "\n#5\nbx "\n#10\nb0101 "\n#15\nbz1 "\n')
+    assert [value for _, value in signals['TEST.BUS[3:0]'].tv] == ['11', 'x', '0101', 'z1']
+    arrays = signals['TEST.BUS[3:0]'].arrays()
+    assert [arrays.binary(i) for i in range(len(arrays))] == ['0011', 'xxxx', '0101', 'zzz1']
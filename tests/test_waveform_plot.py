@@ -0,0 +1,48 @@
+"""Tests for waveform level-of-detail decimation (waveform_plot.decimate_steps)."""
+
+import numpy as np
+import pytest
+
+from waveform_plot import decimate_steps
+
+
+def _value_at(times, values, t):
+    return values[np.searchsorted(times, t, side='right') - 1]
+
+
+def test_quiet_signal_is_unchanged():
+    times, values = np.array([0, 20, 40]), np.array([0, 1, 0])
+    kept_times, kept_values, index, spans = decimate_steps(times, values, 100, 10)
+    assert kept_times.tolist() == [0, 20, 40]
+    assert kept_values.tolist() == [0, 1, 0]
+    assert index.tolist() == [0, 1, 2]
+    assert spans == []
+
+
+def test_transition_on_busy_span_end_wins_over_resume():
+    kept_times, kept_values, _, spans = decimate_steps(np.array([0, 3, 10, 50]), np.array([1, 2, 7, 9]), 100, 10)
+    assert kept_times.tolist() == [10, 50]
+    assert kept_values.tolist() == [7, 9]
+    assert spans == [(0.0, 10.0)]
+
+
+def test_resume_point_holds_value_at_span_end():
+    kept_times, kept_values, _, spans = decimate_steps(np.array([0, 3, 6, 55]), np.array([1, 2, 3, 4]), 100, 10)
+    assert kept_times.tolist() == [10, 55]
+    assert kept_values.tolist() == [3, 4]
+    assert spans == [(0.0, 10.0)]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_kept_points_follow_the_original_trace(seed):
+    rng = np.random.default_rng(seed)
+    times = np.unique(rng.integers(0, 1000, rng.integers(1, 400)))
+    values = rng.integers(0, 4, len(times))
+    kept_times, kept_values, index, spans = decimate_steps(times, values, 1000, 50)
+
+    assert np.all(np.diff(kept_times) > 0)
+    assert len(kept_times) <= 50 + len(spans)
+    for t, value, k in zip(kept_times, kept_values, index):
+        assert value == _value_at(times, values, t) == values[k]
+    for start, width in spans:
+        assert width > 0 and 0 <= start < 1000
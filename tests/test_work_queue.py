@@ -0,0 +1,136 @@
+"""Tests for the distributed-run work queue (work_queue.py) and the options sent to workers."""
+
+import io
+import json
+import zipfile
+
+import pytest
+
+from verilog_automation import VerilogAutomation, _job_automation, run_worker
+from work_queue import DONE, FAILED, PENDING, RUNNING, WorkQueue, pack_artifacts, unpack_artifacts
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = WorkQueue(tmp_path / 'queue.db')
+    yield queue
+    queue.close()
+
+
+def test_claims_tasks_in_order_and_collects_results(queue):
+    queue.submit('job', [{'n': 0}, {'n': 1}])
+    first, second = queue.claim('w1'), queue.claim('w2')
+    assert (first['payload'], second['payload']) == ({'n': 0}, {'n': 1})
+    assert first['attempts'] == 1
+    assert queue.claim('w3') is None
+
+    queue.complete(first['id'], 'w1', True, 'log', {'file': 'q1.v'}, None)
+    result = queue.result('job', 0)
+    assert (result['state'], result['success'], result['record']) == (DONE, 1, {'file': 'q1.v'})
+    assert queue.result('job', 1) is None
+    assert queue.counts('job') == {DONE: 1, RUNNING: 1}
+
+
+def test_failed_task_is_retried_until_out_of_attempts(queue):
+    queue.submit('job', [{}], max_attempts=2)
+    task = queue.claim('w1')
+    queue.fail(task['id'], 'w1', 'boom')
+    assert queue.counts('job') == {PENDING: 1}
+    task = queue.claim('w2')
+    assert task['attempts'] == 2
+    queue.fail(task['id'], 'w2', 'boom again')
+    assert queue.result('job', 0)['state'] == FAILED
+    assert queue.result('job', 0)['error'] == 'boom again'
+
+
+def test_silent_worker_is_requeued_and_its_late_result_dropped(queue):
+    queue.submit('job', [{}])
+    task = queue.claim('dead')
+    assert queue.requeue_stale(timeout=-1) == 1
+    retry = queue.claim('alive')
+    assert retry['id'] == task['id'] and retry['attempts'] == 2
+
+    queue.complete(task['id'], 'dead', False, 'late', {}, None)
+    assert queue.result('job', 0) is None
+    queue.complete(retry['id'], 'alive', True, 'ok', {}, None)
+    assert queue.result('job', 0)['log'] == 'ok'
+
+
+def test_artifacts_round_trip(tmp_path):
+    source, target = tmp_path / 'source', tmp_path / 'target'
+    (source / 'imgs').mkdir(parents=True)
+    (source / 'imgs' / 'q1_waveform.png').write_bytes(b'png')
+    (source / 'q1.vcd').write_text('$end')
+    data = pack_artifacts(source, [source / 'q1.vcd', source / 'imgs' / 'q1_waveform.png', source / 'missing.vcd'])
+    written = unpack_artifacts(data, target)
+    assert sorted(path.relative_to(target.resolve()).as_posix() for path in written) == ['imgs/q1_waveform.png',
+                                                                                         'q1.vcd']
+    assert (target / 'imgs' / 'q1_waveform.png').read_bytes() == b'png'
+
+
+def test_artifacts_cannot_escape_the_folder(tmp_path):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('../outside.txt', 'x')
+    with pytest.raises(ValueError):
+        unpack_artifacts(buffer.getvalue(), tmp_path / 'target')
+
+
+def test_workers_get_the_coordinators_cache_and_batch_settings(tmp_path):
+    (tmp_path / 'Asg1').mkdir()
+    config = tmp_path / 'Asg1.json'
+    config.write_text(json.dumps({'folder': 'Asg1', 'files': [{'name': 'q1.v'}]}))
+    coordinator = VerilogAutomation(str(config), str(tmp_path), cache_dir=str(tmp_path / 'shared'),
+                                    cache_size_mb=64, batch=True)
+    options = json.loads(json.dumps(coordinator._worker_options()))
+    assert options['cache_dir'] == str(tmp_path / 'shared')
+    assert options['cache_size_mb'] == 64
+    assert options['batch'] is True
+
+    payload = {'config_file': 'Asg1.json', 'config': coordinator.config, 'options': options}
+    worker = _job_automation(payload, str(tmp_path))
+    assert worker.cache.cache_dir == tmp_path / 'shared'
+    assert worker.cache_size_mb == 64 and worker.batch
+
+    default = VerilogAutomation(str(config), str(tmp_path))
+    assert 'cache_dir' not in default._worker_options()
+
+
+def test_drained_and_fail_remaining(queue):
+    queue.submit('job', [{}, {}, {}])
+    assert not queue.drained('job')
+    done, running = queue.claim('w1'), queue.claim('w2')
+    queue.complete(done['id'], 'w1', True, '', {}, None)
+    assert queue.fail_remaining('job', 'no live worker') == 2
+    assert queue.drained('job')
+    assert [queue.result('job', position)['state'] for position in range(3)] == [DONE, FAILED, FAILED]
+
+    queue.complete(running['id'], 'w2', True, 'late', {}, None)  # dropped: the task was given up
+    assert queue.result('job', 1)['error'] == 'no live worker'
+    queue.drop('job')
+    assert queue.drained('job')
+
+
+def test_local_worker_exits_once_its_job_is_drained(tmp_path):
+    queue = WorkQueue(tmp_path / 'queue.db')
+    queue.submit('job', [{}])
+    queue.fail_remaining('job', 'given up')
+    queue.close()
+    assert run_worker(str(tmp_path / 'queue.db'), str(tmp_path), job='job') == 0
+
+
+def test_coordinator_without_workers_gives_up(tmp_path, capsys):
+    (tmp_path / 'Asg1').mkdir()
+    (tmp_path / 'Asg1' / 'q1.v').write_text('module TEST; initial $display("hi"); endmodule\n')
+    config = tmp_path / 'Asg1.json'
+    config.write_text(json.dumps({'folder': 'Asg1', 'files': [{'name': 'q1.v', 'plot': False},
+                                                              {'name': 'missing.v'}]}))
+    coordinator = VerilogAutomation(str(config), str(tmp_path), use_cache=False)
+    assert not coordinator.run_distributed(str(tmp_path / 'queue.db'), poll_interval=0.05, worker_timeout=0.2)
+
+    out = capsys.readouterr().out
+    assert 'Queued 1 files' in out
+    assert '✗ missing.v not queued: invalid entry' in out
+    assert 'q1.v failed after 0 attempt(s): no live worker' in out
+    assert set(coordinator.report.tools) >= {'iverilog', 'vvp'}
+    assert [record['file'] for record in coordinator.report.files] == ['q1.v', 'missing.v']
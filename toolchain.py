@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+"""
+Toolchain Registry
+==================
+
+Resolves the external tools used by the automation framework (iverilog, vvp,
+termshot and typst) and probes their versions once per run instead of once per
+file.
+
+Resolved tools can be persisted to a small JSON file. An entry is reused as
+long as the executable found on PATH is the same file with the same size and
+modification time, so later runs skip the version subprocesses entirely.
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# Version flag of each known tool
+VERSION_FLAGS = {'iverilog': '-V', 'vvp': '-V', 'termshot': '--version', 'typst': '--version'}
+UNAVAILABLE = 'unavailable'
+UNKNOWN = 'unknown'
+PROBE_TIMEOUT = 10.0  # seconds a version probe may take (a hung binary counts as version unknown)
+
+
+def executable_name(tool: str) -> str:
+    """Platform-specific executable name of a tool."""
+    if tool == 'termshot' and platform.system() == 'Windows':
+        return 'termshot.exe'
+    return tool
+
+
+class Tool:
+    """One resolved external tool."""
+
+    def __init__(self, name: str, path: Optional[str], version: str,
+                 mtime_ns: Optional[int] = None, size: Optional[int] = None):
+        """
+        Initialize a tool record.
+
+        Args:
+            name: Tool name (e.g. 'iverilog')
+            path: Absolute path of the executable (None if not found)
+            version: First line of the version banner, or 'unavailable'
+            mtime_ns: Executable modification time when probed
+            size: Executable size when probed
+        """
+        self.name = name
+        self.path = path
+        self.version = version
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+    @property
+    def available(self) -> bool:
+        """Whether the executable was found."""
+        return self.path is not None
+
+    @property
+    def command(self) -> str:
+        """Command to invoke the tool (the bare name if it was not found)."""
+        return self.path or executable_name(self.name)
+
+    def to_dict(self) -> Dict:
+        return {'path': self.path, 'version': self.version, 'mtime_ns': self.mtime_ns, 'size': self.size}
+
+    def __repr__(self) -> str:
+        return f"Tool({self.name!r}, {self.path!r}, {self.version!r})"
+
+
+class Toolchain:
+    """Run-wide registry of resolved, version-checked tools."""
+
+    def __init__(self, cache_file: Optional[Union[str, Path]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            cache_file: JSON file persisting probed tools across runs (None to
+                keep results in memory only)
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.tools: Dict[str, Tool] = {}
+        self._persisted: Dict[str, Dict] = {}
+        self._dirty = False
+        if self.cache_file and self.cache_file.exists():
+            try:
+                self._persisted = json.loads(self.cache_file.read_text())
+            except (OSError, ValueError):
+                self._persisted = {}
+
+    def resolve(self, name: str) -> Tool:
+        """
+        Find a tool on PATH and get its version (probed at most once per binary).
+
+        Args:
+            name: Tool name from VERSION_FLAGS
+
+        Returns:
+            The resolved tool (check Tool.available)
+        """
+        if name in self.tools:
+            return self.tools[name]
+
+        path = shutil.which(executable_name(name))
+        if path is None:
+            tool = Tool(name, None, UNAVAILABLE)
+        else:
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            cached = self._persisted.get(name)
+            if cached and cached.get('path') == path and cached.get('mtime_ns') == stat.st_mtime_ns \
+                    and cached.get('size') == stat.st_size:
+                tool = Tool(name, path, cached['version'], stat.st_mtime_ns, stat.st_size)
+            else:
+                tool = Tool(name, path, self._probe_version(path, VERSION_FLAGS.get(name, '--version')),
+                            stat.st_mtime_ns, stat.st_size)
+                self._persisted[name] = tool.to_dict()
+                self._dirty = True
+
+        self.tools[name] = tool
+        return tool
+
+    @staticmethod
+    def _probe_version(path: str, flag: str) -> str:
+        """Run a tool's version flag and return the first line of its banner."""
+        try:
+            result = subprocess.run([path, flag], capture_output=True, text=True, stdin=subprocess.DEVNULL,
+                                    timeout=PROBE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            return UNKNOWN
+        except OSError:
+            return UNAVAILABLE
+        lines = (result.stdout or result.stderr).strip().splitlines()
+        return lines[0] if lines else UNKNOWN
+
+    def version(self, name: str) -> str:
+        """Version banner of a tool (resolving it if needed)."""
+        return self.resolve(name).version
+
+    def versions(self) -> Dict[str, str]:
+        """Versions of every tool resolved so far."""
+        return {name: tool.version for name, tool in self.tools.items()}
+
+    def save(self) -> None:
+        """Persist newly probed tools (atomic; errors are ignored)."""
+        if not (self.cache_file and self._dirty):
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            staging = self.cache_file.with_name(f".{self.cache_file.name}.{os.getpid()}.tmp")
+            staging.write_text(json.dumps(self._persisted, indent=2))
+            os.replace(staging, self.cache_file)
+            self._dirty = False
+        except OSError:
+            pass
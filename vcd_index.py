@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+
+"""
+VCD Index
+=========
+
+Persistent sidecar index for VCD dumps, so repeated plots and queries of an
+unchanged dump skip parsing entirely.
+
+``<dump>.vcd.idx`` holds the header tables (references, identifiers, widths),
+every identifier's transition times and the byte offsets of its value changes
+in the dump, plus periodic (time, offset) checkpoints. Both the index and the
+dump are memory-mapped: loading a signal is a slice of its time column and a
+vectorized gather of the value characters at its offsets.
+
+The index records the dump's size, mtime and a digest of its head and tail,
+and is rebuilt automatically when any of them changes.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from dump_formats import detect_format
+from vcd_reader import (BIT_0, BIT_X, BIT_Z, READ_BUFFER, SignalArrays, StreamingVCD, VCDHeader, VCDSignal,
+                        pack_matrix, pack_values, parse_time, read_header)
+
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'VCDIDX\x00\x01'
+INDEX_VERSION = 1
+DIGEST_BYTES = 64 << 10
+CHECKPOINT_BYTES = 1 << 20
+SPILL_ENTRIES = 2 << 20  # buffered transitions before spilling to disk
+
+SCALAR_CODES = frozenset(b'01xXzZ')
+VECTOR_CODES = frozenset(b'bBrR')
+WHITESPACE_CODES = np.array([ord(' '), ord('\t'), ord('\r'), ord('\n')], dtype=np.uint8)
+
+
+def index_path_for(vcd_path: Union[str, Path]) -> Path:
+    """Sidecar index path of a dump."""
+    vcd_path = Path(vcd_path)
+    return vcd_path.with_name(vcd_path.name + INDEX_SUFFIX)
+
+
+def _fingerprint(vcd_path: Path) -> Dict:
+    """Size, mtime and head/tail digest identifying one version of a dump."""
+    stat = vcd_path.stat()
+    digest = hashlib.sha256(str(stat.st_size).encode())
+    with open(vcd_path, 'rb') as f:
+        digest.update(f.read(DIGEST_BYTES))
+        if stat.st_size > DIGEST_BYTES:
+            f.seek(max(DIGEST_BYTES, stat.st_size - DIGEST_BYTES))
+            digest.update(f.read())
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest.hexdigest()}
+
+
+class _TransitionBuffers:
+    """Per-identifier (time, offset) columns that spill to a temp file when large."""
+
+    def __init__(self, count: int, directory: Path):
+        self.times = [array('q') for _ in range(count)]
+        self.offsets = [array('q') for _ in range(count)]
+        self.segments: List[List[tuple]] = [[] for _ in range(count)]
+        self.buffered = 0
+        self.directory = directory
+        self.spill = None
+
+    def flush(self) -> None:
+        """Move all buffered columns to the spill file."""
+        if self.spill is None:
+            self.spill = tempfile.TemporaryFile(dir=self.directory)
+        for k, (times, offsets) in enumerate(zip(self.times, self.offsets)):
+            if times:
+                position = self.spill.seek(0, os.SEEK_END)
+                times.tofile(self.spill)
+                offsets.tofile(self.spill)
+                self.segments[k].append((position, len(times)))
+                self.times[k], self.offsets[k] = array('q'), array('q')
+        self.buffered = 0
+
+    def count(self, k: int) -> int:
+        return sum(n for _, n in self.segments[k]) + len(self.times[k])
+
+    def write_column(self, out, k: int, column: str) -> None:
+        """Write identifier k's full times ('times') or offsets ('offsets') column."""
+        for position, n in self.segments[k]:
+            self.spill.seek(position + (n * 8 if column == 'offsets' else 0))
+            out.write(self.spill.read(n * 8))
+        getattr(self, column)[k].tofile(out)
+
+    def close(self) -> None:
+        if self.spill is not None:
+            self.spill.close()
+
+
+def build_index(vcd_path: Union[str, Path], index_path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Scan a dump once and write its sidecar index.
+
+    Memory use is bounded: transition columns spill to a temporary file once
+    SPILL_ENTRIES changes are buffered.
+
+    Args:
+        vcd_path: VCD file to index
+        index_path: Output path (default: <dump>.idx next to the dump)
+
+    Returns:
+        Path of the written index
+    """
+    vcd_path = Path(vcd_path)
+    index_path = Path(index_path) if index_path else index_path_for(vcd_path)
+    fingerprint = _fingerprint(vcd_path)
+
+    with open(vcd_path, 'rb', buffering=READ_BUFFER) as f:
+        header = read_header(f)
+        identifiers = list(header.ids_to_references)
+        numbers = {identifier.encode(): k for k, identifier in enumerate(identifiers)}
+        buffers = _TransitionBuffers(len(identifiers), index_path.parent)
+        checkpoints = array('q')
+
+        f.seek(header.data_offset)
+        offset = header.data_offset
+        next_checkpoint = offset
+        time = 0
+        in_comment = False
+        try:
+            for line in f:
+                code = line[0] if line else 0
+                if in_comment:
+                    in_comment = b'$end' not in line
+                elif code == 35:  # '#'
+                    time = int(line[1:])
+                    if offset >= next_checkpoint:
+                        checkpoints.append(time)
+                        checkpoints.append(offset)
+                        next_checkpoint = offset + CHECKPOINT_BYTES
+                elif code in SCALAR_CODES and b' ' not in line.strip():
+                    k = numbers.get(line[1:].rstrip())
+                    if k is not None:
+                        buffers.times[k].append(time)
+                        buffers.offsets[k].append(offset)
+                        buffers.buffered += 1
+                elif code in VECTOR_CODES and line.count(b' ') == 1:
+                    k = numbers.get(line[line.index(b' ') + 1:].rstrip())
+                    if k is not None:
+                        buffers.times[k].append(time)
+                        buffers.offsets[k].append(offset)
+                        buffers.buffered += 1
+                elif line.strip():
+                    # Several tokens on one line (e.g. "$dumpvars 0! b1 " $end")
+                    time, in_comment = _index_tokens(line, offset, time, numbers, buffers)
+                offset += len(line)
+                if buffers.buffered >= SPILL_ENTRIES:
+                    buffers.flush()
+
+            _write_index(index_path, header, identifiers, buffers, checkpoints, time, fingerprint)
+        finally:
+            buffers.close()
+    return index_path
+
+
+def _index_tokens(line: bytes, offset: int, time: int, numbers: Dict[bytes, int],
+                  buffers: _TransitionBuffers):
+    """
+    General tokenizing path for lines holding several VCD tokens.
+
+    Returns:
+        Tuple of (current time, whether a $comment block is still open)
+    """
+    position = 0
+    pending = None  # offset of a vector value awaiting its identifier
+    in_comment = False
+    for token in line.split():
+        start = line.index(token, position)
+        position = start + len(token)
+        if in_comment:
+            in_comment = token != b'$end'
+            continue
+        if pending is not None:
+            k = numbers.get(token)
+            if k is not None:
+                buffers.times[k].append(time)
+                buffers.offsets[k].append(pending)
+                buffers.buffered += 1
+            pending = None
+        elif token[0] == 35:
+            time = int(token[1:])
+        elif token[0] in SCALAR_CODES:
+            k = numbers.get(token[1:])
+            if k is not None:
+                buffers.times[k].append(time)
+                buffers.offsets[k].append(offset + start)
+                buffers.buffered += 1
+        elif token[0] in VECTOR_CODES:
+            pending = offset + start
+        elif token == b'$comment':
+            in_comment = True
+    return time, in_comment
+
+
+def _write_index(index_path: Path, header: VCDHeader, identifiers: List[str],
+                 buffers: _TransitionBuffers, checkpoints: array, endtime: int, fingerprint: Dict) -> None:
+    """Serialize the header tables and transition columns (atomically)."""
+    position = 0  # in int64 words, relative to the data section
+    entries = {}
+    for k, identifier in enumerate(identifiers):
+        count = buffers.count(k)
+        entries[identifier] = {
+            'size': header.ids_to_size[identifier],
+            'type': header.ids_to_type[identifier],
+            'references': header.ids_to_references[identifier],
+            'count': count,
+            'times_at': position,
+            'offsets_at': position + count,
+        }
+        position += 2 * count
+
+    meta = {
+        'version': INDEX_VERSION,
+        'vcd': fingerprint,
+        'timescale': header.timescale,
+        'signals': header.signals,
+        'scopes': header.scopes,
+        'data_offset': header.data_offset,
+        'endtime': endtime,
+        'ids': entries,
+        'checkpoints_at': position,
+        'checkpoints_count': len(checkpoints) // 2,
+    }
+    meta_bytes = json.dumps(meta).encode()
+    padding = -(len(INDEX_MAGIC) + 8 + len(meta_bytes)) % 8
+
+    handle, temp_name = tempfile.mkstemp(prefix='.idx-', dir=index_path.parent)
+    try:
+        with os.fdopen(handle, 'wb') as out:
+            out.write(INDEX_MAGIC)
+            out.write(struct.pack('<Q', len(meta_bytes)))
+            out.write(meta_bytes + b'\0' * padding)
+            for k in range(len(identifiers)):
+                buffers.write_column(out, k, 'times')
+                buffers.write_column(out, k, 'offsets')
+            checkpoints.tofile(out)
+        os.chmod(temp_name, 0o644)
+        os.replace(temp_name, index_path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+
+class IndexedVCD:
+    """Dump reader served from a memory-mapped sidecar index."""
+
+    def __init__(self, vcd_path: Union[str, Path], index_path: Optional[Union[str, Path]] = None):
+        """
+        Open an index and memory-map it together with its dump.
+
+        Args:
+            vcd_path: VCD file
+            index_path: Sidecar index (default: <dump>.idx)
+
+        Raises:
+            ValueError: If the file is not a VCD index of a supported version
+        """
+        self.path = Path(vcd_path)
+        self.index_path = Path(index_path) if index_path else index_path_for(self.path)
+
+        with open(self.index_path, 'rb') as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f"Not a VCD index: {self.index_path}")
+            (meta_length,) = struct.unpack('<Q', f.read(8))
+            self.meta = json.loads(f.read(meta_length))
+        if self.meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"Unsupported VCD index version: {self.meta.get('version')}")
+
+        data_start = len(INDEX_MAGIC) + 8 + meta_length
+        data_start += -data_start % 8
+        self._words = np.memmap(self.index_path, dtype=np.int64, mode='r', offset=data_start) \
+            if os.path.getsize(self.index_path) > data_start else np.zeros(0, np.int64)
+        self._dump = None
+
+        self.header = VCDHeader()
+        self.header.timescale = self.meta['timescale']
+        self.header.signals = self.meta['signals']
+        self.header.scopes = self.meta['scopes']
+        self.header.data_offset = self.meta['data_offset']
+        for identifier, entry in self.meta['ids'].items():
+            for reference in entry['references']:
+                self.header.references_to_ids[reference] = identifier
+            self.header.ids_to_references[identifier] = entry['references']
+            self.header.ids_to_size[identifier] = entry['size']
+            self.header.ids_to_type[identifier] = entry['type']
+        self.endtime = self.meta['endtime']
+
+    def is_current(self) -> bool:
+        """True if the index still describes the dump on disk."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return False
+        recorded = self.meta['vcd']
+        if stat.st_size != recorded['size'] or stat.st_mtime_ns != recorded['mtime_ns']:
+            return False
+        return _fingerprint(self.path)['digest'] == recorded['digest']
+
+    @property
+    def signals(self) -> List[str]:
+        """All hierarchical signal references declared in the header."""
+        return self.header.signals
+
+    @property
+    def references_to_ids(self) -> Dict[str, str]:
+        """Mapping of hierarchical reference to VCD identifier."""
+        return self.header.references_to_ids
+
+    def transitions(self, identifier: str) -> int:
+        """Number of value changes recorded for an identifier."""
+        return self.meta['ids'][identifier]['count']
+
+    def offset_at(self, time: Union[str, int]) -> int:
+        """
+        Byte offset in the dump from which reading reaches the given time.
+
+        Args:
+            time: Ticks or a time with unit
+
+        Returns:
+            Offset of the last checkpoint at or before the time
+        """
+        time = parse_time(time, self.header.timescale)
+        count = self.meta['checkpoints_count']
+        at = self.meta['checkpoints_at']
+        checkpoints = self._words[at:at + 2 * count].reshape(count, 2)
+        i = int(np.searchsorted(checkpoints[:, 0], time, side='right')) - 1
+        return int(checkpoints[i, 1]) if i >= 0 else self.header.data_offset
+
+    def _dump_bytes(self) -> np.ndarray:
+        if self._dump is None:
+            self._dump = np.memmap(self.path, dtype=np.uint8, mode='r')
+        return self._dump
+
+    def _values(self, entry: Dict, offsets: np.ndarray) -> SignalArrays:
+        """Gather and pack the value characters at the given dump offsets."""
+        dump = self._dump_bytes()
+        width = entry['size']
+
+        if entry['type'] == 'real':
+            values = np.array([float(self._token(dump, o + 1)) for o in offsets], dtype=np.float64)
+            return SignalArrays(None, values, width, is_real=True)
+
+        if width == 1:
+            codes = dump[offsets]
+            vector_form = (codes == ord('b')) | (codes == ord('B'))
+            if vector_form.any():
+                codes = codes.copy()
+                codes[vector_form] = dump[offsets[vector_form] + 1]
+            matrix = (codes | 0x20).reshape(-1, 1)
+            values, x_mask, z_mask = pack_matrix(matrix)
+            return SignalArrays(None, values, width, x_mask, z_mask)
+
+        # Full-width vector values can be gathered in one fancy-index; a
+        # shortened value ('b11 "' on a 4-bit bus) ends inside the window
+        window = None
+        if len(offsets) and offsets.max() + 1 + width < len(dump):
+            window = dump[(offsets + 1)[:, None] + np.arange(width + 1)]
+            ends = np.isin(window, WHITESPACE_CODES)
+            if not ends[:, width].all() or ends[:, :width].any():
+                window = None
+        if window is not None:
+            values, x_mask, z_mask = pack_matrix(window[:, :width] | 0x20)
+        else:
+            matrix = self._shortened_matrix(dump, offsets, width)
+            if matrix is not None:
+                values, x_mask, z_mask = pack_matrix(matrix)
+            else:
+                raw = [self._token(dump, o + 1).lower() for o in offsets]
+                values, x_mask, z_mask = pack_values(raw, width)
+        return SignalArrays(None, values, width, x_mask, z_mask)
+
+    @staticmethod
+    def _shortened_matrix(dump: np.ndarray, offsets: np.ndarray, width: int) -> Optional[np.ndarray]:
+        """
+        Gather vector values that may omit leading bits, extended to full width.
+
+        Returns None when a value is longer than its declared width (left to
+        the per-token path).
+        """
+        if not len(offsets):
+            return None
+        positions = (offsets + 1)[:, None] + np.arange(width + 1)
+        window = dump[np.minimum(positions, len(dump) - 1)]
+        ends = np.isin(window, WHITESPACE_CODES) | (positions >= len(dump))
+        if not ends.any(axis=1).all():
+            return None
+        lengths = ends.argmax(axis=1)
+        window = window | 0x20
+
+        # Right-align each value; fill with x/z when that is its leading bit, else 0
+        fill = window[:, 0].copy()
+        fill[(fill != BIT_X) & (fill != BIT_Z)] = BIT_0
+        source = np.arange(width) - (width - lengths)[:, None]
+        rows = np.arange(len(offsets))[:, None]
+        return np.where(source >= 0, window[rows, np.maximum(source, 0)], fill[:, None])
+
+    @staticmethod
+    def _token(dump: np.ndarray, start: int) -> bytes:
+        end = start
+        while dump[end] not in WHITESPACE_CODES:
+            end += 1
+        return dump[start:end].tobytes()
+
+    def load(self, references: Optional[Iterable[str]] = None,
+             start: Optional[Union[str, int]] = None, end: Optional[Union[str, int]] = None) -> Dict[str, VCDSignal]:
+        """
+        Load signals from the index; same contract as StreamingVCD.load().
+
+        Args:
+            references: Hierarchical references to load (None loads every signal)
+            start: Window start (ticks or a time with unit)
+            end: Window end (ticks or a time with unit)
+
+        Returns:
+            Mapping of each resolved reference to its signal (aliases share one object)
+        """
+        start = parse_time(start, self.header.timescale) if start is not None else None
+        end = parse_time(end, self.header.timescale) if end is not None else None
+        endtime = min(end, self.endtime) if end is not None else self.endtime
+        endtime = max(endtime, start or 0)
+
+        if references is None:
+            references = self.header.signals
+        signals: Dict[str, VCDSignal] = {}
+        result: Dict[str, VCDSignal] = {}
+        for reference in references:
+            identifier = self.header.references_to_ids.get(reference)
+            if identifier is None:
+                continue
+            if identifier not in signals:
+                entry = self.meta['ids'][identifier]
+                count = entry['count']
+                times = self._words[entry['times_at']:entry['times_at'] + count]
+                offsets = self._words[entry['offsets_at']:entry['offsets_at'] + count]
+
+                first = 0
+                last = count
+                if start is not None:
+                    first = max(int(np.searchsorted(times, start, side='right')) - 1, 0)
+                if end is not None:
+                    last = int(np.searchsorted(times, end, side='right'))
+                window_times = np.array(times[first:last], dtype=np.int64)
+                if start is not None and len(window_times) and window_times[0] < start:
+                    window_times[0] = start  # value in effect at the window start
+
+                arrays = self._values(entry, np.asarray(offsets[first:last]))
+                arrays.times = window_times
+                signals[identifier] = VCDSignal.from_arrays(identifier, entry['size'], entry['type'],
+                                                            entry['references'], arrays, endtime)
+            result[reference] = signals[identifier]
+        return result
+
+
+def open_vcd(vcd_path: Union[str, Path], use_index: bool = True,
+             build: bool = True) -> Union[IndexedVCD, StreamingVCD]:
+    """
+    Open a dump through its sidecar index, (re)building the index if needed.
+
+    Args:
+        vcd_path: VCD file
+        use_index: False to read the dump directly with the streaming reader
+        build: Whether a missing or stale index may be (re)built; when False
+            such dumps are read with the streaming reader instead
+
+    Returns:
+        IndexedVCD when a current index is available (or was built), else
+        StreamingVCD (always for compressed and FST dumps)
+    """
+    # The index addresses values by byte offset, so only plain VCDs are indexed
+    if not use_index or detect_format(vcd_path) != 'vcd':
+        return StreamingVCD(vcd_path)
+
+    index_path = index_path_for(vcd_path)
+    if index_path.exists():
+        try:
+            indexed = IndexedVCD(vcd_path, index_path)
+            if indexed.is_current():
+                return indexed
+        except (ValueError, OSError, KeyError):
+            pass  # Corrupt or outdated index: rebuild below
+
+    if not build:
+        return StreamingVCD(vcd_path)
+    build_index(vcd_path, index_path)
+    return IndexedVCD(vcd_path, index_path)
@@ -0,0 +1,688 @@
+#!/usr/bin/env python3
+
+"""
+VCD Query
+=========
+
+Signal-level queries over VCD dumps for automated waveform checks (CI,
+autograding) without rendering anything.
+
+A ``Waveform`` opens a dump through the sidecar index (or the streaming
+reader), loads each queried signal once as NumPy columns and answers every
+query with binary searches over them, so thousands of checks cost little
+more than loading the signals. matplotlib is never imported.
+
+Queries:
+
+- value at a time, and the transitions inside a time window
+- rising/falling edge times and counts of 1-bit signals
+- clock-relative sampling (values at every clock edge, plus an offset)
+- comparison against a golden dump or a CSV of expected values, with a
+  tolerance on timing
+
+Times are dump ticks, or strings with a unit such as ``'200ns'``. Values are
+VCD-style strings: ``'0'``/``'1'``/``'x'`` for scalars, binary digits (with
+``x``/``z`` for unknown bits) for vectors and the decimal text of reals.
+
+Usage:
+    python vcd_query.py Asg3/q3.vcd signals
+    python vcd_query.py Asg3/q3.vcd value Q 20ns 40ns
+    python vcd_query.py Asg3/q3.vcd transitions Q --start 10ns --end 60ns
+    python vcd_query.py Asg3/q3.vcd edges CLK --edge rising
+    python vcd_query.py Asg3/q3.vcd sample CLK Q UP --offset -1
+    python vcd_query.py Asg3/q3.vcd compare golden/q3.vcd --tolerance 1ns
+    python vcd_query.py Asg3/q3.vcd compare expected.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from vcd_index import open_vcd
+from vcd_reader import TIME_PATTERN, TIME_UNITS, SignalArrays, parse_time
+
+Time = Union[str, int]
+
+EDGES = ('rising', 'falling', 'both')
+MAX_REPORTED = 20  # mismatches printed per comparison by the CLI
+
+
+def _changed(arrays: SignalArrays) -> np.ndarray:
+    """Boolean array marking samples whose value differs from the previous sample."""
+    n = len(arrays)
+    changed = np.ones(n, dtype=bool)
+    if n < 2:
+        return changed
+    different = np.zeros(n - 1, dtype=bool)
+    for column in (arrays.values, arrays.x_mask, arrays.z_mask):
+        if column is None:
+            continue
+        step = column[1:] != column[:-1]
+        different |= step.any(axis=1) if step.ndim == 2 else step
+    changed[1:] = different
+    return changed
+
+
+def _states(arrays: SignalArrays) -> np.ndarray:
+    """State of every sample of a 1-bit signal: 0, 1, or 2 for X/Z."""
+    states = (arrays.values != 0).astype(np.int8)
+    states[arrays.unknown()] = 2
+    return states
+
+
+def _tick_seconds(timescale: str) -> float:
+    """Length of one dump tick in seconds ('1ps' -> 1e-12; unknown timescales count as 1s)."""
+    match = TIME_PATTERN.match(timescale or '')
+    if not match or match.group(2) is None:
+        return 1.0
+    return float(match.group(1)) * TIME_UNITS[match.group(2)]
+
+
+def _bit_matrix(column: np.ndarray, width: int, indices: np.ndarray) -> np.ndarray:
+    """(len(indices), width) uint8 matrix of the bits of the given samples, MSB first."""
+    if column.ndim == 2:
+        return np.unpackbits(column[indices], axis=1)[:, -width:]
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint64)
+    return ((column[indices, None] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+
+def labels(arrays: SignalArrays, indices: Iterable[int]) -> List[str]:
+    """
+    Value strings of many samples at once.
+
+    Args:
+        arrays: Signal data
+        indices: Sample indices (-1 stands for "before the first change")
+
+    Returns:
+        One value string per index ('x' for -1)
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    safe = np.maximum(indices, 0)
+    if len(arrays) == 0:
+        return ['x'] * len(indices)
+    if arrays.is_real:
+        result = [repr(float(value)) for value in arrays.values[safe]]
+    else:
+        chars = _bit_matrix(arrays.values, arrays.width, safe) + np.uint8(ord('0'))
+        for mask, char in ((arrays.x_mask, 'x'), (arrays.z_mask, 'z')):
+            if mask is not None:
+                chars[_bit_matrix(mask, arrays.width, safe) == 1] = ord(char)
+        result = np.ascontiguousarray(chars).view(f'S{arrays.width}').ravel().astype(str).tolist()
+    for k in np.flatnonzero(indices < 0):
+        result[k] = 'x'
+    return result
+
+
+def _keys(arrays: SignalArrays, indices: np.ndarray) -> np.ndarray:
+    """Comparable rows (value and X/Z bits) of the given samples, one row per index."""
+    if arrays.is_real:
+        return arrays.values[indices][:, None]
+    columns = []
+    for column in (arrays.values, arrays.x_mask, arrays.z_mask):
+        column = np.zeros_like(arrays.values) if column is None else column
+        column = column[indices]
+        columns.append(column if column.ndim == 2 else column[:, None])
+    return np.hstack(columns)
+
+
+def _sample_bits(arrays: SignalArrays, index: int) -> Tuple[int, int]:
+    """(value bits, unknown bits) of one sample as integers."""
+    def bits(column):
+        if column is None:
+            return 0
+        if column.ndim == 2:
+            return int.from_bytes(column[index].tobytes(), 'big')
+        return int(column[index])
+    return bits(arrays.values), bits(arrays.x_mask) | bits(arrays.z_mask)
+
+
+def parse_value(text: str, width: int, is_real: bool = False) -> Union[float, Tuple[int, int]]:
+    """
+    Parse an expected value.
+
+    Accepted forms are decimal integers (negative ones in two's complement),
+    ``0x``/``0o`` prefixed numbers, and binary strings prefixed with ``0b``
+    or ``b`` that may contain ``x``/``z`` bits (``x`` alone means all bits
+    unknown).
+
+    Args:
+        text: Value text
+        width: Bit width of the signal it is compared with
+        is_real: Parse as a real (float) value
+
+    Returns:
+        Float for reals, else a tuple of (value bits, unknown-bit mask)
+
+    Raises:
+        ValueError: If the text is not a valid value
+    """
+    text = text.strip().lower().replace('_', '')
+    if is_real:
+        return float(text)
+    if text in ('x', 'z'):
+        return 0, (1 << width) - 1
+    if text.startswith('0b') or (text.startswith('b') and len(text) > 1):
+        digits = text[2:] if text.startswith('0b') else text[1:]
+        if not digits or set(digits) - set('01xz'):
+            raise ValueError(f"Invalid binary value: {text!r}")
+        # Shorter values are extended like VCD values: with x/z if leading, else 0
+        fill = digits[0] if digits[0] in 'xz' else '0'
+        digits = digits.rjust(width, fill)[-width:]
+        value = int(digits.replace('x', '0').replace('z', '0'), 2)
+        unknown = int(''.join('1' if d in 'xz' else '0' for d in digits), 2)
+        return value, unknown
+    value = int(text, 0)
+    return value & ((1 << width) - 1), 0
+
+
+class Mismatch:
+    """One difference found by a comparison."""
+
+    def __init__(self, signal: str, time: int, expected: str, actual: str, reason: str):
+        """
+        Initialize a mismatch.
+
+        Args:
+            signal: Hierarchical reference of the signal
+            time: Dump time (ticks) of the difference
+            expected: Expected value (or description)
+            actual: Observed value (or description)
+            reason: Short description of the difference
+        """
+        self.signal = signal
+        self.time = time
+        self.expected = expected
+        self.actual = actual
+        self.reason = reason
+
+    def as_dict(self) -> Dict:
+        return {'signal': self.signal, 'time': self.time, 'expected': self.expected,
+                'actual': self.actual, 'reason': self.reason}
+
+    def __str__(self) -> str:
+        return f"{self.signal} @ {self.time}: expected {self.expected}, got {self.actual} ({self.reason})"
+
+
+class Waveform:
+    """Query interface over one VCD dump."""
+
+    def __init__(self, vcd_path: Union[str, Path], use_index: bool = True):
+        """
+        Open a dump.
+
+        Args:
+            vcd_path: VCD file
+            use_index: Read through the sidecar index (built if missing or stale)
+        """
+        self.path = Path(vcd_path)
+        self.source = open_vcd(self.path, use_index=use_index)
+        self.timescale = self.source.header.timescale
+        self._arrays: Dict[str, SignalArrays] = {}
+        self._resolved: Dict[str, str] = {}
+
+    @property
+    def signals(self) -> List[str]:
+        """All hierarchical signal references declared in the dump."""
+        return self.source.signals
+
+    def time(self, value: Optional[Time]) -> Optional[int]:
+        """Convert a time (ticks or a string with unit) to dump ticks (None passes through)."""
+        return None if value is None else parse_time(value, self.timescale)
+
+    def resolve(self, name: str) -> str:
+        """
+        Find the reference a signal name refers to.
+
+        Accepts the full reference (``TEST.Q[2:0]``), a hierarchical suffix
+        (``Q[2:0]``, ``gc.CLK``) or either without its bit range (``TEST.Q``, ``Q``).
+
+        Args:
+            name: Signal name
+
+        Returns:
+            Hierarchical reference
+
+        Raises:
+            KeyError: If no signal, or several distinct signals, match the name
+        """
+        ids = self.source.references_to_ids
+        if name in ids:
+            return name
+        if name in self._resolved:
+            return self._resolved[name]
+        candidates = [reference for reference in self.signals
+                      if any(form == name or form.endswith('.' + name)
+                             for form in (reference, reference.split('[', 1)[0].rstrip()))]
+        if not candidates:
+            raise KeyError(f"No signal named {name!r} in {self.path}")
+        # Aliases of one identifier (a port seen from several scopes) are the same signal
+        if len({ids[reference] for reference in candidates}) > 1:
+            raise KeyError(f"Signal name {name!r} is ambiguous: {', '.join(candidates)}")
+        self._resolved[name] = min(candidates, key=lambda reference: reference.count('.'))
+        return self._resolved[name]
+
+    def load(self, names: Iterable[str]) -> None:
+        """
+        Load several signals in one pass (queries load missing signals on demand).
+
+        Args:
+            names: Signal names accepted by resolve()
+        """
+        references = [reference for reference in map(self.resolve, names) if reference not in self._arrays]
+        if references:
+            for reference, signal in self.source.load(references).items():
+                self._arrays[reference] = signal.arrays()
+
+    def arrays(self, name: str) -> SignalArrays:
+        """
+        Columnar value changes of a signal (loaded once, then cached).
+
+        Args:
+            name: Signal name accepted by resolve()
+
+        Returns:
+            SignalArrays of the whole dump
+        """
+        reference = self.resolve(name)
+        if reference not in self._arrays:
+            self.load([reference])
+        return self._arrays[reference]
+
+    def _indices(self, arrays: SignalArrays, times: np.ndarray) -> np.ndarray:
+        """Index of the sample in effect at each time (-1 before the first change)."""
+        return np.searchsorted(arrays.times, times, side='right') - 1
+
+    def value_at(self, name: str, time: Time) -> str:
+        """
+        Value of a signal at a time, including changes made at that time.
+
+        Args:
+            name: Signal name
+            time: Ticks or a time with unit
+
+        Returns:
+            Value string ('x' before the signal's first value change)
+        """
+        return self.values_at(name, [time])[0]
+
+    def values_at(self, name: str, times: Iterable[Time]) -> List[str]:
+        """
+        Values of a signal at many times (one vectorized lookup).
+
+        Args:
+            name: Signal name
+            times: Ticks or times with unit
+
+        Returns:
+            Value strings, in the order of times
+        """
+        arrays = self.arrays(name)
+        ticks = np.array([self.time(t) for t in times], dtype=np.int64)
+        return labels(arrays, self._indices(arrays, ticks))
+
+    def transitions(self, name: str, start: Optional[Time] = None,
+                    end: Optional[Time] = None) -> List[Tuple[int, str]]:
+        """
+        Value changes of a signal inside a window.
+
+        Repeated dumps of an unchanged value (e.g. by $dumpvars or $dumpall)
+        are not transitions and are left out.
+
+        Args:
+            name: Signal name
+            start: Window start (inclusive; None for the start of the dump)
+            end: Window end (inclusive; None for the end of the dump)
+
+        Returns:
+            List of (time, new value) pairs
+        """
+        arrays = self.arrays(name)
+        selected = _changed(arrays) & self._window(arrays, start, end)
+        indices = np.flatnonzero(selected)
+        return list(zip(arrays.times[indices].tolist(), labels(arrays, indices)))
+
+    def _window(self, arrays: SignalArrays, start: Optional[Time], end: Optional[Time]) -> np.ndarray:
+        inside = np.ones(len(arrays), dtype=bool)
+        if start is not None:
+            inside &= arrays.times >= self.time(start)
+        if end is not None:
+            inside &= arrays.times <= self.time(end)
+        return inside
+
+    def edges(self, name: str, edge: str = 'rising', start: Optional[Time] = None,
+              end: Optional[Time] = None) -> np.ndarray:
+        """
+        Edge times of a 1-bit signal, with Verilog posedge/negedge semantics
+        (0->1, 0->x/z and x/z->1 are rising; 1->0, 1->x/z and x/z->0 falling).
+
+        Args:
+            name: Signal name
+            edge: 'rising', 'falling' or 'both'
+            start: Window start (inclusive)
+            end: Window end (inclusive)
+
+        Returns:
+            int64 array of edge times
+
+        Raises:
+            ValueError: If the signal is wider than one bit or edge is unknown
+        """
+        if edge not in EDGES:
+            raise ValueError(f"Invalid edge {edge!r} (choose from {', '.join(EDGES)})")
+        arrays = self.arrays(name)
+        if arrays.width != 1 or arrays.is_real:
+            raise ValueError(f"Edges need a 1-bit signal; {name} is {arrays.width} bits wide")
+        states = _states(arrays)
+        previous, current = states[:-1], states[1:]
+        rising = ((previous == 0) & (current != 0)) | ((previous == 2) & (current == 1))
+        falling = ((previous == 1) & (current != 1)) | ((previous == 2) & (current == 0))
+        selected = {'rising': rising, 'falling': falling, 'both': rising | falling}[edge]
+        selected = np.concatenate(([False], selected)) & self._window(arrays, start, end)
+        return arrays.times[selected]
+
+    def count_edges(self, name: str, edge: str = 'rising', start: Optional[Time] = None,
+                    end: Optional[Time] = None) -> int:
+        """Number of edges of a 1-bit signal inside a window (see edges())."""
+        return len(self.edges(name, edge, start, end))
+
+    def sample(self, clock: str, names: Iterable[str], edge: str = 'rising', offset: Time = 0,
+               start: Optional[Time] = None, end: Optional[Time] = None) -> List[Tuple[int, Dict[str, str]]]:
+        """
+        Sample signals relative to the edges of a clock.
+
+        Values are taken at ``edge time + offset`` and include changes made at
+        that exact time; use a negative offset (e.g. -1 tick) to see the values
+        a flip-flop captures, i.e. those just before the edge.
+
+        Args:
+            clock: 1-bit clock signal name
+            names: Signals to sample
+            edge: Clock edge: 'rising', 'falling' or 'both'
+            offset: Ticks or time with unit added to every edge time
+            start: Window start for the clock edges
+            end: Window end for the clock edges
+
+        Returns:
+            List of (edge time, {name: value}) pairs, one per clock edge
+        """
+        names = list(names)
+        self.load([clock] + names)
+        edge_times = self.edges(clock, edge, start, end)
+        ticks = edge_times + self.time(offset)
+        columns = {}
+        for name in names:
+            arrays = self.arrays(name)
+            columns[name] = labels(arrays, self._indices(arrays, ticks))
+        return [(time, {name: columns[name][k] for name in names}) for k, time in enumerate(edge_times.tolist())]
+
+    def compare(self, golden: 'Waveform', names: Optional[Iterable[str]] = None, tolerance: Time = 0,
+                start: Optional[Time] = None, end: Optional[Time] = None) -> List[Mismatch]:
+        """
+        Compare signals against a golden dump.
+
+        Both dumps must make the same sequence of value changes; each change
+        may happen up to ``tolerance`` earlier or later than in the golden
+        dump. Only the first difference of each signal is reported, since
+        later ones usually follow from it.
+
+        Args:
+            golden: Reference dump
+            names: Signals to compare (default: every signal of the golden dump)
+            tolerance: Allowed timing difference (ticks or a time with unit,
+                in the timescale of this dump)
+            start: Window start (inclusive)
+            end: Window end (inclusive)
+
+        Returns:
+            Mismatches (empty when the dumps agree)
+        """
+        tolerance = self.time(tolerance)
+        scale = _tick_seconds(golden.timescale) / _tick_seconds(self.timescale)
+        if names is None:
+            # One reference per identifier: aliases of a signal are compared once
+            names, seen = [], set()
+            for reference in golden.signals:
+                identifier = golden.source.references_to_ids[reference]
+                if identifier not in seen:
+                    seen.add(identifier)
+                    names.append(reference)
+        mismatches = []
+        present = []
+        for name in names:
+            for waveform, where in ((golden, 'golden dump'), (self, 'dump')):
+                try:
+                    waveform.resolve(name)
+                except KeyError:
+                    mismatches.append(Mismatch(name, 0, 'signal', 'no such signal', f'missing from {where}'))
+                    break
+            else:
+                present.append(name)
+        self.load(present)
+        golden.load(present)
+
+        start, end = self.time(start), self.time(end)
+        golden_start = None if start is None else int(math.floor(start / scale))
+        golden_end = None if end is None else int(math.ceil(end / scale))
+        for name in present:
+            mine, theirs = self.arrays(name), golden.arrays(name)
+            reference = self.resolve(name)
+            if mine.width != theirs.width or mine.is_real != theirs.is_real:
+                mismatches.append(Mismatch(reference, 0, f"{theirs.width} bits", f"{mine.width} bits",
+                                           'width differs'))
+                continue
+            ours = np.flatnonzero(_changed(mine) & self._window(mine, start, end))
+            expected = np.flatnonzero(_changed(theirs) & golden._window(theirs, golden_start, golden_end))
+            mismatch = self._first_difference(reference, mine, ours, theirs, expected, scale, tolerance)
+            if mismatch:
+                mismatches.append(mismatch)
+        return mismatches
+
+    @staticmethod
+    def _first_difference(reference: str, mine: SignalArrays, ours: np.ndarray, theirs: SignalArrays,
+                          expected: np.ndarray, scale: float, tolerance: int) -> Optional[Mismatch]:
+        """First difference between two transition lists (sample indices into mine/theirs)."""
+        common = min(len(ours), len(expected))
+        our_times = mine.times[ours[:common]]
+        expected_times = np.round(theirs.times[expected[:common]] * scale).astype(np.int64)
+        values = np.flatnonzero((_keys(mine, ours[:common]) != _keys(theirs, expected[:common])).any(axis=1))
+        timing = np.flatnonzero(np.abs(our_times - expected_times) > tolerance)
+
+        if len(values) and (not len(timing) or values[0] <= timing[0]):
+            k = values[0]
+            return Mismatch(reference, int(min(our_times[k], expected_times[k])),
+                            labels(theirs, [expected[k]])[0], labels(mine, [ours[k]])[0], 'value differs')
+        if len(timing):
+            k = timing[0]
+            time, our_time = int(expected_times[k]), int(our_times[k])
+            return Mismatch(reference, time, f"change at {time}", f"change at {our_time}",
+                            f"off by {our_time - time} ticks")
+        if len(expected) > common:
+            time = int(round(theirs.times[expected[common]] * scale))
+            return Mismatch(reference, time, labels(theirs, [expected[common]])[0], '(no change)',
+                            'missing transition')
+        if len(ours) > common:
+            return Mismatch(reference, int(mine.times[ours[common]]), '(no change)',
+                            labels(mine, [ours[common]])[0], 'extra transition')
+        return None
+
+    def check_csv(self, csv_path: Union[str, Path], tolerance: Time = 0, names: Optional[Iterable[str]] = None,
+                  start: Optional[Time] = None, end: Optional[Time] = None) -> List[Mismatch]:
+        """
+        Check expected values listed in a CSV file.
+
+        The first column holds times (ticks or times with unit); every other
+        column is a signal whose expected value at that time is given in the
+        cells (see parse_value(); empty cells are not checked). A value
+        passes if the signal holds it at any point within ``tolerance`` of
+        the time.
+
+        Args:
+            csv_path: CSV file with a header row ``time,<signal>,...``
+            tolerance: Allowed timing difference (ticks or a time with unit)
+            names: Only check these signals (default: every column)
+            start: Only check rows at or after this time
+            end: Only check rows at or before this time
+
+        Returns:
+            Mismatches (empty when every value matches)
+
+        Raises:
+            ValueError: If the file is empty, a cell is not a valid value or
+                one of names has no column
+            KeyError: If a column names an unknown signal
+        """
+        with open(csv_path, newline='') as f:
+            reader = csv.reader(f)
+            rows = [(reader.line_num, row) for row in reader if row and not row[0].lstrip().startswith('#')]
+        if not rows:
+            raise ValueError(f"{csv_path} is empty")
+        header, line_numbers, rows = rows[0][1], [n for n, _ in rows[1:]], [row for _, row in rows[1:]]
+        columns = list(enumerate((name.strip() for name in header[1:]), start=1))
+        self.load(name for _, name in columns)
+        if names is not None:
+            wanted = {self.resolve(name): name for name in names}
+            missing = set(wanted) - {self.resolve(name) for _, name in columns}
+            if missing:
+                raise ValueError(f"{csv_path} has no column for {', '.join(sorted(wanted[r] for r in missing))}")
+            columns = [(column, name) for column, name in columns if self.resolve(name) in wanted]
+        tolerance = self.time(tolerance)
+        times = np.array([self.time(row[0].strip()) for row in rows], dtype=np.int64)
+        start, end = self.time(start), self.time(end)
+        checked = [k for k, time in enumerate(times.tolist())
+                   if (start is None or time >= start) and (end is None or time <= end)]
+
+        mismatches = []
+        for column, name in columns:
+            arrays = self.arrays(name)
+            reference = self.resolve(name)
+            first = self._indices(arrays, times - tolerance)
+            last = self._indices(arrays, times + tolerance)
+            for k in checked:
+                row = rows[k]
+                cell = row[column].strip() if column < len(row) else ''
+                if not cell:
+                    continue
+                try:
+                    expected = parse_value(cell, arrays.width, arrays.is_real)
+                except ValueError as e:
+                    raise ValueError(f"{csv_path} line {line_numbers[k]}, column {name}: {e}") from None
+                candidates = range(max(int(first[k]), 0), int(last[k]) + 1)
+                if not any(self._matches(arrays, i, expected) for i in candidates):
+                    index = int(self._indices(arrays, times[k:k + 1])[0])
+                    mismatches.append(Mismatch(reference, int(times[k]), cell, labels(arrays, [index])[0],
+                                               'value differs'))
+        return mismatches
+
+    @staticmethod
+    def _matches(arrays: SignalArrays, index: int, expected: Union[float, Tuple[int, int]]) -> bool:
+        if arrays.is_real:
+            return math.isclose(float(arrays.values[index]), expected, rel_tol=1e-9, abs_tol=1e-12)
+        value, unknown = _sample_bits(arrays, index)
+        expected_value, expected_unknown = expected
+        return unknown == expected_unknown and (value & ~unknown) == (expected_value & ~expected_unknown)
+
+
+def main():
+    """Command-line interface for waveform queries."""
+    parser = argparse.ArgumentParser(description='Verilog Automation Framework - VCD signal queries')
+    parser.add_argument('vcd', help='VCD dump to query')
+    parser.add_argument('--no-index', action='store_true', help='Read the dump directly, without the .vcd.idx index')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('signals', help='List the signals declared in the dump')
+
+    value = commands.add_parser('value', help='Value of a signal at one or more times')
+    value.add_argument('signal')
+    value.add_argument('times', nargs='+', help="Ticks or times with unit ('20ns')")
+
+    transitions = commands.add_parser('transitions', help='Value changes of a signal inside a window')
+    transitions.add_argument('signal')
+
+    edges = commands.add_parser('edges', help='Edge times and count of a 1-bit signal')
+    edges.add_argument('signal')
+    edges.add_argument('--edge', choices=EDGES, default='rising')
+    edges.add_argument('--count', action='store_true', help='Only print the number of edges')
+
+    sample = commands.add_parser('sample', help='Sample signals at the edges of a clock')
+    sample.add_argument('clock')
+    sample.add_argument('signals', nargs='+')
+    sample.add_argument('--edge', choices=EDGES, default='rising')
+    sample.add_argument('--offset', default='0',
+                        help='Time added to each edge (negative to sample before it, e.g. -1)')
+
+    compare = commands.add_parser('compare', help='Compare against a golden VCD or a CSV of expected values')
+    compare.add_argument('golden', help='Golden .vcd dump, or .csv with a time column and one column per signal')
+    compare.add_argument('--signals', nargs='+', metavar='NAME', help='Signals to compare (default: all)')
+    compare.add_argument('--tolerance', default='0', help="Allowed timing difference (e.g. '1ns', default: 0)")
+
+    for command in (transitions, edges, sample, compare):
+        command.add_argument('--start', help='Window start (ticks or time with unit)')
+        command.add_argument('--end', help='Window end (ticks or time with unit)')
+
+    args = parser.parse_args()
+    try:
+        waveform = Waveform(args.vcd, use_index=not args.no_index)
+        output = _run_command(waveform, args)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error: {e.args[0] if isinstance(e, KeyError) else e}")
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(output['data'], indent=2))
+    else:
+        for line in output['lines']:
+            print(line)
+    sys.exit(0 if output.get('passed', True) else 1)
+
+
+def _run_command(waveform: Waveform, args) -> Dict:
+    """Run one CLI command; returns JSON data, text lines and (for compare) the verdict."""
+    if args.command == 'signals':
+        return {'data': waveform.signals, 'lines': waveform.signals}
+
+    if args.command == 'value':
+        values = waveform.values_at(args.signal, args.times)
+        return {'data': dict(zip(args.times, values)),
+                'lines': [f"{time}: {value}" for time, value in zip(args.times, values)]}
+
+    if args.command == 'transitions':
+        changes = waveform.transitions(args.signal, args.start, args.end)
+        return {'data': [[time, value] for time, value in changes],
+                'lines': [f"{time}: {value}" for time, value in changes]}
+
+    if args.command == 'edges':
+        times = waveform.edges(args.signal, args.edge, args.start, args.end).tolist()
+        lines = [str(len(times))] if args.count else [str(time) for time in times]
+        return {'data': {'count': len(times), 'times': times}, 'lines': lines}
+
+    if args.command == 'sample':
+        rows = waveform.sample(args.clock, args.signals, args.edge, args.offset, args.start, args.end)
+        return {'data': [{'time': time, **values} for time, values in rows],
+                'lines': [f"{time}: " + '  '.join(f"{name}={value}" for name, value in values.items())
+                          for time, values in rows]}
+
+    # compare
+    if args.golden.lower().endswith('.csv'):
+        mismatches = waveform.check_csv(args.golden, args.tolerance, args.signals, args.start, args.end)
+    else:
+        mismatches = waveform.compare(Waveform(args.golden, use_index=not args.no_index),
+                                      args.signals, args.tolerance, args.start, args.end)
+    lines = [f"✗ {mismatch}" for mismatch in mismatches[:MAX_REPORTED]]
+    if len(mismatches) > MAX_REPORTED:
+        lines.append(f"... {len(mismatches) - MAX_REPORTED} more")
+    lines.append(f"✗ {len(mismatches)} mismatch(es) against {args.golden}" if mismatches
+                 else f"✓ {args.vcd} matches {args.golden}")
+    return {'data': {'passed': not mismatches, 'mismatches': [m.as_dict() for m in mismatches]},
+            'lines': lines, 'passed': not mismatches}
+
+
+if __name__ == '__main__':
+    main()
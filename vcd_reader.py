@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+
+"""
+Streaming VCD Reader
+====================
+
+Memory-bounded Value Change Dump reader used by the automation framework.
+
+The header (scopes and ``$var`` declarations) is parsed once, requested
+signal references are resolved to their short identifiers, and the
+value-change section is then scanned line by line keeping only the changes of
+the selected identifiers. Memory use is proportional to the selected signals'
+activity, not to the size of the dump.
+
+Signal references use the same naming as vcdvcd (``TEST.Q[2:0]``) so configs
+written against the previous loader keep working.
+
+Loaded signals are converted to a columnar NumPy store (``SignalArrays``):
+an int64 time column, a packed value column and X/Z bit masks, so plotting
+and analysis never touch per-sample Python objects.
+
+A load can be restricted to a time window. The reader bisects the file for
+the window start, recovers the values in effect at that point with a
+regex pass over the skipped prefix (no tokenizing), and stops reading at the
+window end.
+
+Compressed dumps (gzip/zstd VCD, FST; see dump_formats) are decompressed as a
+stream. They cannot be bisected, so a windowed load scans from the start and
+drops the changes before the window.
+"""
+
+import os
+import re
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from dump_formats import detect_format, open_dump
+
+READ_BUFFER = 1 << 20
+
+PREFIX_CHUNK = 16 << 20
+BISECT_LINEAR = 64 << 10
+
+TIME_UNITS = {'s': 1.0, 'ms': 1e-3, 'us': 1e-6, 'ns': 1e-9, 'ps': 1e-12, 'fs': 1e-15}
+TIME_PATTERN = re.compile(r'^\s*([0-9.eE+-]+)\s*([munpf]?s)?\s*$')
+
+# Byte codes of the VCD value characters (values are stored lower-cased)
+BIT_0, BIT_1, BIT_X, BIT_Z = ord('0'), ord('1'), ord('x'), ord('z')
+
+
+class VCDFormatError(ValueError):
+    """Raised when a file is not a well-formed VCD dump."""
+
+
+class SignalArrays:
+    """
+    Columnar, typed storage of one signal's value changes.
+
+    Bit vectors of up to 64 bits are stored as uint64 columns; wider vectors
+    as rows of big-endian packed bytes (``uint8`` of shape ``(n, ceil(width/8))``).
+    ``x_mask``/``z_mask`` have the same layout as ``values`` with a bit set for
+    every X or Z bit, and are None when the signal never carries X/Z. Real
+    variables use a float64 value column and no masks.
+    """
+
+    def __init__(self, times: np.ndarray, values: np.ndarray, width: int,
+                 x_mask: Optional[np.ndarray] = None, z_mask: Optional[np.ndarray] = None,
+                 is_real: bool = False):
+        self.times = times
+        self.values = values
+        self.width = width
+        self.x_mask = x_mask
+        self.z_mask = z_mask
+        self.is_real = is_real
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def is_wide(self) -> bool:
+        """True when values are stored as packed byte rows (width > 64)."""
+        return self.values.ndim == 2
+
+    def unknown(self) -> np.ndarray:
+        """Boolean array marking samples that contain any X or Z bit."""
+        unknown = np.zeros(len(self.times), dtype=bool)
+        for mask in (self.x_mask, self.z_mask):
+            if mask is not None:
+                unknown |= (mask.any(axis=1) if mask.ndim == 2 else mask != 0)
+        return unknown
+
+    def as_float(self) -> np.ndarray:
+        """
+        Numeric value of every sample for plotting.
+
+        Samples containing X or Z bits map to 0.
+
+        Returns:
+            float64 array aligned with ``times``
+        """
+        if self.is_real:
+            return self.values.astype(np.float64)
+        if self.is_wide:
+            weights = 256.0 ** np.arange(self.values.shape[1] - 1, -1, -1)
+            numeric = self.values.astype(np.float64) @ weights
+        else:
+            numeric = self.values.astype(np.float64)
+        numeric[self.unknown()] = 0.0
+        return numeric
+
+    def _bits(self, column: Optional[np.ndarray], index: int) -> int:
+        if column is None:
+            return 0
+        if column.ndim == 2:
+            return int.from_bytes(column[index].tobytes(), 'big')
+        return int(column[index])
+
+    def binary(self, index: int) -> str:
+        """
+        Binary string of one sample, with 'x'/'z' for unknown bits.
+
+        Args:
+            index: Sample index
+
+        Returns:
+            String of exactly ``width`` characters
+        """
+        value = format(self._bits(self.values, index), f'0{self.width}b')
+        x_bits, z_bits = self._bits(self.x_mask, index), self._bits(self.z_mask, index)
+        if not (x_bits or z_bits):
+            return value
+        x_str, z_str = format(x_bits, f'0{self.width}b'), format(z_bits, f'0{self.width}b')
+        return ''.join('x' if x == '1' else 'z' if z == '1' else v
+                       for v, x, z in zip(value, x_str, z_str))
+
+    def label(self, index: int) -> str:
+        """Annotation text of one sample ('0b...' for bit vectors)."""
+        if self.is_real:
+            return repr(float(self.values[index]))
+        return "0b" + self.binary(index)
+
+
+def _pack_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Pack an (n, width) boolean matrix (MSB first) into a value column.
+
+    Returns:
+        uint64 array for width <= 64, else (n, ceil(width/8)) uint8 rows
+    """
+    n, width = bits.shape
+    slots = 64 if width <= 64 else -(-width // 8) * 8
+    padded = np.zeros((n, slots), dtype=bool)
+    padded[:, slots - width:] = bits
+    packed = np.packbits(padded, axis=1)
+    if width <= 64:
+        return packed.view('>u8').ravel().astype(np.uint64)
+    return packed
+
+
+def _extend(value: bytes, width: int) -> bytes:
+    """Left-extend a shortened VCD vector value to its declared width."""
+    if len(value) >= width:
+        return value[-width:]
+    fill = value[:1] if value[:1] in (b'x', b'z') else b'0'
+    return fill * (width - len(value)) + value
+
+
+def pack_values(raw: Union[bytes, bytearray, List[bytes]], width: int) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Vectorized conversion of VCD value strings to packed value and X/Z columns.
+
+    Args:
+        raw: One byte per sample for scalars, else a list of vector value strings
+        width: Declared bit width
+
+    Returns:
+        Tuple of (values, x_mask, z_mask); masks are None when unused
+    """
+    if isinstance(raw, (bytes, bytearray)):
+        matrix = np.frombuffer(bytes(raw), dtype=np.uint8).reshape(-1, 1)
+        width = 1
+    else:
+        joined = b''.join(raw)
+        if len(joined) != len(raw) * width:
+            joined = b''.join(_extend(value, width) for value in raw)
+        matrix = np.frombuffer(joined, dtype=np.uint8).reshape(len(raw), width)
+    return pack_matrix(matrix)
+
+
+def pack_matrix(matrix: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+    """
+    Pack an (n, width) matrix of lower-case value characters (MSB first).
+
+    Args:
+        matrix: uint8 character codes, one row per sample
+
+    Returns:
+        Tuple of (values, x_mask, z_mask); masks are None when unused
+    """
+    values = _pack_bits(matrix == BIT_1)
+    x_bits, z_bits = matrix == BIT_X, matrix == BIT_Z
+    x_mask = _pack_bits(x_bits) if x_bits.any() else None
+    z_mask = _pack_bits(z_bits) if z_bits.any() else None
+    return values, x_mask, z_mask
+
+
+class VCDSignal:
+    """Value changes of one VCD identifier."""
+
+    def __init__(self, identifier: str, size: int, var_type: str, references: List[str]):
+        """
+        Initialize an empty signal.
+
+        Args:
+            identifier: Short VCD identifier code
+            size: Bit width declared in the header
+            var_type: Declared variable type (wire, reg, ...)
+            references: Hierarchical names sharing this identifier
+        """
+        self.identifier = identifier
+        self.size = size
+        self.var_type = var_type
+        self.references = references
+        self.endtime = 0
+
+        # Compact accumulation buffers filled by the scanner: one int64 per
+        # change, plus one byte per change for scalars or the raw value string
+        # for vectors and reals
+        self.times = array('q')
+        self.raw_values: Union[bytearray, List[bytes]] = bytearray() if self.is_scalar else []
+        self._arrays: Optional[SignalArrays] = None
+
+    @property
+    def is_scalar(self) -> bool:
+        return self.size == 1 and self.var_type != 'real'
+
+    @classmethod
+    def from_arrays(cls, identifier: str, size: int, var_type: str, references: List[str],
+                    arrays: SignalArrays, endtime: int) -> 'VCDSignal':
+        """
+        Wrap already-columnar data (e.g. served from a VCD index) as a signal.
+
+        Args:
+            identifier: Short VCD identifier code
+            size: Bit width declared in the header
+            var_type: Declared variable type
+            references: Hierarchical names sharing this identifier
+            arrays: Columnar value changes
+            endtime: Last timestamp of the dump (or window)
+
+        Returns:
+            Signal whose arrays() returns the given data
+        """
+        signal = cls(identifier, size, var_type, references)
+        signal._arrays = arrays
+        signal.endtime = endtime
+        return signal
+
+    def __len__(self) -> int:
+        if self._arrays is not None:
+            return len(self._arrays)
+        return len(self.times)
+
+    def __repr__(self) -> str:
+        return f"VCDSignal({self.references[0]!r}, size={self.size}, changes={len(self)})"
+
+    def prepend(self, time: int, value: bytes) -> None:
+        """
+        Insert the value in effect at the start of a time window.
+
+        Skipped when the signal already changes at that time.
+
+        Args:
+            time: Window start time
+            value: Raw (lower-cased) value string
+        """
+        if self.times and self.times[0] <= time:
+            return
+        self.times = array('q', [time]) + self.times
+        if self.is_scalar:
+            self.raw_values = bytearray(value[-1:]) + self.raw_values
+        else:
+            self.raw_values = [value] + self.raw_values
+        self._arrays = None
+
+    def clip(self, time: int) -> None:
+        """
+        Drop the changes before a window start, keeping the value in effect at it.
+
+        Args:
+            time: Window start time
+        """
+        k = bisect_right(self.times, time)
+        if k == 0:
+            return
+        self.times = array('q', [time]) + self.times[k:]
+        if self.is_scalar:
+            self.raw_values = self.raw_values[k - 1:k] + self.raw_values[k:]
+        else:
+            self.raw_values = [self.raw_values[k - 1]] + self.raw_values[k:]
+        self._arrays = None
+
+    def arrays(self) -> SignalArrays:
+        """
+        Columnar view of the signal (built once, then cached).
+
+        Returns:
+            SignalArrays with int64 times and packed values
+        """
+        if self._arrays is None:
+            times = np.frombuffer(self.times, dtype=np.int64).copy() if self.times else np.zeros(0, np.int64)
+            if self.var_type == 'real':
+                values = np.array([float(v) for v in self.raw_values], dtype=np.float64)
+                self._arrays = SignalArrays(times, values, self.size, is_real=True)
+            else:
+                values, x_mask, z_mask = pack_values(self.raw_values, self.size)
+                self._arrays = SignalArrays(times, values, self.size, x_mask, z_mask)
+        return self._arrays
+
+    @property
+    def tv(self) -> List[Tuple[int, str]]:
+        """(time, value string) pairs, as produced by vcdvcd (built on demand)."""
+        if self._arrays is not None and not self.times:
+            arrays = self._arrays
+            values = [repr(float(v)) for v in arrays.values] if arrays.is_real else \
+                [arrays.binary(i) for i in range(len(arrays))]
+            return list(zip(arrays.times.tolist(), values))
+        if self.is_scalar:
+            return [(t, chr(v)) for t, v in zip(self.times, self.raw_values)]
+        return [(t, v.decode('ascii', errors='replace')) for t, v in zip(self.times, self.raw_values)]
+
+
+def parse_time(value: Union[str, int, float], timescale: str) -> int:
+    """
+    Convert a time to dump ticks.
+
+    Args:
+        value: Ticks as a number, or a string with a unit such as '200ns'
+        timescale: Dump timescale from the header (e.g. '1ps')
+
+    Returns:
+        Time in ticks of the dump's timescale
+
+    Raises:
+        ValueError: If the value or timescale cannot be parsed
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = TIME_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid time value: {value!r}")
+    number, unit = float(match.group(1)), match.group(2)
+    if unit is None:
+        return int(number)
+
+    scale = TIME_PATTERN.match(timescale or '1s')
+    if not scale or scale.group(2) is None:
+        raise ValueError(f"Cannot convert {value!r}: dump timescale {timescale!r} is unknown")
+    tick = float(scale.group(1)) * TIME_UNITS[scale.group(2)]
+    return int(round(number * TIME_UNITS[unit] / tick))
+
+
+class VCDHeader:
+    """Declarations section of a VCD file."""
+
+    def __init__(self):
+        self.timescale = ''
+        self.signals: List[str] = []
+        self.references_to_ids: Dict[str, str] = {}
+        self.ids_to_references: Dict[str, List[str]] = {}
+        self.ids_to_size: Dict[str, int] = {}
+        self.ids_to_type: Dict[str, str] = {}
+        self.scopes: List[str] = []
+        self.data_offset = 0
+
+
+def read_header(stream) -> VCDHeader:
+    """
+    Parse VCD declarations up to ``$enddefinitions``.
+
+    Args:
+        stream: Binary file object positioned at the start of the dump
+
+    Returns:
+        Parsed header; ``data_offset`` is the byte offset of the value-change section
+
+    Raises:
+        VCDFormatError: If ``$enddefinitions`` is never reached
+    """
+    header = VCDHeader()
+    hierarchy: List[str] = []
+    tokens: List[str] = []
+    offset = 0
+
+    for raw in stream:
+        offset += len(raw)
+        tokens.extend(raw.decode('ascii', errors='replace').split())
+        if '$end' not in tokens:
+            continue
+
+        # Tokens now hold at least one complete declaration
+        while '$end' in tokens:
+            end = tokens.index('$end')
+            command, args = tokens[0], tokens[1:end]
+            del tokens[:end + 1]
+
+            if command == '$scope' and len(args) >= 2:
+                hierarchy.append(args[1])
+                header.scopes.append('.'.join(hierarchy))
+            elif command == '$upscope':
+                if hierarchy:
+                    hierarchy.pop()
+            elif command == '$timescale':
+                header.timescale = ''.join(args)
+            elif command == '$var' and len(args) >= 4:
+                var_type, size, identifier = args[0], args[1], args[2]
+                name = ''.join(args[3:])
+                reference = '.'.join(hierarchy + [name])
+                header.signals.append(reference)
+                header.references_to_ids[reference] = identifier
+                header.ids_to_references.setdefault(identifier, []).append(reference)
+                header.ids_to_size[identifier] = int(size) if size.isdigit() else 1
+                header.ids_to_type[identifier] = var_type
+            elif command == '$enddefinitions':
+                header.data_offset = offset
+                return header
+
+    raise VCDFormatError("VCD header is missing $enddefinitions")
+
+
+class StreamingVCD:
+    """Selective, streaming reader over a VCD file."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a dump and parse its header.
+
+        Args:
+            path: Dump file path (plain VCD, or any format of dump_formats)
+        """
+        self.path = Path(path)
+        self.format = detect_format(self.path)
+        with open_dump(self.path, self.format) as f:
+            self.header = read_header(f)
+        self.endtime = 0
+
+    @property
+    def signals(self) -> List[str]:
+        """All hierarchical signal references declared in the header."""
+        return self.header.signals
+
+    @property
+    def references_to_ids(self) -> Dict[str, str]:
+        """Mapping of hierarchical reference to VCD identifier."""
+        return self.header.references_to_ids
+
+    def load(self, references: Optional[Iterable[str]] = None,
+             start: Optional[Union[str, int]] = None, end: Optional[Union[str, int]] = None) -> Dict[str, VCDSignal]:
+        """
+        Scan the value-change section, keeping only the requested signals.
+
+        Args:
+            references: Hierarchical references to load (None loads every signal)
+            start: Window start (ticks or a time with unit); data before it is
+                skipped, and each signal starts with the value in effect at start
+            end: Window end (ticks or a time with unit); reading stops after it
+
+        Returns:
+            Mapping of each resolved reference to its signal (aliases share one object)
+        """
+        header = self.header
+        if references is None:
+            references = header.signals
+        wanted: Dict[str, VCDSignal] = {}
+        result: Dict[str, VCDSignal] = {}
+        for reference in references:
+            identifier = header.references_to_ids.get(reference)
+            if identifier is None:
+                continue
+            if identifier not in wanted:
+                wanted[identifier] = VCDSignal(identifier, header.ids_to_size[identifier],
+                                               header.ids_to_type[identifier],
+                                               header.ids_to_references[identifier])
+            result[reference] = wanted[identifier]
+
+        start = parse_time(start, header.timescale) if start is not None else None
+        end = parse_time(end, header.timescale) if end is not None else None
+
+        if self.format != 'vcd':
+            # Compressed streams cannot seek: scan from the start, then clip
+            with open_dump(self.path, self.format) as f:
+                read_header(f)
+                time = self._scan(f, wanted, end)
+            for signal in wanted.values():
+                if start is not None:
+                    signal.clip(start)
+                signal.endtime = time
+            self.endtime = time
+            return result
+
+        with open(self.path, 'rb', buffering=READ_BUFFER) as f:
+            initial = {}
+            if start is not None and start > 0:
+                offset = self._time_offset(f, start)
+                initial = self._last_values(f, header.data_offset, offset, wanted)
+                f.seek(offset)
+            else:
+                f.seek(header.data_offset)
+            time = self._scan(f, wanted, end, start or 0)
+
+        for identifier, value in initial.items():
+            wanted[identifier].prepend(start, value)
+
+        self.endtime = time
+        for signal in wanted.values():
+            signal.endtime = time
+        return result
+
+    def _time_offset(self, stream, target: int) -> int:
+        """
+        Bisect the value-change section for a time.
+
+        Args:
+            stream: Binary file object of the dump
+            target: Time in ticks
+
+        Returns:
+            Byte offset of the first timestamp line with time >= target (or EOF)
+        """
+        data_offset = self.header.data_offset
+        lo, hi = data_offset, os.path.getsize(self.path)
+
+        while hi - lo > BISECT_LINEAR:
+            mid = (lo + hi) // 2
+            stream.seek(mid)
+            stream.readline()  # Skip the partial line
+            offset = stream.tell()
+            for line in stream:
+                if line.startswith(b'#'):
+                    if int(line[1:]) >= target:
+                        hi = mid
+                    else:
+                        lo = offset + 1
+                    break
+                offset += len(line)
+            else:
+                hi = mid
+
+        stream.seek(lo)
+        offset = lo
+        if lo != data_offset:
+            offset += len(stream.readline())
+        for line in stream:
+            if line.startswith(b'#') and int(line[1:]) >= target:
+                return offset
+            offset += len(line)
+        return offset
+
+    @staticmethod
+    def _last_values(stream, begin: int, end: int, wanted: Dict[str, 'VCDSignal']) -> Dict[str, bytes]:
+        """
+        Find the last value of each wanted identifier in a byte range.
+
+        Uses a compiled regex over large chunks instead of tokenizing, which
+        assumes the usual one-change-per-line layout written by simulators.
+
+        Args:
+            stream: Binary file object of the dump
+            begin: Start offset (a line boundary)
+            end: End offset (a line boundary)
+            wanted: Identifier to signal mapping
+
+        Returns:
+            Mapping of identifier to its last raw value (lower-cased)
+        """
+        if not wanted or end <= begin:
+            return {}
+        ids = b'|'.join(re.escape(identifier.encode()) for identifier in wanted)
+        pattern = re.compile(rb'^(?:([01xXzZ])|[bBrR](\S+)[ \t]+)(' + ids + rb')[ \t]*\r?$', re.MULTILINE)
+
+        last = {}
+        stream.seek(begin)
+        remaining = end - begin
+        carry = b''
+        while remaining > 0:
+            chunk = stream.read(min(PREFIX_CHUNK, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            block = carry + chunk
+            cut = block.rfind(b'\n') + 1 if remaining > 0 else len(block)
+            carry = block[cut:]
+            for match in pattern.finditer(block, 0, cut):
+                last[match.group(3).decode()] = (match.group(1) or match.group(2)).lower()
+        return last
+
+    @staticmethod
+    def _scan(stream, wanted: Dict[str, VCDSignal], end: Optional[int] = None, time: int = 0) -> int:
+        """
+        Collect value changes for the wanted identifiers.
+
+        Args:
+            stream: Binary file object positioned at the value-change section
+            wanted: Identifier to signal mapping to fill
+            end: Stop at the first timestamp after this time (None reads to EOF)
+            time: Current time at the stream position
+
+        Returns:
+            Last timestamp seen in the dump (or end, if reading stopped there)
+        """
+        in_comment = False
+        pending_vector = None  # value awaiting its identifier on the next token
+
+        for raw in stream:
+            for token in raw.split():
+                if in_comment:
+                    in_comment = token != b'$end'
+                    continue
+                if pending_vector is not None:
+                    signal = wanted.get(token.decode('ascii', errors='replace'))
+                    if signal is not None:
+                        signal.times.append(time)
+                        if signal.is_scalar:
+                            # 1-bit signal in vector form ('b0 !'): keep its (last) bit
+                            signal.raw_values.append(pending_vector[-1] if pending_vector else ord('x'))
+                        else:
+                            signal.raw_values.append(pending_vector)
+                    pending_vector = None
+                    continue
+
+                first = token[:1]
+                if first == b'#':
+                    time = int(token[1:])
+                    if end is not None and time > end:
+                        return end
+                elif first in b'01xXzZ':
+                    signal = wanted.get(token[1:].decode('ascii', errors='replace'))
+                    if signal is not None:
+                        signal.times.append(time)
+                        if signal.is_scalar:
+                            signal.raw_values.append(token[0] | 0x20)  # lower-case x/z
+                        else:
+                            signal.raw_values.append(first.lower())
+                elif first in b'bBrR':
+                    pending_vector = token[1:].lower()
+                elif first == b'$':
+                    # $dumpvars/$dumpall/$dumpon/$dumpoff/$end only bracket value
+                    # changes; $comment blocks are skipped entirely
+                    in_comment = token == b'$comment'
+        return time
@@ -10,48 +10,147 @@ simulation, and visualization tasks.
 Features:
 - Compile and simulate Verilog files using iverilog/vvp
 - Capture terminal output as screenshots using termshot
-- Generate waveform plots from VCD files using vcdvcd and matplotlib
+- Generate waveform plots from VCD files using a streaming VCD reader and matplotlib
 - Configuration via JSON files for easy project management
+- Optional parallel processing of files across a process pool
+- Content-addressed build cache so unchanged files skip every stage
+- Single-run mode that renders the terminal image from the simulation transcript
+- Level-of-detail waveform rendering bounded by image width, not signal activity
+- Time-window, signal-pattern and scope-depth selection for waveform plots
+- Persistent, memory-mapped VCD sidecar index for instant re-plots
+- Reusable waveform figure templates with a precomputed fixed layout
+- PNG/SVG/PDF/WebP output with configurable DPI and preview/publication profiles
+- Per-stage timing, CPU and memory instrumentation with a JSON/CSV run report
+- Toolchain registry that resolves and version-checks external tools once per run
+- Multi-file compilation units, library sources and batch compilation of shared units
+- Asyncio tool execution with per-stage/per-file timeouts and process-tree kill
+- Watch mode that reruns only the entries affected by a source or include change
+- Lazy loading of matplotlib/NumPy and --stages selection for fast compile-only runs
+- Distributed coordinator/worker runs over a SQLite work queue with retries and heartbeats
+- Verilog source scanner resolving the dump file and module and validating configs up front
+- Signal-level VCD query API and CLI (vcd_query.py) for waveform checks without rendering
+- Compact gzip/zstd VCD and FST dumps, read as streams, with a convert-in-place mode
+- Define/plusarg/seed sweeps compiled once per define set and simulated concurrently
+- Built-in parallel, incremental submission bundler (--bundle) reusing unchanged archive members
+- Dependency-tracked incremental Typst report builds (--typst) with pixel-stable image outputs
 
 Author: Adheesh Trivedi
 """
 
 import json
+import multiprocessing
 import os
+import shutil
+import socket
+import tempfile
+import threading
+import uuid
+import io
 import sys
-import subprocess
-import platform
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 import argparse
-import shutil
-
-try:
-    import matplotlib
-    matplotlib.use('Agg')  # Use non-interactive backend
-    import matplotlib.pyplot as plt
-    from matplotlib.figure import Figure
-except ImportError:
-    print("Error: matplotlib not found. Please install: pip install matplotlib")
-    sys.exit(1)
-
-try:
-    from vcdvcd import VCDVCD
-except ImportError:
-    print("Error: vcdvcd not found. Please install: pip install vcdvcd")
-    sys.exit(1)
+import fnmatch
+import re
+import time
+
+# matplotlib and NumPy (term_render, vcd_index, waveform_plot) are imported on
+# first use, so compile-only runs and plot: false entries never load them
+from plot_settings import IMAGE_FORMATS, LOD_MODES, OUTPUT_PROFILES, PLOT_DPI
+from build_cache import BuildCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_SIZE_MB, find_includes
+from run_report import RunReport
+from toolchain import Toolchain
+from process_runner import DEFAULT_TIMEOUTS, CommandResult, run_command, set_process_limit
+from file_watcher import POLL_INTERVAL, FileWatcher
+from verilog_scan import SourceScanner
+from sweep import define_flags, expand_sweeps, normalize_defines, normalize_plusargs, sweep_matrices, variant_label
+from bundle import DEFAULT_LEVEL, build_archive, collect_folder, print_summary
+from report_build import ReportBuilder, print_results, replace_if_changed, scan_document
+from dump_formats import (DUMP_FORMATS, convert_dump, detect_format, dump_name, format_size, savings,
+                          uncompressed_size)
+from work_queue import (DONE, HEARTBEAT_INTERVAL, MAX_ATTEMPTS, RUNNING, WORKER_TIMEOUT, WorkQueue, pack_artifacts,
+                        unpack_artifacts)
+
+# Pipeline stages selectable with --stages / "stages", in execution order
+STAGES = ('compile', 'simulate', 'terminal', 'plot')
+
+# Where --typst writes each report's PDF (see report_build.ReportBuilder)
+REPORT_OUTPUT = '{folder}/{stem}.pdf'
+
+
+def _signal_pattern_matches(name: str, pattern: str) -> bool:
+    """Match a signal name against an exact name, a '*'/'?' glob or a 're:' regex."""
+    if pattern.startswith('re:'):
+        return re.fullmatch(pattern[3:], name) is not None
+    if name == pattern:
+        return True
+    if '*' in pattern or '?' in pattern:
+        # Brackets are literal (bit ranges such as Q[2:0]), not glob classes
+        return fnmatch.fnmatchcase(name, pattern.replace('[', '[[]'))
+    return False
+
+
+def select_signals(signals: List[str], module: str = "TEST", variables: Optional[List[str]] = None,
+                   depth: Optional[int] = 0) -> Dict[str, str]:
+    """
+    Choose the signals to plot from a dump's hierarchical references.
+
+    Args:
+        signals: Hierarchical references declared in the VCD
+        module: Module name (or dotted scope) whose signals are plotted
+        variables: Names, globs or 're:' regexes to keep (None for all)
+        depth: Hierarchy levels below the module to include (None or negative for all)
+
+    Returns:
+        Mapping of display name (relative to the module) to hierarchical reference
+    """
+    selected = {}
+    for signal_name in signals:
+        if signal_name.startswith(f"{module}.") or module == "TEST":
+            clean_name = signal_name.replace(f"{module}.", "", 1) if signal_name.startswith(f"{module}.") else signal_name
+            if depth is not None and depth >= 0 and clean_name.count('.') > depth:
+                continue  # Skip signals deeper in the hierarchy
+            if variables is None or any(_signal_pattern_matches(clean_name, pattern) for pattern in variables):
+                selected[clean_name] = signal_name
+    return selected
 
 
 class VerilogAutomation:
     """Main class for Verilog automation framework."""
 
-    def __init__(self, config_file: str, workspace_root: Optional[str] = None):
+    def __init__(self, config_file: str, workspace_root: Optional[str] = None,
+                 cache_dir: Optional[str] = None, cache_size_mb: float = DEFAULT_CACHE_SIZE_MB,
+                 use_cache: bool = True, force: bool = False, single_run: Optional[bool] = None,
+                 overrides: Optional[Dict] = None, use_index: Optional[bool] = None,
+                 report_file: Optional[str] = None, profile_dir: Optional[str] = None,
+                 batch: Optional[bool] = None, typst: Optional[bool] = None):
         """
         Initialize the automation framework.
 
         Args:
             config_file: Path to JSON configuration file
             workspace_root: Root directory for the workspace (default: current directory)
+            cache_dir: Build cache directory (default: <workspace>/.verilog_cache)
+            cache_size_mb: Build cache size cap in megabytes
+            use_cache: Whether to use the build cache at all
+            force: Rebuild every stage, ignoring (but refreshing) cached results
+            single_run: Run each simulation once and render the terminal image from
+                its transcript instead of re-running it under termshot
+                (default: the config's 'single_run' field, else False)
+            overrides: Per-file options (e.g. from the command line) that take
+                precedence over the config, such as 'lod', 'start_time',
+                'end_time', 'variables', 'depth', 'timeout' and 'file_timeout'
+            use_index: Whether to keep a sidecar index next to each VCD
+                (default: the config's 'index' field, else True)
+            report_file: Write the per-stage run report here (JSON, or CSV for
+                a '.csv' path; None to only print stage totals)
+            profile_dir: Write cProfile output of the Python stages here
+            batch: Compile each compilation unit shared by several entries only
+                once (default: the config's 'batch' field, else False)
+            typst: Rebuild the Typst reports whose inputs changed after each run
+                (default: whether the config has a 'typst' field)
         """
         self.workspace_root = Path(workspace_root) if workspace_root else Path.cwd()
         self.config_file = Path(config_file)
@@ -64,6 +163,40 @@ class VerilogAutomation:
         # Create imgs folder if it doesn't exist
         self.imgs_folder.mkdir(parents=True, exist_ok=True)
 
+        # When True, child process output is captured and re-printed so that it
+        # lands in the (possibly redirected) sys.stdout instead of the raw fd.
+        self.buffer_output = False
+
+        # Build cache
+        self.force = force
+        self.cache = None
+        self.cache_dir = cache_dir  # as given (None for the default), forwarded to workers
+        self.cache_size_mb = cache_size_mb
+        if use_cache:
+            self.cache = BuildCache(Path(cache_dir) if cache_dir else self.workspace_root / DEFAULT_CACHE_DIR,
+                                    cache_size_mb)
+
+        # External tools, resolved once per run (persisted next to the build cache)
+        self.toolchain = Toolchain(self.cache.cache_dir / 'toolchain.json' if self.cache else None)
+
+        # Verilog source scans ($dumpfile, $dumpvars, top modules), cached by content hash
+        self.scanner = SourceScanner(self.cache.cache_dir / 'scan.json' if self.cache else None)
+
+        self.single_run = self.config.get('single_run', False) if single_run is None else single_run
+        self.use_index = self.config.get('index', True) if use_index is None else use_index
+        self.batch = self.config.get('batch', False) if batch is None else batch
+        self.typst = bool(self.config.get('typst', False)) if typst is None else typst
+        self._batch_units: Dict[str, Tuple[str, Optional[str], bool]] = {}
+        self._started = time.perf_counter()
+        self.overrides = {key: value for key, value in (overrides or {}).items() if value is not None}
+
+        # Command timeouts (re-resolved per file by process_file)
+        self._resolve_timeouts({})
+
+        # Per-stage instrumentation
+        self.report_file = Path(report_file).resolve() if report_file else None
+        self.report = RunReport(Path(profile_dir).resolve() if profile_dir else None)
+
         print(f"Workspace root: {self.workspace_root}")
         print(f"Assignment folder: {self.assignment_folder}")
         print(f"Images folder: {self.imgs_folder}")
@@ -80,54 +213,522 @@ class VerilogAutomation:
             if 'files' not in config:
                 raise ValueError("Config must contain 'files' field")
 
+            # Sweep entries run as one entry per variant
+            config['files'] = expand_sweeps(config['files'])
             return config
         except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file not found: {self.config_file}")
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in configuration file: {e}")
 
-    def _run_command(self, command: List[str], cwd: Optional[Path] = None, capture_output: bool = True) -> subprocess.CompletedProcess:
+    def _file_option(self, file_config: Dict, key: str, default=None):
+        """
+        Resolve a per-file option.
+
+        Precedence: overrides (command line), the file entry, the config's
+        top level, then the given default.
+
+        Args:
+            file_config: File configuration dictionary
+            key: Option name
+            default: Value used when the option is not set anywhere
+
+        Returns:
+            Resolved option value
+        """
+        if key in self.overrides:
+            return self.overrides[key]
+        if key in file_config:
+            return file_config[key]
+        return self.config.get(key, default)
+
+    @staticmethod
+    def _lod_mode(value: Union[str, bool]) -> str:
+        """Normalize a level-of-detail setting (JSON booleans map to 'on'/'off')."""
+        if isinstance(value, bool):
+            return 'on' if value else 'off'
+        if value not in LOD_MODES:
+            raise ValueError(f"Invalid lod mode '{value}' (expected one of {', '.join(LOD_MODES)})")
+        return value
+
+    def _dump_format(self, file_config: Dict) -> str:
+        """Storage format of a file entry's waveform dump ('dump_format', default: plain VCD)."""
+        dump_format = str(self._file_option(file_config, 'dump_format', 'vcd')).lower().lstrip('.')
+        if dump_format not in DUMP_FORMATS:
+            raise ValueError(f"Invalid dump format '{dump_format}' (expected one of {', '.join(DUMP_FORMATS)})")
+        return dump_format
+
+    def _stages(self, file_config: Dict) -> Set[str]:
+        """
+        Pipeline stages to run for a file entry ('stages', default: all).
+
+        Skipped stages reuse whatever their outputs already are on disk, e.g.
+        ["plot"] re-renders from the existing VCD.
+
+        Args:
+            file_config: File configuration dictionary
+
+        Returns:
+            Selected stage names
+        """
+        stages = self._file_option(file_config, 'stages') or list(STAGES)
+        if isinstance(stages, str):
+            stages = [stage.strip() for stage in stages.split(',') if stage.strip()]
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Invalid stage(s) {', '.join(sorted(unknown))} (expected any of {', '.join(STAGES)})")
+        return set(stages)
+
+    def _output_settings(self, file_config: Dict) -> Dict:
+        """
+        Resolve image format, resolution and render profile for a file.
+
+        The profile supplies defaults; explicit 'format' and 'dpi' options
+        override it.
+
+        Args:
+            file_config: File configuration dictionary
+
+        Returns:
+            Dictionary with 'format', 'dpi', 'terminal_dpi', 'annotate' and 'antialias'
+        """
+        profile = self._file_option(file_config, 'image_profile', 'default')
+        if profile not in OUTPUT_PROFILES:
+            raise ValueError(f"Invalid image profile '{profile}' (expected one of {', '.join(OUTPUT_PROFILES)})")
+        settings = dict(OUTPUT_PROFILES[profile])
+
+        image_format = str(self._file_option(file_config, 'format', settings['format'])).lower().lstrip('.')
+        if image_format not in IMAGE_FORMATS:
+            raise ValueError(f"Invalid image format '{image_format}' (expected one of {', '.join(IMAGE_FORMATS)})")
+        settings['format'] = image_format
+
+        dpi = int(self._file_option(file_config, 'dpi', settings['dpi']))
+        if dpi <= 0:
+            raise ValueError(f"Invalid dpi {dpi} (must be positive)")
+        settings['dpi'] = dpi
+        return settings
+
+    @staticmethod
+    def _report_image(message: str, output_path: Path, started: float) -> None:
+        """Print a success line with the image's file size and render time."""
+        size = output_path.stat().st_size
+        print(f"✓ {message}: {output_path} ({size / 1024:.1f} KB, {time.perf_counter() - started:.2f}s)")
+
+    @staticmethod
+    def _staging_image(output_path: Path) -> Path:
+        """Scratch file an image is rendered to before _publish_image() (same extension, so the format is kept)."""
+        return output_path.with_name(f".{output_path.stem}.{os.getpid()}{output_path.suffix}")
+
+    def _publish_image(self, message: str, staged: Path, output_path: Path, started: float) -> None:
+        """
+        Move a rendered image into place, keeping the existing file when its pixels are unchanged.
+
+        An unchanged image keeps its modification time, so the Typst report
+        build does not recompile documents that embed it.
+        """
+        if not replace_if_changed(staged, output_path):
+            message += " (pixels unchanged, kept existing file)"
+        self._report_image(message, output_path, started)
+
+    def _resolve_timeouts(self, file_config: Dict) -> None:
+        """
+        Set the per-stage timeouts and the time budget for processing a file.
+
+        'timeout' is either a number of seconds for every stage or a mapping
+        of stage ('compile', 'simulate', 'terminal') to seconds; null disables
+        a limit. 'file_timeout' bounds the whole entry.
+
+        Args:
+            file_config: File configuration dictionary
         """
-        Run a shell command with proper error handling.
+        timeout = self._file_option(file_config, 'timeout')
+        self._timeouts = dict(DEFAULT_TIMEOUTS)
+        if isinstance(timeout, dict):
+            self._timeouts.update(timeout)
+        elif timeout is not None:
+            self._timeouts = {stage: timeout for stage in DEFAULT_TIMEOUTS}
+
+        file_timeout = self._file_option(file_config, 'file_timeout')
+        self._deadline = time.monotonic() + file_timeout if file_timeout else None
+
+    def _time_left(self) -> Optional[float]:
+        """Seconds left in the current file's time budget (None if unlimited)."""
+        return None if self._deadline is None else self._deadline - time.monotonic()
+
+    def _run_command(self, command: List[str], cwd: Optional[Path] = None, capture_output: bool = True,
+                     stage: Optional[str] = None) -> CommandResult:
+        """
+        Run an external command with a timeout and proper error handling.
+
+        Output is read concurrently from both pipes and always captured; unless
+        capture_output is set it is also echoed as it arrives. On timeout the
+        whole process tree is killed and the result is marked timed_out.
 
         Args:
             command: Command as list of strings
             cwd: Working directory
-            capture_output: Whether to capture stdout/stderr
+            capture_output: Only capture stdout/stderr instead of also echoing them
+            stage: Pipeline stage whose timeout applies ('compile', 'simulate', 'terminal')
 
         Returns:
-            CompletedProcess object
+            CommandResult (compatible with subprocess.CompletedProcess)
         """
         try:
             if cwd is None:
                 cwd = self.assignment_folder
 
+            timeout = self._timeouts.get(stage)
+            time_left = self._time_left()
+            if time_left is not None:
+                if time_left <= 0:
+                    print(f"✗ File time budget exhausted, not running: {' '.join(command)}")
+                    return CommandResult(command, -1, '', '', timed_out=True)
+                timeout = time_left if timeout is None else min(timeout, time_left)
+
             print(f"Running: {' '.join(command)} (in {cwd})")
 
-            result = subprocess.run(
-                command,
-                cwd=cwd,
-                capture_output=capture_output,
-                text=True,
-                check=False
-            )
+            echo_stdout = echo_stderr = None
+            if not capture_output:
+                echo_stdout = lambda text: print(text, end='', flush=True)
+                # Keep stderr in this file's log buffer when buffering
+                echo_stderr = echo_stdout if self.buffer_output else sys.stderr.write
 
-            if result.returncode != 0:
+            result = run_command(command, cwd=str(cwd), timeout=timeout,
+                                 echo_stdout=echo_stdout, echo_stderr=echo_stderr)
+
+            if result.timed_out:
+                print(f"✗ Command timed out after {timeout:.1f}s; killed its process tree")
+            elif result.returncode != 0:
                 print(f"Command failed with return code {result.returncode}")
-                if result.stderr:
+                if result.stderr and capture_output:
                     print(f"Error: {result.stderr}")
 
             return result
         except FileNotFoundError:
             raise FileNotFoundError(f"Command not found: {command[0]}. Please ensure it's installed and in PATH.")
 
-    def compile_verilog(self, verilog_files: List[str], output_name: str) -> bool:
+    def _resolve_tools(self) -> None:
+        """Resolve and version-check the external tools this run needs."""
+        stages = self._stages({})
+        names = ['iverilog', 'vvp'] + ([] if self.single_run or 'terminal' not in stages else ['termshot'])
+        for name in names:
+            tool = self.toolchain.resolve(name)
+            print(f"Toolchain: {name}: {tool.version}" + (f" ({tool.path})" if tool.available else ""))
+        self.toolchain.save()
+
+    def _source_dependencies(self, verilog_files: List[str], include_dirs: Optional[List[str]] = None) -> List[Path]:
+        """
+        Resolve Verilog sources and their `include dependencies.
+
+        Args:
+            verilog_files: Verilog sources relative to the assignment folder
+            include_dirs: Extra `include search directories (iverilog -I)
+
+        Returns:
+            Source paths followed by every included file
+        """
+        sources = [self.assignment_folder / vfile for vfile in verilog_files]
+        search_dirs = [self.assignment_folder] + [self.assignment_folder / d for d in include_dirs or []]
+        dependencies = list(sources)
+        for source in sources:
+            for include in find_includes(source, search_dirs):
+                if include not in dependencies:
+                    dependencies.append(include)
+        return dependencies
+
+    def _compile_unit(self, file_config: Dict) -> Dict:
+        """
+        Describe the compilation unit of a file entry.
+
+        The entry's 'name' is compiled together with its optional 'sources';
+        library directories/files, include directories and the top module can
+        be set per entry or at the config's top level, as can 'defines'
+        (macros passed to iverilog -D).
+
+        Args:
+            file_config: File configuration dictionary
+
+        Returns:
+            Dictionary with 'sources', 'library_dirs', 'library_files',
+            'include_dirs', 'top' and 'defines'
+        """
+        return {
+            'sources': [file_config['name']] + list(file_config.get('sources') or []),
+            'library_dirs': list(self._file_option(file_config, 'library_dirs') or []),
+            'library_files': list(self._file_option(file_config, 'library_files') or []),
+            'include_dirs': list(self._file_option(file_config, 'include_dirs') or []),
+            'top': self._file_option(file_config, 'top'),
+            'defines': normalize_defines(self._file_option(file_config, 'defines')),
+        }
+
+    def _unit_dependencies(self, unit: Dict) -> List[Path]:
+        """
+        Every file whose content can change a compilation unit's output.
+
+        Args:
+            unit: Compilation unit from _compile_unit()
+
+        Returns:
+            Sources, library files, candidate modules in library directories
+            and all resolved includes
+        """
+        files = unit['sources'] + unit['library_files']
+        for directory in unit['library_dirs']:
+            files += [str(path) for path in sorted((self.assignment_folder / directory).glob('*.v'))]
+        return self._source_dependencies(files, unit['include_dirs'])
+
+    def _compile_stage(self, unit: Dict, vvp_file: str) -> Tuple[bool, Optional[str]]:
+        """
+        Compile a unit through the build cache.
+
+        Args:
+            unit: Compilation unit from _compile_unit()
+            vvp_file: Output VVP file name
+
+        Returns:
+            Tuple of (success flag, compile cache key or None when uncached)
+        """
+        key = None
+        if self.cache is not None:
+            dependencies = self._unit_dependencies(unit)
+            if all(dependency.exists() for dependency in dependencies):
+                key = BuildCache.key('compile', vvp_file, unit, *dependencies,
+                                     self.toolchain.version('iverilog'))
+        success = self._cached_stage('Compile', key, [self.assignment_folder / vvp_file],
+                                     lambda: self.compile_verilog(unit['sources'], Path(vvp_file).stem,
+                                                                  unit['library_dirs'], unit['library_files'],
+                                                                  unit['include_dirs'], unit['top'],
+                                                                  unit['defines']),
+                                     'compile')
+        return success, key
+
+    def _compile_batches(self, entries: Optional[List[Dict]] = None) -> None:
+        """
+        Compile each unit shared by several entries once, up front.
+
+        Entries with an identical compilation unit (sources, libraries,
+        include directories, top module and defines) then simulate the same
+        VVP file. Sweep variants are always grouped (once per define set),
+        other entries only in batch mode.
+
+        Args:
+            entries: File entries about to be processed (default: all)
+        """
+        groups: Dict[str, List[Dict]] = {}
+        for file_config in self.config['files'] if entries is None else entries:
+            if not (self.batch or 'variant' in file_config):
+                continue
+            if 'name' in file_config and 'compile' in self._stages(file_config):
+                unit = self._compile_unit(file_config)
+                groups.setdefault(json.dumps(unit, sort_keys=True), []).append(file_config)
+
+        for entries in groups.values():
+            if len(entries) < 2:
+                continue
+            unit = self._compile_unit(entries[0])
+            vvp_file = self._vvp_name(entries[0])
+            print(f"\n=== Batch compile: {vvp_file} shared by {len(entries)} entries ===")
+            record = self.report.start_file(f"[batch] {vvp_file}")
+            success, key = self._compile_stage(unit, vvp_file)
+            record['success'] = success
+            for file_config in entries:
+                self._batch_units[self._output_name(file_config)] = (vvp_file, key, success)
+
+    def _dump_file(self, file_config: Dict) -> str:
+        """VCD an entry's simulation writes, relative to the assignment folder (inside its 'run_dir', if any)."""
+        dumpfile = self._inspect_entry(file_config)['vcd_file']
+        return f"{file_config['run_dir']}/{dumpfile}" if file_config.get('run_dir') else dumpfile
+
+    def _output_files(self, file_config: Dict, image_format: str) -> Dict[str, Optional[str]]:
+        """
+        File names an entry produces.
+
+        Args:
+            file_config: File configuration dictionary
+            image_format: Image file extension
+
+        Returns:
+            Dictionary with 'dumpfile' (the VCD the simulation writes, inside
+            the entry's 'run_dir' if it has one), 'vcd' (the dump as stored,
+            e.g. 'q1.vcd.zst'), 'vvp' and 'transcript' (None unless
+            single-run), relative to the assignment folder, and 'terminal' and
+            'waveform', relative to the images folder
+        """
+        base_name = self._output_name(file_config)
+        dumpfile = self._dump_file(file_config)
+        return {
+            'dumpfile': dumpfile,
+            'vcd': dump_name(dumpfile, self._dump_format(file_config)),
+            'vvp': self._vvp_name(file_config),
+            'transcript': f"{base_name}.log" if self.single_run else None,
+            'terminal': f"{base_name}_terminal.{image_format}",
+            'waveform': f"{base_name}_waveform.{image_format}",
+        }
+
+    def _inspect_entry(self, file_config: Dict) -> Dict:
+        """
+        Resolve and check an entry's dump settings from its scanned sources.
+
+        'vcd_file' comes from the $dumpfile call (a different configured name
+        is overridden with a warning, since the simulation can only produce
+        the scanned one), 'module' from the config, else the $dumpvars scope,
+        the module calling $dumpfile or the single top module, and 'plot'
+        defaults to whether the unit calls $dumpfile at all.
+
+        Args:
+            file_config: File configuration dictionary
+
+        Returns:
+            Dictionary with 'vcd_file', 'module', 'plot', 'tops', 'errors'
+            (the entry cannot run) and 'warnings'
+        """
+        unit = self._compile_unit(file_config)
+        sources = [self.assignment_folder / source for source in unit['sources']]
+        libraries = [self.assignment_folder / library for library in unit['library_files']]
+        for directory in unit['library_dirs']:
+            libraries += sorted((self.assignment_folder / directory).glob('*.v'))
+        includes = self._source_dependencies(unit['sources'], unit['include_dirs'])[len(sources):]
+        scan = self.scanner.scan_unit(sources, libraries, includes)
+
+        errors = [f"Source not found: {path}" for path in scan['missing']]
+        warnings = []
+        resolved = [include.as_posix() for include in includes]
+        for name in scan['includes']:
+            if not any(path.endswith(name) for path in resolved):
+                errors.append(f"`include \"{name}\" not found (searched {self.assignment_folder}"
+                              + ''.join(f", {d}" for d in unit['include_dirs']) + ")")
+
+        vcd_file = file_config.get('vcd_file')
+        if scan['dumpfile'] and vcd_file and vcd_file != scan['dumpfile']:
+            warnings.append(f"vcd_file '{vcd_file}' does not match $dumpfile(\"{scan['dumpfile']}\"); "
+                            f"using '{scan['dumpfile']}'")
+        vcd_file = scan['dumpfile'] or vcd_file or f"{Path(file_config['name']).stem}.vcd"
+
+        tops = [unit['top']] if isinstance(unit['top'], str) else unit['top'] or scan['tops']
+        module = file_config.get('module')
+        if module is None:
+            module = (scan['dumpvars'][0] if scan['dumpvars'] else None) or scan['dump_module'] \
+                or (tops[0] if len(tops) == 1 else 'TEST')
+        elif tops and module.split('.')[0] not in tops:
+            warnings.append(f"module '{module}' is not a top-level module of the design "
+                            f"(tops: {', '.join(tops)})")
+
+        plot = file_config.get('plot')
+        if plot is None:
+            plot = scan['has_dumpfile'] or bool(scan['missing'])
+        elif plot and not scan['has_dumpfile'] and not scan['missing']:
+            warnings.append("plot is enabled but the sources never call $dumpfile")
+
+        return {'vcd_file': vcd_file, 'module': module, 'plot': plot, 'tops': tops,
+                'errors': errors, 'warnings': warnings}
+
+    def validate_config(self) -> int:
+        """
+        Check every entry against its scanned sources before any tool runs.
+
+        Returns:
+            Number of entries with errors (they fail without being compiled)
+        """
+        print(f"\n=== Validating configuration ===")
+        invalid = 0
+        for file_config in self.config['files']:
+            if 'name' not in file_config:
+                continue
+            entry = self._inspect_entry(file_config)
+            label = self._output_name(file_config)
+            for warning in entry['warnings']:
+                print(f"Warning: {label}: {warning}")
+            for error in entry['errors']:
+                print(f"✗ {label}: {error}")
+            invalid += bool(entry['errors'])
+        self.scanner.save()
+        valid = len(self.config['files']) - invalid
+        print(f"{'✓' if not invalid else '✗'} {valid}/{len(self.config['files'])} entries valid")
+        return invalid
+
+    @staticmethod
+    def _output_name(file_config: Dict) -> str:
+        """Base name of a file entry's outputs ('output_name', else the source's stem)."""
+        return Path(file_config.get('output_name') or file_config['name']).stem
+
+    @classmethod
+    def _profile_name(cls, file_config: Dict) -> str:
+        """Unique profile file prefix of an entry: its output name, or the source path without suffix."""
+        if file_config.get('output_name'):
+            return cls._output_name(file_config)
+        return Path(file_config['name']).with_suffix('').as_posix()
+
+    @classmethod
+    def _vvp_name(cls, file_config: Dict) -> str:
+        """VVP file of an entry (sweep variants share theirs per define set via 'compile_name')."""
+        return f"{file_config.get('compile_name') or cls._output_name(file_config)}.vvp"
+
+    def _measured(self, metric: str, action, profile: bool = False) -> bool:
+        """
+        Run a stage action under the run report's instrumentation.
+
+        Args:
+            metric: Stage name in the run report
+            action: Callable running the stage, returning True on success
+            profile: Run the action under cProfile when profiling is enabled
+
+        Returns:
+            The action's result
+        """
+        with self.report.stage(metric, profile) as record:
+            success = action()
+            record['ok'] = bool(success)
+        return success
+
+    def _cached_stage(self, stage: str, key: Optional[str], outputs: List[Path], action,
+                      metric: str, profile: bool = False) -> bool:
+        """
+        Run a pipeline stage through the build cache.
+
+        Args:
+            stage: Stage name used in log messages
+            key: Cache key of the stage (None disables caching for this call)
+            outputs: Artifacts the stage produces
+            action: Callable running the stage, returning True on success
+            metric: Stage name in the run report
+            profile: Run the action under cProfile when profiling is enabled
+
+        Returns:
+            True if the stage was restored from cache or ran successfully
+        """
+        time_left = self._time_left()
+        if time_left is not None and time_left <= 0:
+            print(f"\n=== {stage}: skipped, file time budget exhausted ===")
+            return False
+
+        if self.cache is None or key is None:
+            return self._measured(metric, action, profile)
+
+        if not self.force and self.cache.restore(key, outputs):
+            print(f"\n=== {stage}: up to date (cached {key[:12]}) ===")
+            self.report.cached(metric)
+            return True
+
+        if not self._measured(metric, action, profile):
+            return False
+        self.cache.store(key, outputs)
+        return True
+
+    def compile_verilog(self, verilog_files: List[str], output_name: str,
+                        library_dirs: Optional[List[str]] = None, library_files: Optional[List[str]] = None,
+                        include_dirs: Optional[List[str]] = None, top: Optional[Union[str, List[str]]] = None,
+                        defines: Optional[Dict[str, Optional[str]]] = None) -> bool:
         """
         Compile Verilog files using iverilog.
 
         Args:
             verilog_files: List of Verilog source files
             output_name: Output VVP file name (without extension)
+            library_dirs: Directories searched for undefined modules (iverilog -y)
+            library_files: Library files, only used for modules they define (iverilog -l)
+            include_dirs: `include search directories (iverilog -I)
+            top: Root module name(s) to elaborate (iverilog -s)
+            defines: Macros to define, name -> value or None (iverilog -D)
 
         Returns:
             True if compilation successful, False otherwise
@@ -135,23 +736,39 @@ class VerilogAutomation:
         print(f"\n=== Compiling Verilog files ===")
 
         # Check if iverilog is available
-        try:
-            subprocess.run(['iverilog', '-V'], capture_output=True, check=True)
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        iverilog = self.toolchain.resolve('iverilog')
+        if not iverilog.available:
             print("Error: iverilog not found. Please install Icarus Verilog.")
             return False
 
         # Verify all input files exist
-        for vfile in verilog_files:
+        for vfile in verilog_files + (library_files or []):
             file_path = self.assignment_folder / vfile
             if not file_path.exists():
                 print(f"Error: Verilog file not found: {file_path}")
                 return False
 
-        # Compile
+        # Compile into a staging file, so entries sharing a VVP file (sweep
+        # variants on several workers) never run a half-written one
         vvp_file = f"{output_name}.vvp"
-        command = ['iverilog', '-o', vvp_file] + verilog_files
-        result = self._run_command(command)
+        staging = f".{output_name}.{os.getpid()}.vvp"
+        command = [iverilog.command, '-o', staging]
+        for directory in include_dirs or []:
+            command += ['-I', directory]
+        for directory in library_dirs or []:
+            command += ['-y', directory]
+        for library in library_files or []:
+            command += ['-l', library]
+        for root in ([top] if isinstance(top, str) else top or []):
+            command += ['-s', root]
+        command += define_flags(defines or {})
+        command += verilog_files
+        result = self._run_command(command, stage='compile')
+        staging_path = self.assignment_folder / staging
+        if result.returncode == 0 and staging_path.exists():
+            os.replace(staging_path, self.assignment_folder / vvp_file)
+        elif staging_path.exists():
+            staging_path.unlink()
 
         if result.returncode == 0:
             print(f"✓ Compilation successful: {vvp_file}")
@@ -160,12 +777,22 @@ class VerilogAutomation:
             print(f"✗ Compilation failed")
             return False
 
-    def simulate_verilog(self, vvp_file: str) -> bool:
+    def simulate_verilog(self, vvp_file: str, transcript_file: Optional[str] = None,
+                         dump_file: Optional[str] = None, dump_format: str = 'vcd',
+                         plusargs: Optional[List[str]] = None, run_dir: Optional[str] = None) -> bool:
         """
         Simulate Verilog using vvp.
 
         Args:
             vvp_file: VVP file to simulate
+            transcript_file: If given, the simulation output is also saved to this
+                file (relative to the assignment folder) for later rendering
+            dump_file: Dump the simulation writes ($dumpfile name)
+            dump_format: Storage format of the dump; FST is written by vvp
+                itself (-fst), compressed VCD is compressed once the run ends
+            plusargs: Run-time arguments for the testbench ($test$plusargs, $value$plusargs)
+            run_dir: Directory to run in (relative to the assignment folder),
+                so concurrent runs of one testbench write separate dumps
 
         Returns:
             True if simulation successful, False otherwise
@@ -173,9 +800,8 @@ class VerilogAutomation:
         print(f"\n=== Running simulation ===")
 
         # Check if vvp is available
-        try:
-            subprocess.run(['vvp', '-V'], capture_output=True, check=True)
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        vvp = self.toolchain.resolve('vvp')
+        if not vvp.available:
             print("Error: vvp not found. Please install Icarus Verilog.")
             return False
 
@@ -185,23 +811,72 @@ class VerilogAutomation:
             return False
 
         # Run simulation
-        command = ['vvp', vvp_file]
-        result = self._run_command(command, capture_output=False)
-
-        if result.returncode == 0:
-            print(f"✓ Simulation completed successfully")
-            return True
+        cwd = self.assignment_folder / run_dir if run_dir else self.assignment_folder
+        cwd.mkdir(parents=True, exist_ok=True)
+        command = [vvp.command, os.path.relpath(vvp_path, cwd)] + (['-fst'] if dump_format == 'fst' else [])
+        command += plusargs or []
+        if transcript_file:
+            # Echoed live and captured in the same pass
+            result = self._run_command(command, cwd=cwd, capture_output=False, stage='simulate')
+            transcript = (result.stdout or '') + (result.stderr or '')
+            (self.assignment_folder / transcript_file).write_text(transcript)
         else:
+            result = self._run_command(command, cwd=cwd, capture_output=False, stage='simulate')
+
+        if result.timed_out:
+            print(f"✗ Simulation timed out (does the testbench reach $finish?)")
+            return False
+        if result.returncode != 0:
             print(f"✗ Simulation failed")
             return False
+        print(f"✓ Simulation completed successfully")
+        if dump_file and dump_format != 'vcd':
+            return self.store_dump(dump_file, dump_format)
+        return True
 
-    def capture_terminal_output(self, vvp_file: str, output_image: str) -> bool:
+    def store_dump(self, dump_file: str, dump_format: str) -> bool:
+        """
+        Move a freshly written dump into its storage format.
+
+        vvp writes FST under the $dumpfile name, so an FST dump is only
+        renamed; a plain VCD is compressed (or converted with vcd2fst) and
+        deleted.
+
+        Args:
+            dump_file: Dump written by the simulation (relative to the assignment folder)
+            dump_format: Storage format
+
+        Returns:
+            True if the dump is stored (or the simulation wrote none), False otherwise
+        """
+        written = self.assignment_folder / dump_file
+        target = self.assignment_folder / dump_name(dump_file, dump_format)
+        if not written.exists():
+            return True  # the testbench does not dump
+        try:
+            stored = convert_dump(written, target, dump_format)
+        except (OSError, ValueError) as e:
+            print(f"✗ Could not store {dump_file} as {dump_format}: {e}")
+            return False
+        print(f"✓ Dump stored as {target.name}: {savings(stored['vcd_bytes'], stored['dump_bytes'])}")
+        return True
+
+    def capture_terminal_output(self, vvp_file: str, output_image: str, dpi: int = 150,
+                                dump: bool = True, plusargs: Optional[List[str]] = None,
+                                run_dir: Optional[str] = None) -> bool:
         """
         Capture terminal output using termshot executable.
 
+        termshot always writes PNG; other output formats are converted from it.
+
         Args:
             vvp_file: VVP file to run
             output_image: Output image file name
+            dpi: Resolution used when converting to another format
+            dump: Let this second run write the waveform dump (False passes
+                vvp -none, so a compact dump is not joined by a plain VCD)
+            plusargs: Run-time arguments for the testbench
+            run_dir: Directory to run in (relative to the assignment folder)
 
         Returns:
             True if capture successful, False otherwise
@@ -209,13 +884,10 @@ class VerilogAutomation:
         print(f"\n=== Capturing terminal output ===")
 
         # Check if termshot executable is available
-        termshot_cmd = 'termshot'
-        if platform.system() == 'Windows':
-            # On Windows, check for termshot.exe
-            termshot_cmd = 'termshot.exe'
+        termshot = self.toolchain.resolve('termshot')
 
-        if not shutil.which(termshot_cmd):
-            print(f"Warning: {termshot_cmd} not found in PATH.")
+        if not termshot.available:
+            print(f"Warning: {termshot.command} not found in PATH.")
             print("Please install termshot from: https://github.com/homeport/termshot")
             print("Skipping terminal screenshot capture.")
             return False
@@ -226,19 +898,30 @@ class VerilogAutomation:
             return False
 
         output_path = self.imgs_folder / output_image
+        staged = self._staging_image(output_path)
+        screenshot_path = staged if staged.suffix == '.png' else output_path.with_suffix('.termshot.png')
+        started = time.perf_counter()
 
-        # Change to assignment folder for proper paths
+        # Change to assignment folder (or the entry's run directory) for proper paths
+        cwd = self.assignment_folder / run_dir if run_dir else self.assignment_folder
         original_cwd = os.getcwd()
         try:
-            os.chdir(self.assignment_folder)
+            cwd.mkdir(parents=True, exist_ok=True)
+            os.chdir(cwd)
 
             # Use termshot to capture terminal output
             # Run vvp command and capture its output as a screenshot
-            command = [termshot_cmd, '--filename', str(output_path), '-c', '--', 'vvp', vvp_file]
+            command = [termshot.command, '--filename', str(screenshot_path), '-c', '--',
+                       self.toolchain.resolve('vvp').command, os.path.relpath(vvp_path, cwd)]
+            command += ([] if dump else ['-none']) + (plusargs or [])
 
-            result = self._run_command(command)
+            result = self._run_command(command, cwd=cwd, stage='terminal')
             if result.returncode == 0:
-                print(f"✓ Terminal output captured: {output_path}")
+                if screenshot_path != staged:
+                    from term_render import convert_image
+                    convert_image(screenshot_path, staged, dpi=dpi)
+                    screenshot_path.unlink()
+                self._publish_image("Terminal output captured", staged, output_path, started)
                 return True
             else:
                 print(f"✗ Failed to capture terminal output")
@@ -251,17 +934,77 @@ class VerilogAutomation:
             return False
         finally:
             os.chdir(original_cwd)
+            for scratch in (staged, screenshot_path):
+                if scratch.exists():
+                    scratch.unlink()
+
+    def render_terminal_transcript(self, transcript_file: str, vvp_file: str, output_image: str,
+                                   dpi: int = 150, antialias: bool = True,
+                                   plusargs: Optional[List[str]] = None) -> bool:
+        """
+        Render a saved simulation transcript as a terminal screenshot.
+
+        Args:
+            transcript_file: Transcript written by simulate_verilog
+            vvp_file: VVP file that produced the transcript (shown as the command)
+            output_image: Output image file name (format taken from the extension)
+            dpi: Output resolution
+            antialias: Antialias text and window shapes
+            plusargs: Run-time arguments of the simulation (shown in the command)
+
+        Returns:
+            True if rendering successful, False otherwise
+        """
+        print(f"\n=== Rendering terminal output ===")
+
+        transcript_path = self.assignment_folder / transcript_file
+        if not transcript_path.exists():
+            print(f"Error: Transcript not found: {transcript_path}")
+            return False
+
+        output_path = self.imgs_folder / output_image
+        staged = self._staging_image(output_path)
+        started = time.perf_counter()
+        try:
+            from term_render import render_transcript
+            render_transcript(transcript_path.read_text(), staged, command=' '.join(['vvp', vvp_file] + (plusargs or [])),
+                              dpi=dpi, antialias=antialias)
+            self._publish_image("Terminal output rendered", staged, output_path, started)
+            return True
+        except ImportError as e:
+            print(f"Error: {e.name} not found. Please install: pip install {e.name}")
+            return False
+        except Exception as e:
+            print(f"Error rendering terminal transcript: {e}")
+            return False
+        finally:
+            if staged.exists():
+                staged.unlink()
 
     def plot_vcd(self, vcd_file: str, variables: Optional[List[str]] = None,
-                 module: str = "TEST", output_image: str = "waveform.png") -> bool:
+                 module: str = "TEST", output_image: str = "waveform.png",
+                 lod: str = 'auto', start_time: Optional[Union[str, int]] = None,
+                 end_time: Optional[Union[str, int]] = None, depth: Optional[int] = 0,
+                 dpi: int = PLOT_DPI, annotate: bool = True, antialias: bool = True) -> bool:
         """
-        Generate waveform plots from VCD file using vcdvcd and matplotlib.
+        Generate waveform plots from VCD file using the streaming VCD reader and matplotlib.
 
         Args:
             vcd_file: VCD file to plot
-            variables: List of variables to plot (None for all)
-            module: Module name to extract signals from
-            output_image: Output image file name
+            variables: Variables to plot (None for all); entries may be exact
+                names, globs using '*'/'?', or regexes prefixed with 're:'
+            module: Module name (or dotted scope) to extract signals from
+            output_image: Output image file name (format taken from the extension)
+            lod: Level-of-detail mode: 'on' decimates transitions to the image
+                width and only annotates segments wide enough for their text,
+                'off' draws every transition, 'auto' decimates only signals with
+                more transitions than the plot has pixels
+            start_time: Start of the plotted window (dump ticks, or with a unit such as '200ns')
+            end_time: End of the plotted window (dump ticks, or with a unit)
+            depth: Hierarchy levels below the module to include (None for all)
+            dpi: Output resolution
+            annotate: Draw value labels on the traces
+            antialias: Antialias traces, bands and text
 
         Returns:
             True if plotting successful, False otherwise
@@ -273,156 +1016,51 @@ class VerilogAutomation:
             print(f"Error: VCD file not found: {vcd_path}")
             return False
 
+        output_path = self.imgs_folder / output_image
+        staged = self._staging_image(output_path)
+        started = time.perf_counter()
         try:
-            # Load VCD file
-            vcd = VCDVCD(str(vcd_path))
-
-            # Get all signals for the specified module
-            module_signals = {}
-
-            # vcd.signals is a list of signal names
-            # vcd.data contains the actual time-value data keyed by signal identifiers
-            # We need to map signal names to their data
-
-            for signal_name in vcd.signals:
-                if signal_name.startswith(f"{module}.") or module == "TEST":
-                    clean_name = signal_name.replace(f"{module}.", "") if signal_name.startswith(f"{module}.") else signal_name
-                    if '.' in clean_name:
-                        continue  # Skip hierarchical signals
-                    if variables is None or clean_name in variables:
-                        # Find the signal identifier for this signal name
-                        if signal_name in vcd.references_to_ids:
-                            signal_id = vcd.references_to_ids[signal_name]
-                            if signal_id in vcd.data:
-                                module_signals[clean_name] = vcd.data[signal_id]
+            from vcd_index import open_vcd
+            from waveform_plot import draw_waveform, save_waveform
+
+            # Serve from the sidecar index (built on first full plot); windowed
+            # plots of an unindexed dump stream only the window instead
+            windowed = start_time is not None or end_time is not None
+            with self.report.stage('vcd_load', profile=True):
+                vcd = open_vcd(vcd_path, use_index=self.use_index, build=not windowed)
+
+                # Map display names to hierarchical references for the specified module
+                selected = select_signals(vcd.signals, module, variables, depth)
+
+                # Load only the selected signals, skipping data outside the window
+                loaded = vcd.load(selected.values(), start=start_time, end=end_time)
+                module_signals = {clean_name: loaded[signal_name]
+                                  for clean_name, signal_name in selected.items() if signal_name in loaded}
+            self.report.note(signals=len(module_signals),
+                             transitions=sum(len(signal.arrays()) for signal in module_signals.values()))
 
             if not module_signals:
                 print(f"Warning: No signals found for module '{module}' in VCD file")
                 print(f"Available signals: {vcd.signals}")
                 return False
 
-            # Create subplot for each signal with GTKWave-like styling
-            num_signals = len(module_signals)
-
-            # Set up GTKWave-like dark theme
-            plt.style.use('dark_background')
-            fig, axes = plt.subplots(num_signals, 1, figsize=(12, .8 * num_signals),
-                                   sharex=True, squeeze=False)
-            fig.patch.set_facecolor('#BBBBBB')  # Greyish white background outside plot area
-
-            # axes is always a 2D array when squeeze=False, so we need to access [i, 0]
-            # Plot each signal
-            for i, (signal_name, signal_data) in enumerate(module_signals.items()):
-                ax = axes[i, 0]  # Access the axes correctly for squeeze=False
-
-                # Extract time and value data from Signal object
-                times = []
-                values = []
-                values_str = []
-
-                # signal_data is a Signal object with .tv attribute containing [(time, value), ...]
-                for timestamp, value in signal_data.tv:
-                    times.append(timestamp // 1000)  # Convert to picoseconds
-                    # Convert value to int if possible, otherwise keep as string
-                    try:
-                        if isinstance(value, str):
-                            values.append(int(value, 2))
-                        else:
-                            values.append(int(value))
-                    except (ValueError, TypeError):
-                        values.append(0)
-                    # Format value as binary string for annotation
-                    # if len(value) % 4 == 0:
-                    #     values_str.append(f"0x{int(value, 2):X}")
-                    # else:
-                    values_str.append("0b"+value)
-
-                times.append(signal_data.endtime // 1000)  # End time in picoseconds
-                values.append(values[-1] if values else 0)
-
-                # GTKWave-like styling
-                ax.set_facecolor('#000000')  # Black background
-
-                # Plot as step function for digital signals with green color
-                if times and values:
-                    ax.step(times, values, where='post', linewidth=2, color='#00FF00')  # Green traces
-
-                    # Add value annotations on the plot - centered vertically
-                    # Compute data-driven vertical center and padded y-limits
-                    y_min = min(values) if values else 0
-                    y_max = max(values) if values else 1
-                    center_y = (y_min + y_max) / 2  # Center between data bounds
-
-                    for j, (time, value, value_str) in enumerate(zip(times[:-1], values[:-1], values_str)):
-                        if j < len(times) - 1:  # Don't annotate the last extended point
-                            # Position text at the middle of each time segment
-                            next_time = times[j + 1] if j + 1 < len(times) else time + 1000
-                            text_x = time
-
-                            # Add text annotation at vertical center.
-                            ax.text(text_x, center_y, value_str,
-                                color='#FFFFFF', fontsize=10,
-                                fontfamily=['Adwaita Mono'],
-                                ha='left', va='center')
-
-                    # Signal name label on the left
-                    ax.set_ylabel(signal_name, rotation=0, ha='right', va='center',
-                                color='black', fontsize=10, fontweight='bold')
-
-                    # Remove y-axis ticks and labels
-                    ax.set_yticks([])
-                    ax.tick_params(left=False)
-
-                    # Grid styling - both horizontal and vertical lines
-                    ax.grid(True, alpha=0.3, color='#0080FF', linewidth=0.5)
-                    ax.grid(True, axis='x', alpha=0.4, color='#0080FF', linewidth=0.5)
-                    ax.grid(True, axis='y', alpha=0.2, color='#0080FF', linewidth=0.3)
-
-                    # Set y-limits with slight padding beyond data bounds to avoid tight clipping
-                    y_span = max(1.0, y_max - y_min)
-                    y_pad = max(0.15 * y_span, 0.3)  # 15% of span or at least 0.3 units
-                    ax.set_ylim(y_min - y_pad, y_max + y_pad)
-
-                    # Remove top and right spines, keep bottom for x-axis only on last subplot
-                    ax.spines['top'].set_visible(False)
-                    ax.spines['right'].set_visible(False)
-                    ax.spines['left'].set_visible(False)
-
-                    # Show x-axis only on the last subplot
-                    if i == num_signals - 1:
-                        ax.spines['bottom'].set_visible(True)
-                        ax.spines['bottom'].set_color('black')
-                        ax.spines['bottom'].set_linewidth(1)
-
-                        # X-axis styling - show ticks only on last subplot with black color
-                        ax.tick_params(axis='x', colors='black', labelsize=8)
-
-                        # Show minor x-ticks for better time resolution
-                        ax.minorticks_on()
-                        ax.tick_params(axis='x', which='minor', colors='black', length=2)
-                    else:
-                        # Hide x-axis for all other subplots
-                        ax.spines['bottom'].set_visible(False)
-                        ax.tick_params(axis='x', which='both', bottom=False, labelbottom=False)
-
-            # Set common x-axis label on the last (bottom) subplot
-            axes[-1, 0].set_xlabel('Time (ps)', color='black', fontweight='bold')
-
-            # Title styling - change text color to black
-            plt.suptitle(f'Waveform Plot - {vcd_file}', fontsize=14, fontweight='bold', color='black')
-            plt.tight_layout(h_pad=0)  # Set vertical gap to 0
-
-            # Save plot
-            output_path = self.imgs_folder / output_image
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
-            plt.close()
-
-            print(f"✓ Waveform plot saved: {output_path}")
+            # Render with the reusable GTKWave-style figure template
+            with self.report.stage('render', profile=True):
+                fig = draw_waveform(module_signals, f'Waveform Plot - {vcd_file}', lod, dpi, annotate)
+            with self.report.stage('save', profile=True):
+                save_waveform(fig, staged, dpi, antialias)
+                self._publish_image("Waveform plot saved", staged, output_path, started)
             return True
 
+        except ImportError as e:
+            print(f"Error: {e.name} not found. Please install: pip install {e.name}")
+            return False
         except Exception as e:
             print(f"Error plotting VCD file: {e}")
             return False
+        finally:
+            if staged.exists():
+                staged.unlink()
 
     def process_file(self, file_config: Dict) -> bool:
         """
@@ -439,89 +1077,857 @@ class VerilogAutomation:
             return False
 
         file_name = file_config['name']
-        base_name = Path(file_name).stem
+        base_name = self._output_name(file_config)
 
         print(f"\n{'='*60}")
-        print(f"Processing file: {file_name}")
+        print(f"Processing file: {variant_label(file_config)}")
         print(f"{'='*60}")
 
-        # Get VCD file name (default to base_name.vcd)
-        vcd_file = file_config.get('vcd_file', f"{base_name}.vcd")
+        self._resolve_timeouts(file_config)
 
         # Get variables to plot (default to None for all variables)
-        variables = file_config.get('variables', None)
-
-        # Get module name (default to TEST)
-        module = file_config.get('module', 'TEST')
+        variables = self._file_option(file_config, 'variables')
 
-        # Check if plotting is enabled (default to True)
-        plot_enabled = file_config.get('plot', True)
-
-        # Compile Verilog
-        if not self.compile_verilog([file_name], base_name):
+        # Dump file, plotted module and plot flag, resolved from the sources
+        entry = self._inspect_entry(file_config)
+        if entry['errors']:
+            for error in entry['errors']:
+                print(f"✗ {error}")
+            return False
+        module = entry['module']
+        plot_enabled = entry['plot']
+
+        # Waveform level-of-detail mode
+        lod = self._lod_mode(self._file_option(file_config, 'lod', 'auto'))
+
+        # Plot window and hierarchy depth below the module (0 = direct signals only)
+        start_time = self._file_option(file_config, 'start_time')
+        end_time = self._file_option(file_config, 'end_time')
+        depth = self._file_option(file_config, 'depth', 0)
+
+        # Image format, resolution and render profile
+        output = self._output_settings(file_config)
+        stages = self._stages(file_config)
+
+        dump_format = self._dump_format(file_config)
+        plusargs = normalize_plusargs(self._file_option(file_config, 'plusargs'))
+        run_dir = file_config.get('run_dir')
+        files = self._output_files(file_config, output['format'])
+        vcd_file, vvp_file, transcript_file = files['vcd'], files['vvp'], files['transcript']
+        terminal_image, waveform_image = files['terminal'], files['waveform']
+
+        # Compile Verilog (once per shared unit in batch mode)
+        if 'compile' not in stages:
+            print(f"\n=== Compile: skipped (using existing {vvp_file}) ===")
+            compiled, compile_key = True, None
+        elif base_name in self._batch_units:
+            vvp_file, compile_key, compiled = self._batch_units[base_name]
+            print(f"\n=== Compile: shared batch unit {vvp_file} ===")
+            self.report.cached('compile')
+        else:
+            compiled, compile_key = self._compile_stage(self._compile_unit(file_config), vvp_file)
+        if not compiled:
             return False
 
+        # Stage keys chain on each other, so a source change invalidates every
+        # stage (and a skipped compile leaves later stages uncached)
+        simulate_key = terminal_key = plot_key = None
+        if compile_key is not None:
+            simulate_key = BuildCache.key('simulate', compile_key, vcd_file, transcript_file, plusargs,
+                                          self.toolchain.version('vvp'))
+            renderer = 'builtin' if self.single_run else self.toolchain.version('termshot')
+            terminal_key = BuildCache.key('terminal', simulate_key, renderer, terminal_image,
+                                          output['terminal_dpi'], output['antialias'])
+            plot_key = BuildCache.key('plot', simulate_key, vcd_file, variables, module, lod,
+                                     start_time, end_time, depth, waveform_image,
+                                     output['dpi'], output['annotate'], output['antialias'])
+
         # Simulate
-        vvp_file = f"{base_name}.vvp"
-        if not self.simulate_verilog(vvp_file):
+        simulate_outputs = [self.assignment_folder / vcd_file] if plot_enabled else []
+        if transcript_file:
+            simulate_outputs.append(self.assignment_folder / transcript_file)
+        if 'simulate' not in stages:
+            print(f"\n=== Simulation: skipped (using existing outputs) ===")
+        elif not self._cached_stage('Simulation', simulate_key, simulate_outputs,
+                                    lambda: self.simulate_verilog(vvp_file, transcript_file, files['dumpfile'],
+                                                                  dump_format, plusargs, run_dir), 'simulate'):
             return False
-
-        # Capture terminal output
-        terminal_image = f"{base_name}_terminal.png"
-        self.capture_terminal_output(vvp_file, terminal_image)
+        dump_path = self.assignment_folder / vcd_file
+        if dump_path.exists():
+            stored_format = detect_format(dump_path)
+            self.report.note(dump_format=stored_format, dump_bytes=dump_path.stat().st_size,
+                             vcd_bytes=uncompressed_size(dump_path, stored_format))
+
+        # Capture terminal output (from the transcript in single-run mode)
+        if transcript_file:
+            capture = lambda: self.render_terminal_transcript(transcript_file, vvp_file, terminal_image,
+                                                              output['terminal_dpi'], output['antialias'],
+                                                              plusargs)
+        else:
+            capture = lambda: self.capture_terminal_output(vvp_file, terminal_image, output['terminal_dpi'],
+                                                           dump_format == 'vcd', plusargs, run_dir)
+        if 'terminal' in stages:
+            self._cached_stage('Terminal capture', terminal_key, [self.imgs_folder / terminal_image], capture,
+                               'terminal', profile=bool(transcript_file))
 
         # Generate waveform plot
-        waveform_image = f"{base_name}_waveform.png"
-        if plot_enabled:
-            if not self.plot_vcd(vcd_file, variables, module, waveform_image):
+        if plot_enabled and 'plot' in stages:
+            if not self._cached_stage('Waveform plot', plot_key, [self.imgs_folder / waveform_image],
+                                      lambda: self.plot_vcd(vcd_file, variables, module, waveform_image, lod,
+                                                            start_time, end_time, depth, output['dpi'],
+                                                            output['annotate'], output['antialias']),
+                                      'plot'):
                 print(f"Warning: Could not generate waveform plot for {vcd_file}")
-        else:
+        elif not plot_enabled:
             print(f"Skipping waveform plot for {file_name} (plot disabled in config)")
 
         print(f"✓ Completed processing {file_name}")
         return True
 
-    def run(self) -> bool:
+    def _process_file_safe(self, file_config: Dict) -> bool:
+        """
+        Process a single file configuration, reporting any exception as a failure.
+
+        Args:
+            file_config: File configuration dictionary
+
+        Returns:
+            True if processing successful, False otherwise
+        """
+        record = self.report.start_file(variant_label(file_config), self._profile_name(file_config))
+        try:
+            record['success'] = self.process_file(file_config)
+        except Exception as e:
+            print(f"Error processing file: {e}")
+        return record['success']
+
+    def _run_parallel(self, jobs: int, max_procs: Optional[int] = None) -> List[bool]:
+        """
+        Process all configured files across a pool of worker processes.
+
+        Each file's output is buffered in its worker and printed as one block,
+        in configuration order, so logs never interleave.
+
+        Args:
+            jobs: Number of worker processes
+            max_procs: Cap on external tools running at once across all workers
+
+        Returns:
+            List of per-file success flags, in configuration order
+        """
+        results = []
+        slots = multiprocessing.Semaphore(max_procs) if max_procs else None
+        with ProcessPoolExecutor(max_workers=jobs, initializer=set_process_limit, initargs=(slots,)) as pool:
+            futures = [pool.submit(_process_file_isolated, self, file_config)
+                       for file_config in self.config['files']]
+            for file_config, future in zip(self.config['files'], futures):
+                try:
+                    success, log, record = future.result()
+                except Exception as e:
+                    success, log = False, f"Error processing file: {e}\n"
+                    record = RunReport.file_record(variant_label(file_config))
+                self.report.add_file(record)
+                sys.stdout.write(log)
+                sys.stdout.flush()
+                results.append(success)
+        return results
+
+    def run(self, jobs: int = 1, max_procs: Optional[int] = None) -> bool:
         """
         Run the complete automation process for all files in the configuration.
 
+        Args:
+            jobs: Number of files to process in parallel (1 runs sequentially)
+            max_procs: Cap on external tools running at once (None for one per job)
+
         Returns:
             True if all files processed successfully, False otherwise
         """
         print(f"Starting Verilog automation for: {self.config_file}")
         print(f"Assignment folder: {self.assignment_folder}")
+        self._started = time.perf_counter()
 
-        success_count = 0
         total_files = len(self.config['files'])
+        jobs = min(jobs, total_files)
 
-        for file_config in self.config['files']:
-            try:
-                if self.process_file(file_config):
-                    success_count += 1
-            except Exception as e:
-                print(f"Error processing file: {e}")
+        # Probe tools once here; workers inherit the resolved registry
+        self._resolve_tools()
+        self.report.tools = self.toolchain.versions()
+        self.validate_config()
+
+        # Shared units (batch mode) and sweep define sets compile once, before the pool starts
+        self._compile_batches()
+
+        if jobs > 1:
+            print(f"Processing {total_files} files with {jobs} parallel jobs")
+            sys.stdout.flush()
+            results = self._run_parallel(jobs, max_procs)
+        else:
+            results = [self._process_file_safe(file_config)
+                       for file_config in self.config['files']]
+
+        if self.cache is not None:
+            evicted = self.cache.evict()
+            if evicted:
+                print(f"Evicted {evicted} least-recently-used build cache entries")
+
+        reports_built = self.build_documents() if self.typst else True
+        return self._summarize(results) and reports_built
+
+    def _summarize(self, results: List[bool]) -> bool:
+        """
+        Print the SUMMARY with stage timings and write the run report.
+
+        Args:
+            results: Per-file success flags
 
+        Returns:
+            True if every file succeeded
+        """
+        success_count, total_files = sum(results), len(results)
         print(f"\n{'='*60}")
         print(f"SUMMARY")
         print(f"{'='*60}")
         print(f"Successfully processed: {success_count}/{total_files} files")
         print(f"Output directory: {self.imgs_folder}")
 
+        totals = self.report.stage_totals()
+        if totals:
+            print(f"\nStage timings (wall / CPU incl. tools):")
+            for stage, total in totals.items():
+                print(f"  {stage:<10} {total['runs']:>4} run, {total['cached']:>4} cached"
+                      f"  {total['wall_s']:8.2f}s / {total['cpu_s']:8.2f}s")
+        compact = [record for record in self.report.files if record.get('dump_format') not in (None, 'vcd')]
+        if compact:
+            print(f"\nDump storage:")
+            for record in compact:
+                print(f"  {record['file']:<24} {record['dump_format']:<8} "
+                      f"{savings(record.get('vcd_bytes'), record['dump_bytes'])}")
+        matrices = sweep_matrices(self.config['files'], results)
+        if matrices:
+            elapsed = time.perf_counter() - self._started
+            variants = sum(count for _, count, _, _ in matrices)
+            for name, count, passed, lines in matrices:
+                print(f"\nSweep {name}: {passed}/{count} variants passed")
+                for line in lines:
+                    print(f"  {line}")
+            print(f"Sweep throughput: {variants} variants in {elapsed:.2f}s ({variants / elapsed:.2f} variants/s)")
+        if self.report_file:
+            print(f"Run report written: {self.report.write(self.report_file)}")
+
         return success_count == total_files
 
+    def _worker_options(self) -> Dict:
+        """Constructor options a remote worker needs to reproduce this run."""
+        options = {'use_cache': self.cache is not None, 'cache_size_mb': self.cache_size_mb, 'force': self.force,
+                   'single_run': self.single_run, 'overrides': self.overrides, 'use_index': self.use_index,
+                   'batch': self.batch}
+        if self.cache_dir:
+            options['cache_dir'] = str(self.cache_dir)
+        return options
+
+    def run_distributed(self, queue_file: str, local_workers: int = 0, max_attempts: int = MAX_ATTEMPTS,
+                        poll_interval: float = 0.5, worker_timeout: float = WORKER_TIMEOUT) -> bool:
+        """
+        Coordinator: queue every file entry, collect results from workers.
+
+        Workers (run_worker(), e.g. 'verilog_automation.py --worker QUEUE' on
+        other machines sharing the queue file) claim entries and return their
+        logs, run report records and artifacts, which are unpacked into this
+        assignment folder. Logs are printed in configuration order. Entries
+        that fail validation are not queued. Local workers stay up until the
+        job is drained, so they pick up tasks requeued from a lost worker;
+        when no worker is alive (no local worker running and no task of the
+        job being worked on) for worker_timeout seconds, the remaining tasks
+        are marked failed.
+
+        Args:
+            queue_file: SQLite queue file reachable by every worker
+            local_workers: Worker processes to start on this machine
+            max_attempts: Runs allowed per entry when a worker fails or disappears
+            poll_interval: Seconds between checks for finished tasks
+            worker_timeout: Seconds without a live worker before giving up on the job
+
+        Returns:
+            True if all files processed successfully, False otherwise
+        """
+        print(f"Starting distributed Verilog automation for: {self.config_file}")
+        print(f"Queue: {queue_file}")
+        self._started = time.perf_counter()
+
+        # Same startup checks as run(): tool versions for the report, and no
+        # invalid entry shipped to the workers
+        self._resolve_tools()
+        self.report.tools = self.toolchain.versions()
+        self.validate_config()
+        invalid = {index for index, file_config in enumerate(self.config['files'])
+                   if 'name' not in file_config or self._inspect_entry(file_config)['errors']}
+        queued = [index for index in range(len(self.config['files'])) if index not in invalid]
+
+        queue = WorkQueue(queue_file)
+        job = uuid.uuid4().hex
+        options = self._worker_options()
+        queue.submit(job, [{'config': self.config, 'config_file': self.config_file.name,
+                            'file': self.config['files'][index], 'options': options}
+                           for index in queued], max_attempts)
+        print(f"Queued {len(queued)} files as job {job[:12]}")
+        sys.stdout.flush()
+
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=run_worker, args=(queue_file, str(self.workspace_root)),
+                                   kwargs={'job': job}, daemon=True)
+                   for _ in range(local_workers if queued else 0)]
+        for worker in workers:
+            worker.start()
+
+        results = []
+        live_at = time.monotonic()
+        try:
+            for index, file_config in enumerate(self.config['files']):
+                if index in invalid:
+                    print(f"✗ {variant_label(file_config)} not queued: invalid entry")
+                    record = RunReport.file_record(variant_label(file_config))
+                    self.report.add_file(record)
+                    results.append(False)
+                    continue
+
+                position = queued.index(index)
+                result = queue.result(job, position)
+                while result is None:
+                    time.sleep(poll_interval)
+                    queue.requeue_stale()
+                    if any(worker.is_alive() for worker in workers) or queue.counts(job).get(RUNNING):
+                        live_at = time.monotonic()
+                    elif time.monotonic() - live_at > worker_timeout:
+                        failed = queue.fail_remaining(job, f"no live worker for {worker_timeout:.0f}s")
+                        print(f"✗ No live worker for {worker_timeout:.0f}s: failed {failed} remaining task(s)")
+                    result = queue.result(job, position)
+
+                sys.stdout.write(result['log'] or '')
+                if result['state'] == DONE:
+                    unpack_artifacts(result['artifacts'], self.assignment_folder)
+                    print(f"[{result['worker']}, attempt {result['attempts']}]")
+                else:
+                    print(f"✗ {variant_label(file_config)} failed after {result['attempts']} "
+                          f"attempt(s): {result['error']}")
+                self.report.add_file(result['record'] or RunReport.file_record(variant_label(file_config)))
+                results.append(bool(result['success']))
+                sys.stdout.flush()
+            queue.drop(job)
+        finally:
+            for worker in workers:
+                worker.join(timeout=10)
+                if worker.is_alive():
+                    worker.terminate()
+            queue.close()
+
+        reports_built = self.build_documents() if self.typst else True
+        return self._summarize(results) and reports_built
+
+    def convert_dumps(self, dump_format: str) -> bool:
+        """
+        Convert the entries' existing dumps to a storage format, deleting the originals.
+
+        Args:
+            dump_format: Target format (one of DUMP_FORMATS)
+
+        Returns:
+            True if every dump found was converted
+        """
+        if dump_format not in DUMP_FORMATS:
+            raise ValueError(f"Invalid dump format '{dump_format}' (expected one of {', '.join(DUMP_FORMATS)})")
+        print(f"\n=== Converting dumps to {dump_format} ===")
+        converted = failed = before = after = 0
+        targets = set()
+        for file_config in self.config['files']:
+            if 'name' not in file_config:
+                continue
+            dumpfile = self._dump_file(file_config)
+            target = self.assignment_folder / dump_name(dumpfile, dump_format)
+            if target in targets:
+                continue  # several entries share this dump
+            targets.add(target)
+
+            # Convert the newest copy if the dump exists in several formats
+            existing = [path for path in (self.assignment_folder / dump_name(dumpfile, f) for f in DUMP_FORMATS)
+                        if path.exists()]
+            if not existing:
+                continue
+            source = max(existing, key=lambda path: path.stat().st_mtime)
+            if source == target and detect_format(source) == dump_format:
+                print(f"  {target.name}: already {dump_format}")
+                continue
+            try:
+                result = convert_dump(source, target, dump_format)
+            except (OSError, ValueError) as e:
+                print(f"✗ {source.name}: {e}")
+                failed += 1
+                continue
+            print(f"✓ {source.name} -> {target.name}: {savings(result['vcd_bytes'], result['dump_bytes'])}")
+            converted += 1
+            before += result['bytes']
+            after += result['dump_bytes']
+            for stale in existing:
+                if stale not in (source, target):
+                    print(f"  Note: older copy {stale.name} left in place")
+
+        print(f"{'✓' if not failed else '✗'} Converted {converted} dump(s)"
+              + (f", {format_size(before)} -> {format_size(after)} on disk" if converted else '')
+              + (f", {failed} failed" if failed else ''))
+        if converted and str(self.config.get('dump_format', 'vcd')) != dump_format:
+            print(f'Set "dump_format": "{dump_format}" in {self.config_file} to keep new dumps in this format')
+        return not failed
+
+    def bundle(self, output: Optional[str] = None, images: Optional[bool] = None, jobs: int = 0) -> bool:
+        """
+        Build the assignment's submission archive.
+
+        The archive holds every Verilog source and PDF in the assignment
+        folder plus the entries' include and library files; the config's
+        "bundle" object can add the rendered images ("images": true) and
+        report files ("reports": paths or globs relative to the workspace),
+        drop members ("exclude": globs on archive names) and set "output"
+        and "level". Members unchanged since the previous archive are reused.
+
+        Args:
+            output: Archive path (default: bundle.output, else <folder>_submission.zip
+                in the workspace root)
+            images: Include the entries' terminal and waveform images (overrides bundle.images)
+            jobs: Compression threads (0 = one per CPU)
+
+        Returns:
+            True if the archive was written
+        """
+        settings = self.config.get('bundle') or {}
+        images = settings.get('images', False) if images is None else images
+        print(f"\n=== Bundling {self.assignment_folder.name} ===")
+
+        folder = self.assignment_folder.resolve()
+        members: Dict[str, Path] = {}
+
+        def add(path: Path) -> None:
+            path = path.resolve()
+            name = path.relative_to(folder).as_posix() if folder in path.parents else path.name
+            members.setdefault(name, path)
+
+        for path in collect_folder(folder):
+            add(path)
+        for file_config in self.config['files']:
+            if 'name' not in file_config:
+                continue
+            for path in self._unit_dependencies(self._compile_unit(file_config)):
+                if path.is_file():
+                    add(path)
+            if images:
+                files = self._output_files(file_config, self._output_settings(file_config)['format'])
+                for image in (files['terminal'], files['waveform']):
+                    if (self.imgs_folder / image).is_file():
+                        add(self.imgs_folder / image)
+        for pattern in settings.get('reports') or []:
+            matches = sorted(path for path in self.workspace_root.glob(pattern) if path.is_file())
+            if not matches:
+                print(f"Warning: No report file matches '{pattern}'")
+            for path in matches:
+                add(path)
+        for pattern in settings.get('exclude') or []:
+            members = {name: path for name, path in members.items() if not fnmatch.fnmatch(name, pattern)}
+
+        if not any(name.endswith('.v') for name in members):
+            print(f"✗ No .v files found in '{self.assignment_folder}'")
+            return False
+        if not any(name.lower().endswith('.pdf') for name in members):
+            print(f"Warning: No PDF files found in '{self.assignment_folder}'. Continuing without them...")
+
+        target = Path(output or settings.get('output') or f"{self.assignment_folder.name}_submission.zip")
+        if not target.is_absolute():
+            target = self.workspace_root / target
+        started = time.perf_counter()
+        try:
+            result = build_archive([(path, name) for name, path in sorted(members.items())], target,
+                                   jobs, int(settings.get('level', DEFAULT_LEVEL)))
+        except (OSError, ValueError) as e:
+            print(f"✗ Failed to create '{target}': {e}")
+            return False
+        print_summary(result, target, time.perf_counter() - started)
+        return True
+
+    def _report_documents(self, settings: Dict) -> List[Path]:
+        """Typst documents to build: the config's list, else the .typ files that use the assignment folder."""
+        if settings.get('documents'):
+            return [self.workspace_root / document for document in settings['documents']]
+        folder = self.assignment_folder.resolve()
+        candidates = sorted(self.workspace_root.glob('*.typ')) + sorted(self.assignment_folder.glob('*.typ'))
+        return [document for document in candidates
+                if folder in document.resolve().parents
+                or any(folder in path.resolve().parents for path in scan_document(document, self.workspace_root))]
+
+    def build_documents(self, force: Optional[bool] = None) -> bool:
+        """
+        Compile the Typst reports whose inputs changed.
+
+        Each document's imports, includes, images and read() files are found
+        by scanning its source; a document is compiled only when one of them
+        changed content since its last build (or its PDF is missing, or the
+        typst version changed). The config's "typst" field is true or an
+        object with "documents" (paths relative to the workspace; default:
+        the workspace's .typ files that use the assignment folder), "output"
+        (PDF path template with {dir}, {stem} and {folder}; default: next to
+        the assignment's sources) and "jobs".
+
+        Args:
+            force: Compile every document (default: the force flag)
+
+        Returns:
+            True if no document failed to compile
+        """
+        settings = self.config.get('typst')
+        settings = settings if isinstance(settings, dict) else {}
+        print(f"\n=== Typst reports ===")
+        documents = self._report_documents(settings)
+        if not documents:
+            print(f"Warning: No Typst documents use '{self.assignment_folder.name}'")
+            return True
+
+        self._resolve_timeouts({})  # run-wide timeouts, not the last entry's
+        typst = self.toolchain.resolve('typst')
+        builder = ReportBuilder(self.workspace_root, typst.command, typst.version,
+                                self.cache.cache_dir / 'typst.json' if self.cache else None,
+                                settings.get('output', REPORT_OUTPUT))
+        results = builder.build(documents, self.force if force is None else force,
+                                int(settings.get('jobs', 1)), self._timeouts.get('compile'),
+                                folder=self.assignment_folder.name)
+        return print_results(results)
+
+    def _watch_roots(self) -> List[Path]:
+        """Directories to watch: the assignment folder, the config's folder and any outside dependency folders."""
+        roots = {self.assignment_folder.resolve(), self.config_file.resolve().parent}
+        for file_config in self.config['files']:
+            if 'name' in file_config:
+                for path in self._unit_dependencies(self._compile_unit(file_config)):
+                    path = path.resolve()
+                    if not any(root in path.parents for root in roots):
+                        roots.add(path.parent)
+        return sorted(roots)
+
+    def _affected_entries(self, changed: Set[Path]) -> List[Dict]:
+        """
+        File entries to rerun after a set of files changed.
+
+        Dependencies are resolved again on every change, so a new `include or
+        a new file in a library directory is picked up immediately.
+
+        Args:
+            changed: Resolved paths of changed files
+
+        Returns:
+            Affected entries, in configuration order
+        """
+        affected = []
+        if self.config_file.resolve() in changed:
+            previous = self.config
+            try:
+                self.config = self._load_config()
+            except (ValueError, FileNotFoundError) as e:
+                print(f"✗ Keeping previous configuration: {e}")
+            else:
+                global_changed = ({k: v for k, v in previous.items() if k != 'files'}
+                                  != {k: v for k, v in self.config.items() if k != 'files'})
+                affected = [file_config for file_config in self.config['files']
+                            if global_changed or file_config not in previous['files']]
+
+        for file_config in self.config['files']:
+            if 'name' not in file_config or file_config in affected:
+                continue
+            dependencies = self._unit_dependencies(self._compile_unit(file_config))
+            if any(path.resolve() in changed for path in dependencies):
+                affected.append(file_config)
+        return [file_config for file_config in self.config['files'] if file_config in affected]
+
+    def watch(self, jobs: int = 1, max_procs: Optional[int] = None,
+              poll_interval: Optional[float] = None) -> None:
+        """
+        Run once, then rerun affected entries whenever their sources change.
+
+        The process (with matplotlib, the toolchain registry and the build
+        cache) stays warm, so a rerun costs only the changed files' stages.
+        Reruns are processed in this process, one entry at a time.
+
+        Args:
+            jobs: Number of files to process in parallel for the initial run
+            max_procs: Cap on external tools running at once in the initial run
+            poll_interval: Poll every this many seconds instead of using inotify
+        """
+        self.run(jobs=jobs, max_procs=max_procs)
+
+        watcher = FileWatcher(self._watch_roots(), poll_interval=poll_interval or POLL_INTERVAL,
+                              polling=poll_interval is not None)
+        print(f"\n=== Watching {', '.join(str(root) for root in watcher.roots)} "
+              f"({watcher.backend}); press Ctrl-C to stop ===")
+        sys.stdout.flush()
+        try:
+            while True:
+                changed = watcher.wait()
+                entries = self._affected_entries(changed)
+                if not entries:
+                    continue
+
+                started = time.perf_counter()
+                names = ', '.join(self._output_name(file_config) for file_config in entries)
+                print(f"\n=== Change detected: rerunning {names} ===")
+                self.report = RunReport(self.report.profile_dir)
+                self.report.tools = self.toolchain.versions()
+                self._batch_units.clear()
+                self._compile_batches(entries)
+                results = [self._process_file_safe(file_config) for file_config in entries]
+                print(f"\n{'✓' if all(results) else '✗'} Rerun: {sum(results)}/{len(results)} files "
+                      f"in {time.perf_counter() - started:.2f}s")
+                if self.typst:
+                    self.build_documents()
+                if self.report_file:
+                    self.report.write(self.report_file)
+                sys.stdout.flush()
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        finally:
+            watcher.close()
+
+
+def run_worker(queue_file: str, workspace_root: Optional[str] = None, name: Optional[str] = None,
+               idle_exit: Optional[float] = None, job: Optional[str] = None) -> int:
+    """
+    Worker: process queued file entries until stopped (or idle).
+
+    Each task carries its job's config and options; the sources are taken
+    from this worker's workspace, which must hold the same assignment
+    folders as the coordinator's. One VerilogAutomation per job is kept, so
+    the toolchain probe and build cache are shared by all of a job's tasks.
+
+    Args:
+        queue_file: SQLite queue file shared with the coordinator
+        workspace_root: Workspace holding the assignment folders (default: current directory)
+        name: Worker name in the queue (default: host:pid)
+        idle_exit: Exit after this many seconds without work (None runs until interrupted)
+        job: Exit once this job has no pending or running task left (the
+            coordinator's local workers)
+
+    Returns:
+        Number of tasks processed
+    """
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    queue = WorkQueue(queue_file)
+    automations: Dict[str, VerilogAutomation] = {}
+    processed = 0
+    idle_since = time.monotonic()
+    print(f"Worker {name} polling {queue_file}")
+    try:
+        while True:
+            task = queue.claim(name)
+            if task is None:
+                if idle_exit is not None and time.monotonic() - idle_since > idle_exit:
+                    break
+                if job is not None and queue.drained(job):
+                    break
+                time.sleep(0.5)
+                continue
+
+            payload = task['payload']
+            file_config = payload['file']
+            print(f"Task {task['id']}: {variant_label(file_config)} (attempt {task['attempts']})")
+            sys.stdout.flush()
+
+            # Heartbeats come from a thread with its own connection, so long
+            # simulations are not mistaken for a dead worker
+            stop = threading.Event()
+            def beat(task_id=task['id']):
+                beats = WorkQueue(queue_file)
+                while not stop.wait(HEARTBEAT_INTERVAL):
+                    beats.heartbeat(task_id, name)
+                beats.close()
+            heart = threading.Thread(target=beat, daemon=True)
+            heart.start()
+            try:
+                automation = automations.get(task['job'])
+                if automation is None:
+                    automation = _job_automation(payload, workspace_root)
+                    automations[task['job']] = automation
+                success, log, record = _process_file_isolated(automation, file_config)
+                files = automation._output_files(file_config,
+                                                 automation._output_settings(file_config)['format'])
+                artifacts = [automation.assignment_folder / files['vcd'],
+                             automation.imgs_folder / files['terminal'],
+                             automation.imgs_folder / files['waveform']]
+                if files['transcript']:
+                    artifacts.append(automation.assignment_folder / files['transcript'])
+                queue.complete(task['id'], name, success, log, record,
+                               pack_artifacts(automation.assignment_folder, artifacts))
+                print(f"{'✓' if success else '✗'} Task {task['id']} finished")
+            except Exception as e:
+                queue.fail(task['id'], name, f"{type(e).__name__}: {e}")
+                print(f"✗ Task {task['id']} errored: {e}")
+            finally:
+                stop.set()
+                heart.join()
+            processed += 1
+            idle_since = time.monotonic()
+    except KeyboardInterrupt:
+        print(f"Worker {name} stopped")
+    finally:
+        queue.close()
+    return processed
+
+
+def _job_automation(payload: Dict, workspace_root: Optional[str]) -> VerilogAutomation:
+    """Build a worker-side automation instance from a task payload."""
+    config_dir = Path(tempfile.mkdtemp(prefix='verilog-job-'))
+    config_file = config_dir / payload['config_file']
+    config_file.write_text(json.dumps(payload['config']))
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            automation = VerilogAutomation(str(config_file), workspace_root, **payload['options'])
+            automation._resolve_tools()
+    finally:
+        shutil.rmtree(config_dir, ignore_errors=True)
+    return automation
+
+
+def _process_file_isolated(automation: VerilogAutomation, file_config: Dict) -> Tuple[bool, str, Dict]:
+    """
+    Worker entry point for parallel runs: process one file into a private log buffer.
+
+    Args:
+        automation: Automation instance (pickled into the worker process)
+        file_config: File configuration dictionary
+
+    Returns:
+        Tuple of (success flag, captured log text, run report record)
+    """
+    automation.buffer_output = True
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        success = automation._process_file_safe(file_config)
+    return success, buffer.getvalue(), automation.report.files[-1]
+
 
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(description='Verilog Automation Framework')
-    parser.add_argument('config', help='JSON configuration file')
+    parser.add_argument('config', nargs='?', help='JSON configuration file (not needed with --worker)')
     parser.add_argument('--workspace', '-w', help='Workspace root directory (default: current directory)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
+    parser.add_argument('--jobs', '-j', type=int,
+                        help='Number of files to process in parallel (0 = one per CPU; default: 1, '
+                             'or one per CPU when the config has sweeps)')
+    parser.add_argument('--force', '-f', action='store_true',
+                        help='Rebuild every stage even if the build cache has a result')
+    parser.add_argument('--single-run', action='store_true', default=None,
+                        help='Simulate once and render the terminal image from the captured output '
+                             '(instead of re-running the simulation under termshot)')
+    parser.add_argument('--batch', action='store_true', default=None,
+                        help='Compile each compilation unit shared by several entries only once')
+    parser.add_argument('--stages', metavar='LIST',
+                        help=f"Comma-separated stages to run (default: {','.join(STAGES)}); "
+                             "skipped stages reuse existing outputs")
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and reprocess entries whenever their sources change')
+    parser.add_argument('--poll', nargs='?', type=float, const=POLL_INTERVAL, metavar='SECONDS',
+                        help=f'Watch by polling every SECONDS (default: {POLL_INTERVAL}) instead of inotify')
+    parser.add_argument('--coordinator', metavar='QUEUE',
+                        help='Queue every entry in the SQLite work queue QUEUE and collect the results '
+                             'from workers')
+    parser.add_argument('--local-workers', type=int, default=0, metavar='N',
+                        help='With --coordinator, also start N workers on this machine')
+    parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS, metavar='N',
+                        help=f'With --coordinator, runs per entry when workers fail (default: {MAX_ATTEMPTS})')
+    parser.add_argument('--worker-timeout', type=float, default=WORKER_TIMEOUT, metavar='SECONDS',
+                        help=f'With --coordinator, fail the remaining entries after SECONDS without a live worker '
+                             f'(default: {WORKER_TIMEOUT:.0f})')
+    parser.add_argument('--worker', metavar='QUEUE',
+                        help='Run as a worker: process entries queued in QUEUE until interrupted')
+    parser.add_argument('--idle-exit', type=float, metavar='SECONDS',
+                        help='With --worker, exit after SECONDS without work')
+    parser.add_argument('--timeout', type=float, metavar='SECONDS',
+                        help='Kill any compile, simulation or termshot run after SECONDS '
+                             '(default: 300s compile, 900s simulate/terminal)')
+    parser.add_argument('--file-timeout', type=float, metavar='SECONDS',
+                        help='Fail a file whose stages take more than SECONDS in total')
+    parser.add_argument('--max-procs', type=int, metavar='N',
+                        help='Run at most N external tools at once across parallel jobs')
+    parser.add_argument('--start-time', help="Start of the plotted window (e.g. '200ns'; bare numbers are dump ticks)")
+    parser.add_argument('--end-time', help="End of the plotted window (e.g. '1.5us'; bare numbers are dump ticks)")
+    parser.add_argument('--signals', nargs='+', metavar='PATTERN',
+                        help="Signals to plot: names, globs ('data_*') or regexes ('re:addr\\[.*')")
+    parser.add_argument('--depth', type=int,
+                        help='Hierarchy levels below the module to plot (-1 for all, default: 0)')
+    parser.add_argument('--lod', choices=LOD_MODES,
+                        help="Waveform level of detail: decimate dense signals to the image width "
+                             "('auto', default), always ('on') or never ('off')")
+    parser.add_argument('--image-profile', choices=list(OUTPUT_PROFILES),
+                        help="Image render profile: 'default', 'preview' (low DPI, no annotations, "
+                             "no antialiasing) or 'publication' (vector waveforms)")
+    parser.add_argument('--format', choices=IMAGE_FORMATS, help='Image format (default: png)')
+    parser.add_argument('--dpi', type=int, help=f'Waveform plot resolution (default: {PLOT_DPI})')
+    parser.add_argument('--dump-format', choices=DUMP_FORMATS,
+                        help="Waveform dump storage: 'vcd' (default), gzip/zstd-compressed VCD or FST")
+    parser.add_argument('--convert-dumps', choices=DUMP_FORMATS, metavar='FORMAT',
+                        help='Convert the existing dumps of every entry to FORMAT, delete the originals and exit')
+    parser.add_argument('--bundle', nargs='?', const='', metavar='ZIP',
+                        help='Write the submission archive (default: <folder>_submission.zip) and exit')
+    parser.add_argument('--bundle-images', action='store_true', default=None,
+                        help='With --bundle, include the rendered terminal and waveform images')
+    parser.add_argument('--typst', action='store_true', default=None,
+                        help='After the run, compile the Typst reports whose sources or images changed')
+    parser.add_argument('--no-index', action='store_true',
+                        help='Do not write or use the .vcd.idx sidecar index')
+    parser.add_argument('--report', metavar='FILE',
+                        help='Write a per-stage run report (JSON, or CSV if FILE ends in .csv)')
+    parser.add_argument('--profile', nargs='?', const='profiles',
+                        metavar='DIR', help='Run Python stages under cProfile and write .prof files '
+                                            "to DIR (default: 'profiles')")
+    parser.add_argument('--no-cache', action='store_true', help='Disable the build cache')
+    parser.add_argument('--cache-dir', help=f'Build cache directory (default: <workspace>/{DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-size', type=float, default=DEFAULT_CACHE_SIZE_MB,
+                        help=f'Build cache size cap in MB (default: {DEFAULT_CACHE_SIZE_MB})')
 
     args = parser.parse_args()
 
+    if args.worker:
+        run_worker(args.worker, args.workspace, idle_exit=args.idle_exit)
+        sys.exit(0)
+    if not args.config:
+        parser.error('the config argument is required (except with --worker)')
+
     try:
-        automation = VerilogAutomation(args.config, args.workspace)
-        success = automation.run()
+        automation = VerilogAutomation(args.config, args.workspace,
+                                       cache_dir=args.cache_dir, cache_size_mb=args.cache_size,
+                                       use_cache=not args.no_cache, force=args.force,
+                                       single_run=args.single_run,
+                                       overrides={'lod': args.lod, 'start_time': args.start_time,
+                                                  'end_time': args.end_time, 'variables': args.signals,
+                                                  'depth': args.depth, 'image_profile': args.image_profile,
+                                                  'format': args.format, 'dpi': args.dpi,
+                                                  'timeout': args.timeout, 'file_timeout': args.file_timeout,
+                                                  'stages': args.stages, 'dump_format': args.dump_format},
+                                       use_index=False if args.no_index else None,
+                                       report_file=args.report, profile_dir=args.profile,
+                                       batch=args.batch, typst=args.typst)
+        if args.jobs is None:
+            sweeps = any('variant' in file_config for file_config in automation.config['files'])
+            jobs = (os.cpu_count() or 1) if sweeps else 1
+        else:
+            jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        if args.convert_dumps:
+            sys.exit(0 if automation.convert_dumps(args.convert_dumps) else 1)
+        if args.bundle is not None:
+            sys.exit(0 if automation.bundle(args.bundle or None, args.bundle_images,
+                                            0 if args.jobs is None else args.jobs) else 1)
+        if args.coordinator:
+            success = automation.run_distributed(args.coordinator, args.local_workers, args.max_attempts,
+                                                  worker_timeout=args.worker_timeout)
+            sys.exit(0 if success else 1)
+        if args.watch:
+            automation.watch(jobs=jobs, max_procs=args.max_procs, poll_interval=args.poll)
+            sys.exit(0)
+        success = automation.run(jobs=jobs, max_procs=args.max_procs)
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+"""
+Verilog Source Scanner
+======================
+
+Lightweight, regex-based pre-indexing of Verilog sources for the automation
+framework. No elaboration is attempted; the scanner extracts just what the
+pipeline needs to know before spawning any tool:
+
+- ``$dumpfile`` name and the module that calls it
+- ``$dumpvars`` scopes
+- modules defined and modules instantiated (to find the top-level modules)
+- `` `include`` directives
+
+Results are cached by content hash (in memory and, optionally, in a JSON
+file next to the build cache), so unchanged sources are never re-parsed.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+SCAN_VERSION = 1  # bump when the extracted fields change
+MAX_CACHED = 5000  # scan results kept in the cache file
+
+# Comments are blanked; strings are kept (a "//" inside $display is not a comment)
+_COMMENT_OR_STRING = re.compile(r'"(?:\\.|[^"\\\n])*"|/\*.*?\*/|//[^\n]*', re.DOTALL)
+_MODULE = re.compile(r'\b(?:macro)?module\s+([A-Za-z_][\w$]*)(.*?)\bendmodule\b', re.DOTALL)
+_INSTANCE = re.compile(r'^\s*([A-Za-z_][\w$]*)\s*(?:#\s*\((?:[^()]|\([^()]*\))*\)\s*)?'
+                       r'[A-Za-z_][\w$]*\s*(?:\[[^\]]*\]\s*)?\(', re.MULTILINE)
+_DUMPFILE = re.compile(r'\$dumpfile\s*\(\s*(?:"([^"]*)")?')
+_DUMPVARS = re.compile(r'\$dumpvars\s*(?:\(([^;]*)\))?\s*;')
+_INCLUDE = re.compile(r'^\s*`include\s+"([^"]+)"', re.MULTILINE)
+
+
+def _strip_comments(text: str) -> str:
+    return _COMMENT_OR_STRING.sub(lambda m: m.group(0) if m.group(0).startswith('"') else ' ', text)
+
+
+def scan_text(text: str) -> Dict:
+    """
+    Extract dump, module and include information from Verilog source text.
+
+    Args:
+        text: Source text
+
+    Returns:
+        Dictionary with 'modules' (defined), 'instances' (instantiated type
+        names), 'dumpfile' (first literal $dumpfile name or None),
+        'has_dumpfile', 'dump_module' (module calling $dumpfile),
+        'dumpvars' (scope arguments of $dumpvars calls) and 'includes'
+    """
+    code = _strip_comments(text)
+    info = {'modules': [], 'instances': [], 'dumpfile': None, 'has_dumpfile': False,
+            'dump_module': None, 'dumpvars': [], 'includes': _INCLUDE.findall(code)}
+
+    for module in _MODULE.finditer(code):
+        name, body = module.group(1), module.group(2)
+        info['modules'].append(name)
+        for instance in _INSTANCE.finditer(body):
+            if instance.group(1) not in info['instances']:
+                info['instances'].append(instance.group(1))
+
+        dumpfile = _DUMPFILE.search(body)
+        if dumpfile and not info['has_dumpfile']:
+            info['has_dumpfile'] = True
+            info['dumpfile'] = dumpfile.group(1) or None
+            info['dump_module'] = name
+        for dumpvars in _DUMPVARS.finditer(body):
+            arguments = [argument.strip() for argument in (dumpvars.group(1) or '').split(',')]
+            info['dumpvars'] += [scope for scope in arguments[1:] if scope]
+
+    # $dumpfile outside any module (e.g. in an included fragment)
+    if not info['has_dumpfile']:
+        dumpfile = _DUMPFILE.search(code)
+        if dumpfile:
+            info['has_dumpfile'] = True
+            info['dumpfile'] = dumpfile.group(1) or None
+    return info
+
+
+class SourceScanner:
+    """Scans Verilog files, caching results by content hash."""
+
+    def __init__(self, cache_file: Optional[Union[str, Path]] = None):
+        """
+        Initialize the scanner.
+
+        Args:
+            cache_file: JSON file persisting scan results across runs (None to
+                keep results in memory only)
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._results: Dict[str, Dict] = {}
+        self._dirty = False
+        if self.cache_file and self.cache_file.exists():
+            try:
+                stored = json.loads(self.cache_file.read_text())
+                if stored.get('version') == SCAN_VERSION:
+                    self._results = stored['files']
+            except (OSError, ValueError, KeyError):
+                self._results = {}
+
+    def scan(self, path: Union[str, Path]) -> Optional[Dict]:
+        """
+        Scan one file.
+
+        Args:
+            path: Verilog source
+
+        Returns:
+            Result of scan_text(), or None if the file cannot be read
+        """
+        try:
+            content = Path(path).read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(content).hexdigest()
+        info = self._results.get(digest)
+        if info is None:
+            info = scan_text(content.decode(errors='replace'))
+            self._results[digest] = info
+            self._dirty = True
+        return info
+
+    def scan_unit(self, sources: Iterable[Path], libraries: Iterable[Path] = (),
+                  includes: Iterable[Path] = ()) -> Dict:
+        """
+        Combine the scans of a compilation unit.
+
+        Args:
+            sources: Files compiled directly (the entry's 'name' and 'sources')
+            libraries: Library files and modules in library directories
+            includes: Resolved `include dependencies
+
+        Returns:
+            Dictionary with 'missing' (unreadable sources), 'modules',
+            'tops' (defined in the sources, never instantiated in the unit),
+            'dumpfile', 'has_dumpfile', 'dump_module', 'dumpvars' and
+            'includes' (`include names used by the sources and includes)
+        """
+        unit = {'missing': [], 'modules': [], 'tops': [], 'dumpfile': None, 'has_dumpfile': False,
+                'dump_module': None, 'dumpvars': [], 'includes': []}
+        own_modules, instances = [], set()
+        for role, paths in (('source', sources), ('include', includes), ('library', libraries)):
+            for path in paths:
+                info = self.scan(path)
+                if info is None:
+                    if role == 'source':
+                        unit['missing'].append(str(path))
+                    continue
+                unit['modules'] += info['modules']
+                instances.update(info['instances'])
+                if role == 'library':
+                    continue
+                own_modules += info['modules']
+                unit['dumpvars'] += info['dumpvars']
+                unit['includes'] += [name for name in info['includes'] if name not in unit['includes']]
+                if info['has_dumpfile'] and not unit['has_dumpfile']:
+                    unit['has_dumpfile'] = True
+                    unit['dumpfile'] = info['dumpfile']
+                    unit['dump_module'] = info['dump_module']
+        unit['tops'] = [module for module in own_modules if module not in instances]
+        return unit
+
+    def save(self) -> None:
+        """Persist new scan results (atomic; errors are ignored)."""
+        if not (self.cache_file and self._dirty):
+            return
+        try:
+            results = dict(list(self._results.items())[-MAX_CACHED:])
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            staging = self.cache_file.with_name(f".{self.cache_file.name}.{os.getpid()}.tmp")
+            staging.write_text(json.dumps({'version': SCAN_VERSION, 'files': results}))
+            os.replace(staging, self.cache_file)
+            self._dirty = False
+        except OSError:
+            pass
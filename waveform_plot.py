@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+
+"""
+Waveform Plot Renderer
+======================
+
+GTKWave-style waveform rendering for the automation framework.
+
+Figures are built from a reusable template: the dark theme, axes, spines,
+grid and tick styling are applied once per row count and the figure is then
+reused for every signal set with the same number of rows, across files. The
+layout is computed directly (fixed margins plus the measured signal label
+width), so no ``tight_layout`` or ``bbox_inches='tight'`` pass is needed and
+each save is a single Agg draw.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
+from matplotlib import style as mpl_style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.font_manager import FontProperties
+
+from plot_settings import IMAGE_FORMATS, LOD_MODES, OUTPUT_PROFILES, PLOT_DPI
+
+# Waveform rendering constants
+PLOT_WIDTH = 12  # inches
+ROW_HEIGHT = 0.8  # inches of figure height per signal
+ANNOTATION_FONT_SIZE = 10  # points
+ANNOTATION_CHAR_WIDTH = 0.6 * ANNOTATION_FONT_SIZE / 72  # inches per monospace character
+
+# Fixed layout (inches), matching what tight_layout(h_pad=0) produced
+LAYOUT_PAD = 0.15  # outer padding on every side
+LABEL_PAD = 4 / 72  # gap between signal label and axes (matplotlib's labelpad)
+TITLE_SPACE = 0.494  # suptitle band above the first row
+AXIS_SPACE = 0.557  # tick labels and x label below the last row
+MIN_ROW = 0.45  # smallest usable axes height per signal
+
+FIGURE_COLOR = '#BBBBBB'  # Greyish white background outside plot area
+TRACE_COLOR = '#00FF00'
+GRID_COLOR = '#0080FF'
+LABEL_FONT = FontProperties(size=10, weight='bold')
+
+# GTKWave-like dark theme, resolved once instead of plt.style.use() per plot
+DARK_STYLE = dict(mpl_style.library['dark_background'])
+
+_templates: Dict[int, Tuple[Figure, List, 'Text']] = {}
+
+
+def decimate_steps(times: np.ndarray, values: np.ndarray, end_time: float,
+                   pixels: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Tuple[float, float]]]:
+    """
+    Reduce a step waveform to at most one transition per output pixel.
+
+    Pixel columns holding more than one transition are merged into "busy"
+    spans (drawn as filled bands, like GTKWave when zoomed out); the trace
+    resumes after each span with the value the signal holds at its end.
+
+    Args:
+        times: Transition times (sorted)
+        values: Value after each transition
+        end_time: Time the last value extends to
+        pixels: Horizontal resolution of the plot area
+
+    Returns:
+        Tuple of (kept times, kept values, index of the source sample for each
+        kept point, busy spans as (start, width) pairs)
+    """
+    n = len(times)
+    if n == 0:
+        return times, values, np.arange(0), []
+
+    t0 = float(times[0])
+    bin_width = max(float(end_time) - t0, 1.0) / pixels
+    bins = np.minimum(((times - t0) / bin_width).astype(np.int64), pixels - 1)
+    busy = np.bincount(bins, minlength=pixels) > 1
+    if not busy.any():
+        return times, values, np.arange(n), []
+
+    # Runs of consecutive busy pixel columns
+    edges = np.diff(np.concatenate(([0], busy.astype(np.int8), [0])))
+    span_starts = t0 + np.flatnonzero(edges == 1) * bin_width
+    span_ends = np.minimum(t0 + np.flatnonzero(edges == -1) * bin_width, end_time)
+
+    # Keep transitions in quiet columns, plus one resume point per busy span
+    # (unless a kept transition already falls exactly on the span's end)
+    keep = np.flatnonzero(~busy[bins])
+    resumed = ~np.isin(span_ends, times[keep])
+    resume = np.searchsorted(times, span_ends[resumed], side='left') - 1
+    kept_index = np.concatenate((keep, resume))
+    kept_times = np.concatenate((times[keep], span_ends[resumed]))
+    order = np.argsort(kept_times, kind='stable')
+
+    spans = [(float(start), float(end - start)) for start, end in zip(span_starts, span_ends)]
+    return kept_times[order], values[kept_index[order]], kept_index[order], spans
+
+
+def _row_height(num_signals: int) -> float:
+    """Axes height per signal for a figure of ROW_HEIGHT inches per row."""
+    usable = ROW_HEIGHT * num_signals - TITLE_SPACE - AXIS_SPACE
+    return max(usable / num_signals, MIN_ROW)
+
+
+def _style_axes(ax, last: bool) -> None:
+    """Apply the static GTKWave-like styling to one row's axes."""
+    ax.set_facecolor('#000000')  # Black background
+
+    # Remove y-axis ticks and labels
+    ax.set_yticks([])
+    ax.tick_params(left=False)
+
+    # Grid styling - both horizontal and vertical lines
+    ax.grid(True, alpha=0.3, color=GRID_COLOR, linewidth=0.5)
+    ax.grid(True, axis='x', alpha=0.4, color=GRID_COLOR, linewidth=0.5)
+    ax.grid(True, axis='y', alpha=0.2, color=GRID_COLOR, linewidth=0.3)
+
+    # Remove top and right spines, keep bottom for x-axis only on last subplot
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_visible(False)
+
+    # Show x-axis only on the last subplot
+    if last:
+        ax.spines['bottom'].set_visible(True)
+        ax.spines['bottom'].set_color('black')
+        ax.spines['bottom'].set_linewidth(1)
+
+        # X-axis styling - show ticks only on last subplot with black color
+        ax.tick_params(axis='x', colors='black', labelsize=8)
+
+        # Show minor x-ticks for better time resolution
+        ax.minorticks_on()
+        ax.tick_params(axis='x', which='minor', colors='black', length=2)
+
+        ax.set_xlabel('Time (ps)', color='black', fontweight='bold')
+    else:
+        # Hide x-axis for all other subplots
+        ax.spines['bottom'].set_visible(False)
+        ax.tick_params(axis='x', which='both', bottom=False, labelbottom=False)
+
+
+def figure_template(num_signals: int) -> Tuple[Figure, List, 'Text']:
+    """
+    Get the styled figure and axes for a number of signal rows.
+
+    Templates are created once per row count and reused; callers clear the
+    data artists with reset_template() before drawing.
+
+    Args:
+        num_signals: Number of signal rows
+
+    Returns:
+        Tuple of (figure, list of axes from top to bottom, title text)
+    """
+    if num_signals not in _templates:
+        row = _row_height(num_signals)
+        height = TITLE_SPACE + AXIS_SPACE + row * num_signals
+        with matplotlib.rc_context(DARK_STYLE):
+            fig = Figure(figsize=(PLOT_WIDTH, height))
+            FigureCanvasAgg(fig)
+            fig.patch.set_facecolor(FIGURE_COLOR)
+            axes = []
+            for i in range(num_signals):
+                bottom = (AXIS_SPACE + row * (num_signals - 1 - i)) / height
+                ax = fig.add_axes([0, bottom, 1, row / height], sharex=axes[0] if axes else None)
+                _style_axes(ax, last=i == num_signals - 1)
+                axes.append(ax)
+            title = fig.suptitle('', fontsize=14, fontweight='bold', color='black')
+        _templates[num_signals] = (fig, axes, title)
+    return _templates[num_signals]
+
+
+def reset_template(fig: Figure, axes: List) -> None:
+    """Remove the data artists drawn by the previous render."""
+    for ax in axes:
+        for artist in list(ax.lines) + list(ax.texts) + list(ax.collections):
+            artist.remove()
+
+
+def _label_width(fig: Figure, labels: List[str]) -> float:
+    """Width in inches of the widest signal label."""
+    renderer = fig.canvas.get_renderer()
+    widest = max(renderer.get_text_width_height_descent(label, LABEL_FONT, ismath=False)[0]
+                 for label in labels)
+    return widest / fig.dpi
+
+
+def _set_antialiased(fig: Figure, antialiased: bool) -> None:
+    """Toggle antialiasing on every artist of a (reused) figure."""
+    for artist in fig.findobj(lambda a: hasattr(a, 'set_antialiased')):
+        artist.set_antialiased(antialiased)
+
+
+def render_waveform(signals: Dict[str, 'VCDSignal'], title: str, output_path: Union[str, Path],
+                    lod: str = 'auto', dpi: int = PLOT_DPI, annotate: bool = True,
+                    antialias: bool = True) -> None:
+    """
+    Render signals as a GTKWave-style waveform image.
+
+    Args:
+        signals: Display name to signal mapping, in row order
+        title: Figure title
+        output_path: Image file to write (format taken from the extension)
+        lod: Level-of-detail mode (see draw_waveform)
+        dpi: Output resolution
+        annotate: Draw value labels on the traces
+        antialias: Antialias traces, bands and text
+    """
+    fig = draw_waveform(signals, title, lod, dpi, annotate)
+    save_waveform(fig, output_path, dpi, antialias)
+
+
+def draw_waveform(signals: Dict[str, 'VCDSignal'], title: str, lod: str = 'auto',
+                  dpi: int = PLOT_DPI, annotate: bool = True) -> Figure:
+    """
+    Draw signals onto the figure template for their row count.
+
+    Args:
+        signals: Display name to signal mapping, in row order
+        title: Figure title
+        lod: Level-of-detail mode: 'on' decimates transitions to the image
+            width and only annotates segments wide enough for their text,
+            'off' draws every transition, 'auto' decimates only signals with
+            more transitions than the plot has pixels
+        dpi: Output resolution the figure will be saved at (sets the decimation width)
+        annotate: Draw value labels on the traces
+
+    Returns:
+        The drawn (shared template) figure; save it before drawing again
+    """
+    num_signals = len(signals)
+    fig, axes, title_text = figure_template(num_signals)
+    reset_template(fig, axes)
+
+    # Fixed layout: left margin fits the widest signal label
+    left = LAYOUT_PAD + _label_width(fig, list(signals)) + LABEL_PAD
+    axes_width = PLOT_WIDTH - left - LAYOUT_PAD
+    for ax in axes:
+        position = ax.get_position()
+        ax.set_position([left / PLOT_WIDTH, position.y0, axes_width / PLOT_WIDTH, position.height])
+
+    # Horizontal resolution of the plot area, for level-of-detail decimation
+    pixels = max(1, int(axes_width * dpi))
+    char_width = ANNOTATION_CHAR_WIDTH * dpi
+
+    x_min, x_max = np.inf, -np.inf
+    for ax, (signal_name, signal_data) in zip(axes, signals.items()):
+        # Columnar view of the signal: int64 times and packed values
+        arrays = signal_data.arrays()
+
+        # Convert to picoseconds
+        sample_times = arrays.times // 1000
+        sample_values = full_values = arrays.as_float()
+        end_time = signal_data.endtime // 1000
+        label_index = np.arange(len(arrays))
+        busy_spans = []
+
+        decimate = lod == 'on' or (lod == 'auto' and len(arrays) > pixels)
+        if decimate:
+            sample_times, sample_values, label_index, busy_spans = decimate_steps(
+                sample_times, sample_values, end_time, pixels)
+
+        # Extend the last value to the end time
+        times = np.append(sample_times, end_time)
+        values = np.append(sample_values, sample_values[-1] if len(sample_values) else 0)
+        x_min, x_max = min(x_min, times.min()), max(x_max, times.max())
+
+        # Plot as step function for digital signals with green color
+        ax.step(times, values, where='post', linewidth=2, color=TRACE_COLOR)  # Green traces
+
+        # Add value annotations on the plot - centered vertically
+        # Compute data-driven vertical center and padded y-limits
+        # (taken from every sample, so decimation never changes the scale)
+        y_min = min(values.min(), full_values.min()) if len(full_values) else values.min()
+        y_max = max(values.max(), full_values.max()) if len(full_values) else values.max()
+        center_y = (y_min + y_max) / 2  # Center between data bounds
+
+        if busy_spans:
+            # Dense regions collapse into filled bands over the trace
+            ax.broken_barh(busy_spans, (y_min, max(y_max - y_min, 1.0)),
+                           facecolors=TRACE_COLOR, alpha=0.6, zorder=3)
+
+        # Annotate value changes (not the last extended point); when
+        # decimating, only where the segment is wide enough for the text
+        if not annotate:
+            candidates = []
+        elif decimate:
+            band_starts = np.array([start for start, _ in busy_spans] + [np.inf])
+            segment_ends = np.minimum(times[1:],
+                                      band_starts[np.searchsorted(band_starts, times[:-1], side='right')])
+            segment_pixels = (segment_ends - times[:-1]) * pixels / max(end_time - times[0], 1)
+            candidates = np.flatnonzero(segment_pixels >= 3 * char_width)
+        else:
+            candidates = range(len(times) - 1)
+
+        for j in candidates:
+            label = arrays.label(label_index[j])
+            if decimate and segment_pixels[j] < len(label) * char_width:
+                continue
+            ax.text(times[j], center_y, label,
+                    color='#FFFFFF', fontsize=ANNOTATION_FONT_SIZE,
+                    fontfamily=['Adwaita Mono'],
+                    ha='left', va='center')
+
+        # Signal name label on the left
+        ax.set_ylabel(signal_name, rotation=0, ha='right', va='center',
+                      color='black', fontsize=10, fontweight='bold')
+
+        # Set y-limits with slight padding beyond data bounds to avoid tight clipping
+        y_span = max(1.0, y_max - y_min)
+        y_pad = max(0.15 * y_span, 0.3)  # 15% of span or at least 0.3 units
+        ax.set_ylim(y_min - y_pad, y_max + y_pad)
+
+    # Same 5% margins autoscaling would add around the data
+    x_margin = 0.05 * max(x_max - x_min, 1)
+    axes[0].set_xlim(x_min - x_margin, x_max + x_margin)
+
+    title_text.set_text(title)
+    return fig
+
+
+def save_waveform(fig: Figure, output_path: Union[str, Path], dpi: int = PLOT_DPI,
+                  antialias: bool = True) -> None:
+    """
+    Save a figure drawn by draw_waveform.
+
+    Args:
+        fig: Figure returned by draw_waveform
+        output_path: Image file to write (format taken from the extension)
+        dpi: Output resolution
+        antialias: Antialias traces, bands and text
+    """
+    # Ticks are created at draw time, so the rc settings cover them too
+    _set_antialiased(fig, antialias)
+    with matplotlib.rc_context({'lines.antialiased': antialias, 'patch.antialiased': antialias,
+                                'text.antialiased': antialias}):
+        fig.savefig(output_path, dpi=dpi, facecolor=fig.get_facecolor())
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+
+"""
+Work Queue
+==========
+
+SQLite-backed task queue for distributed runs of the Verilog automation
+framework.
+
+A coordinator submits one task per config entry; workers (on this machine or
+on others that share the queue file) claim tasks, send heartbeats while they
+work and store their result: success flag, captured log, run report record
+and the entry's artifacts (VCD, transcript, images) packed as a zip. Tasks of
+a worker that stops heartbeating, or whose processing raised, are put back on
+the queue until they run out of attempts.
+
+The queue is a single SQLite file in rollback-journal mode, so any
+filesystem with working POSIX locks can host it (no server needed).
+"""
+
+import io
+import json
+import os
+import sqlite3
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+HEARTBEAT_INTERVAL = 5.0  # seconds between worker heartbeats
+HEARTBEAT_TIMEOUT = 30.0  # seconds of silence before a running task is requeued
+WORKER_TIMEOUT = 120.0  # seconds a coordinator waits with no live worker before failing the rest
+MAX_ATTEMPTS = 3
+
+# Task states
+PENDING, RUNNING, DONE, FAILED = 'pending', 'running', 'done', 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    heartbeat REAL,
+    success INTEGER,
+    log TEXT,
+    record TEXT,
+    artifacts BLOB,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, id);
+CREATE INDEX IF NOT EXISTS tasks_job ON tasks (job, position);
+"""
+
+
+def pack_artifacts(root: Path, paths: Iterable[Path]) -> bytes:
+    """
+    Zip existing files, stored relative to root.
+
+    Args:
+        root: Directory the archive names are relative to
+        paths: Files to include (missing ones are skipped)
+
+    Returns:
+        Zip archive bytes
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for path in paths:
+            if path.is_file():
+                archive.write(path, path.relative_to(root).as_posix())
+    return buffer.getvalue()
+
+
+def unpack_artifacts(data: Optional[bytes], root: Path) -> List[Path]:
+    """
+    Extract an artifact archive below root.
+
+    Args:
+        data: Archive from pack_artifacts (None for no artifacts)
+        root: Destination directory
+
+    Returns:
+        Paths written
+
+    Raises:
+        ValueError: If an archive member would land outside root
+    """
+    if not data:
+        return []
+    root = root.resolve()
+    written = []
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for member in archive.infolist():
+            target = (root / member.filename).resolve()
+            if root not in target.parents:
+                raise ValueError(f"Artifact escapes the assignment folder: {member.filename}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            staging = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            staging.write_bytes(archive.read(member))
+            os.replace(staging, target)
+            written.append(target)
+    return written
+
+
+class WorkQueue:
+    """Task queue stored in one SQLite file."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open (creating if needed) a queue.
+
+        Args:
+            path: Queue database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def submit(self, job: str, payloads: List[Dict], max_attempts: int = MAX_ATTEMPTS) -> None:
+        """
+        Add a job's tasks to the queue.
+
+        Args:
+            job: Job identifier shared by the tasks
+            payloads: One JSON-serializable payload per task, in order
+            max_attempts: Runs allowed per task before it is marked failed
+        """
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO tasks (job, position, payload, max_attempts) VALUES (?, ?, ?, ?)",
+                [(job, position, json.dumps(payload), max_attempts) for position, payload in enumerate(payloads)])
+
+    def requeue_stale(self, timeout: float = HEARTBEAT_TIMEOUT) -> int:
+        """
+        Return tasks of silent workers to the queue (or fail them when out of attempts).
+
+        Args:
+            timeout: Seconds without a heartbeat after which a worker is presumed dead
+
+        Returns:
+            Number of tasks requeued or failed
+        """
+        cutoff = time.time() - timeout
+        with self._db:
+            failed = self._db.execute(
+                "UPDATE tasks SET state = ?, success = 0, error = 'worker lost (no heartbeat)' "
+                "WHERE state = ? AND heartbeat < ? AND attempts >= max_attempts",
+                (FAILED, RUNNING, cutoff)).rowcount
+            requeued = self._db.execute(
+                "UPDATE tasks SET state = ?, worker = NULL WHERE state = ? AND heartbeat < ?",
+                (PENDING, RUNNING, cutoff)).rowcount
+        return failed + requeued
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """
+        Take the oldest pending task.
+
+        Args:
+            worker: Name of the claiming worker
+
+        Returns:
+            Dictionary with 'id', 'job', 'position', 'attempts' and 'payload',
+            or None if nothing is pending
+        """
+        self.requeue_stale()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute("SELECT id, job, position, attempts, payload FROM tasks "
+                                   "WHERE state = ? ORDER BY id LIMIT 1", (PENDING,)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE tasks SET state = ?, worker = ?, heartbeat = ?, attempts = attempts + 1 "
+                                 "WHERE id = ?", (RUNNING, worker, time.time(), row['id']))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return {'id': row['id'], 'job': row['job'], 'position': row['position'],
+                'attempts': row['attempts'] + 1, 'payload': json.loads(row['payload'])}
+
+    def heartbeat(self, task_id: int, worker: str) -> None:
+        """Mark a claimed task as still being worked on."""
+        with self._db:
+            self._db.execute("UPDATE tasks SET heartbeat = ? WHERE id = ? AND worker = ? AND state = ?",
+                             (time.time(), task_id, worker, RUNNING))
+
+    def complete(self, task_id: int, worker: str, success: bool, log: str, record: Dict,
+                 artifacts: Optional[bytes]) -> None:
+        """
+        Store a task's result.
+
+        Args:
+            task_id: Claimed task
+            worker: Worker that ran it (results of a requeued claim are dropped)
+            success: Whether the entry was processed successfully
+            log: Captured output
+            record: Run report record of the entry
+            artifacts: Packed outputs from pack_artifacts
+        """
+        with self._db:
+            self._db.execute("UPDATE tasks SET state = ?, success = ?, log = ?, record = ?, artifacts = ? "
+                             "WHERE id = ? AND worker = ? AND state = ?",
+                             (DONE, int(success), log, json.dumps(record), artifacts, task_id, worker, RUNNING))
+
+    def fail(self, task_id: int, worker: str, error: str, log: str = '') -> None:
+        """Record an error; the task is retried until it runs out of attempts."""
+        with self._db:
+            self._db.execute("UPDATE tasks SET state = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+                             "worker = NULL, success = 0, error = ?, log = ? "
+                             "WHERE id = ? AND worker = ? AND state = ?",
+                             (FAILED, PENDING, error, log, task_id, worker, RUNNING))
+
+    def result(self, job: str, position: int) -> Optional[Dict]:
+        """
+        Result of one of a job's tasks, once it is done or has failed.
+
+        Args:
+            job: Job identifier
+            position: Task position within the job
+
+        Returns:
+            Dictionary with 'state', 'attempts', 'worker', 'success', 'log',
+            'record', 'artifacts' and 'error', or None while unfinished
+        """
+        row = self._db.execute("SELECT state, attempts, worker, success, log, record, artifacts, error "
+                               "FROM tasks WHERE job = ? AND position = ? AND state IN (?, ?)",
+                               (job, position, DONE, FAILED)).fetchone()
+        if row is None:
+            return None
+        result = dict(row)
+        result['record'] = json.loads(row['record']) if row['record'] else None
+        return result
+
+    def drained(self, job: str) -> bool:
+        """Whether none of a job's tasks is pending or running (also true once the job is dropped)."""
+        row = self._db.execute("SELECT COUNT(*) FROM tasks WHERE job = ? AND state IN (?, ?)",
+                               (job, PENDING, RUNNING)).fetchone()
+        return row[0] == 0
+
+    def fail_remaining(self, job: str, error: str) -> int:
+        """
+        Give up on a job's unfinished tasks (late results of running ones are dropped).
+
+        Args:
+            job: Job identifier
+            error: Reason recorded on each task
+
+        Returns:
+            Number of tasks marked failed
+        """
+        with self._db:
+            return self._db.execute("UPDATE tasks SET state = ?, success = 0, error = ? "
+                                    "WHERE job = ? AND state IN (?, ?)",
+                                    (FAILED, error, job, PENDING, RUNNING)).rowcount
+
+    def counts(self, job: str) -> Dict[str, int]:
+        """Number of a job's tasks per state."""
+        rows = self._db.execute("SELECT state, COUNT(*) FROM tasks WHERE job = ? GROUP BY state", (job,))
+        return {state: count for state, count in rows}
+
+    def drop(self, job: str) -> None:
+        """Delete a job's tasks once its results have been collected."""
+        with self._db:
+            self._db.execute("DELETE FROM tasks WHERE job = ?", (job,))